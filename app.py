@@ -16,13 +16,28 @@ Production-grade web application with all critical improvements:
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 from src.ingestion.quality_foods import QualityFoodDatabase
 from src.optimization.diet_optimizer import SimpleDietOptimizer, DietOptimizer
+from src.optimization.pareto import ParetoSweep
+from src.optimization.packages import PackageOption
+from src.optimization.nutrient_matrix import NutrientMatrix
+from src.processing.food_frame import FoodFrame
+from src.optimization.result_cache import ResultCache, problem_fingerprint
+from src.optimization.alternatives import alternative_plans
+from src.optimization.substitution import suggest_swaps
+from src.optimization.price_scenarios import price_risk
+from src.optimization.rounding import format_quantity, round_quantities
+from src.database.cache import NutritionCache
+from src.optimization.micronutrients import (
+    MICRONUTRIENTS, MICRONUTRIENT_NAMES, micronutrient_targets, micronutrient_report
+)
 from src.logger import setup_logger
 
 # Page config
@@ -144,7 +159,19 @@ def init_session_state():
         'foods_db': None,
         'saved_plans': [],
         'show_tutorial': True,
-        'optimization_history': []
+        'optimization_history': [],
+        'mock_prices': {},
+        'compiled_problem': None,
+        'compiled_problem_key': None,
+        'catalog_matrix': None,
+        'catalog_matrix_key': None,
+        'food_frame': None,
+        'food_frame_key': None,
+        'result_cache': None,
+        'alternatives': None,
+        'swaps': None,
+        'tradeoff': None,
+        'price_risk': None
     }
     for key, value in defaults.items():
         if key not in st.session_state:
@@ -153,6 +180,10 @@ def init_session_state():
     if st.session_state.foods_db is None:
         with st.spinner('Loading food database...'):
             st.session_state.foods_db = QualityFoodDatabase()
+    
+    # Repeat optimizations come from memory, or from SQLite across sessions
+    if st.session_state.result_cache is None:
+        st.session_state.result_cache = ResultCache(store=NutritionCache())
 
 init_session_state()
 
@@ -336,13 +367,22 @@ def render_sidebar():
     num_days = st.number_input(
         "Number of days",
         min_value=1,
-        max_value=7,
+        max_value=28,
         value=1,
         help="Plan for multiple days (meal prep)"
     )
     
+    max_grams_per_day = None
     if num_days > 1:
-        st.info(f"💡 Planning for {num_days} days will optimize for variety and bulk purchasing")
+        max_grams_per_day = st.slider(
+            "Max of one food per day (g)",
+            min_value=100,
+            max_value=1000,
+            value=400,
+            step=50,
+            help="Lower = more variety within each day"
+        )
+        st.info(f"💡 Every day meets your targets on its own; one shopping list covers all {num_days} days")
     
     st.markdown("---")
     
@@ -354,6 +394,23 @@ def render_sidebar():
         help="Include vitamins and minerals in optimization"
     )
     
+    whole_packages = st.checkbox(
+        "Buy whole packages",
+        help="Round purchases to whole 1 lb packages (slower, exact checkout price)"
+    )
+    
+    practical_units = st.checkbox(
+        "Practical quantities",
+        help="Round to eggs, slices and servings instead of exact grams (single-day plans)"
+    )
+    
+    cache_stats = st.session_state.result_cache.stats()
+    if cache_stats['memory_hits'] + cache_stats['sqlite_hits'] + cache_stats['misses']:
+        st.caption(
+            f"⚡ Result cache: {cache_stats['memory_hits'] + cache_stats['sqlite_hits']} hits, "
+            f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%})"
+        )
+    
     st.markdown("---")
     
     # === OPTIMIZE BUTTON ===
@@ -369,7 +426,10 @@ def render_sidebar():
             restrictions,
             excluded_foods,
             num_days,
-            track_micros
+            track_micros,
+            max_grams_per_day,
+            whole_packages,
+            practical_units
         )
     
     # === SAVED PLANS ===
@@ -390,7 +450,8 @@ def render_sidebar():
 
 
 def optimize_enhanced(categories, calories, protein, carbs, fat, tolerance, 
-                     max_budget, restrictions, excluded_foods, num_days, track_micros):
+                     max_budget, restrictions, excluded_foods, num_days, track_micros,
+                     max_grams_per_day=None, whole_packages=False, practical_units=False):
     """Enhanced optimization with all features"""
     
     progress_bar = st.progress(0)
@@ -409,32 +470,28 @@ def optimize_enhanced(categories, calories, protein, carbs, fat, tolerance,
         # Apply restrictions
         status_text.text("🔄 Applying dietary restrictions...")
         progress_bar.progress(40)
-        all_foods = apply_restrictions(all_foods, restrictions, excluded_foods)
+        frame = apply_restrictions(get_food_frame(all_foods), restrictions, excluded_foods)
+        all_foods = frame.to_foods()
         
         if not all_foods:
             st.error("❌ No foods available after applying restrictions")
             return
         
+        # The restricted catalog matrix is a column slice of the loaded one
+        if st.session_state.catalog_matrix_key != tuple(frame.food_keys):
+            st.session_state.catalog_matrix = frame.matrix
+            st.session_state.catalog_matrix_key = tuple(frame.food_keys)
+        
         # Get prices
         status_text.text("🔄 Fetching prices...")
         progress_bar.progress(60)
-        prices = generate_mock_prices(all_foods)
-        
-        # Scale for multiple days
-        if num_days > 1:
-            calories *= num_days
-            protein *= num_days
-            carbs *= num_days
-            fat *= num_days
+        prices = get_session_prices(all_foods)
         
         # Run optimization
         status_text.text("🔄 Running optimization algorithm...")
         progress_bar.progress(80)
         
-        optimizer = SimpleDietOptimizer()
-        result = optimizer.optimize_for_macros(
-            all_foods,
-            prices,
+        daily_targets = SimpleDietOptimizer.macro_targets(
             target_calories=calories,
             target_protein_g=protein,
             target_carbs_g=carbs,
@@ -442,6 +499,89 @@ def optimize_enhanced(categories, calories, protein, carbs, fat, tolerance,
             tolerance=tolerance
         )
         
+        # Vitamins and minerals: Daily Values as minimums, ULs as maximums
+        macro_only_targets = daily_targets
+        if track_micros:
+            daily_targets = {
+                **daily_targets,
+                **micronutrient_targets(catalog=get_catalog_matrix(all_foods))
+            }
+        
+        # Reuse the compiled problem when only the targets moved
+        problem = get_compiled_problem(all_foods, prices)
+        
+        def run(daily_targets):
+            if whole_packages:
+                # Integer package counts; mock prices are per 1 lb package
+                packages = [
+                    PackageOption(food_key=key, package_grams=453.6, price=price,
+                                  description=all_foods[key].description)
+                    for key, price in prices.items()
+                ]
+                return SimpleDietOptimizer().optimize_packages(
+                    all_foods, packages, daily_targets, num_days,
+                    max_quantity_per_food=max_grams_per_day or 1000.0
+                )
+            if num_days > 1:
+                # One LP over the whole horizon: every day feasible, one shopping list
+                return SimpleDietOptimizer().optimize_multi_day(
+                    all_foods, prices, daily_targets, num_days,
+                    max_grams_per_day=max_grams_per_day
+                )
+            return problem.resolve(daily_targets)
+        
+        cache = st.session_state.result_cache
+        
+        def fingerprint(daily_targets):
+            return problem_fingerprint(
+                all_foods, prices, daily_targets, num_days=num_days,
+                max_grams_per_day=max_grams_per_day, whole_packages=whole_packages
+            )
+        
+        def solve(daily_targets):
+            """Cached results (same foods, prices, targets, options) skip the solver"""
+            key = fingerprint(daily_targets)
+            result = cache.get(key, all_foods)
+            if result is None:
+                result = run(daily_targets)
+                if result is not None:
+                    cache.put(key, result)
+            return result
+        
+        report = None
+        key = fingerprint(daily_targets)
+        result = cache.get(key, all_foods)
+        
+        if result is None:
+            # The elastic diagnosis runs alongside the main solve (its own
+            # HiGHS model) and is only read if the solve comes back infeasible
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                diagnosis = pool.submit(problem.diagnose, daily_targets, max_grams_per_day)
+                result = run(daily_targets)
+            
+            if result is None:
+                report = diagnosis.result()
+            else:
+                cache.put(key, result)
+        
+        # Every Daily Value at once can be out of reach for a small food
+        # set; fall back to macros and report the micronutrients instead
+        micros_constrained = track_micros and result is not None
+        if result is None and track_micros:
+            result = solve(macro_only_targets)
+            if result and report:
+                result['infeasibility'] = report.summary()
+        
+        # Round after the cache: the cached plan stays the exact optimum
+        if result and practical_units and num_days == 1 and not whole_packages:
+            rounded = round_quantities(result, max_quantity_per_food=max_grams_per_day)
+            if rounded is not None and rounded['rounding']['targets_met']:
+                result = rounded
+            elif rounded is not None:
+                st.info("💡 Rounding ran out of time before meeting every target - showing exact grams")
+            else:
+                st.info("💡 No practical rounding meets every target - showing exact grams")
+        
         progress_bar.progress(100)
         
         if result:
@@ -454,6 +594,7 @@ def optimize_enhanced(categories, calories, protein, carbs, fat, tolerance,
             result['num_days'] = num_days
             result['restrictions'] = restrictions
             result['track_micros'] = track_micros
+            result['micros_constrained'] = micros_constrained
             result['timestamp'] = datetime.now().isoformat()
             
             st.session_state.optimization_result = result
@@ -467,6 +608,9 @@ def optimize_enhanced(categories, calories, protein, carbs, fat, tolerance,
             progress_bar.empty()
             st.success("✅ Optimization complete!")
             st.rerun()
+        elif report is not None and not report.feasible:
+            st.error("❌ These targets cannot all be met with the selected foods")
+            show_diagnosis(report.summary())
         else:
             st.error("❌ No feasible solution found")
             st.info("""
@@ -485,51 +629,101 @@ def optimize_enhanced(categories, calories, protein, carbs, fat, tolerance,
         status_text.empty()
 
 
-def apply_restrictions(foods, restrictions, excluded_foods):
-    """Filter foods based on dietary restrictions"""
+def show_diagnosis(diagnosis):
+    """Which targets conflict and by how much (elastic LP report)"""
+    
+    rows = []
+    for v in diagnosis['violations']:
+        rows.append({
+            'Nutrient': (v['nutrient'].replace('Carbohydrate, by difference', 'Carbs')
+                                      .replace('Total lipid (fat)', 'Fat')),
+            'Target': f"{'min' if v['bound'] == 'min' else 'max'} {v['target']:g}",
+            'Best Achievable': f"{v['achievable']:.1f}",
+            'Off By': f"{v['violation']:.1f} ({v['relative']:.0%})"
+        })
     
-    filtered = {}
+    st.markdown("**Closest you can get with these foods:**")
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    st.caption("Adjust these targets (or add food categories) - every other target can be met as set")
+
+
+def get_session_prices(foods):
+    """Mock prices that stay fixed for the session (new foods get priced once)"""
     
-    for key, food in foods.items():
-        # Skip excluded
-        if food.description in excluded_foods:
-            continue
-        
-        # Apply restrictions
-        desc_lower = food.description.lower()
-        category_lower = (food.food_category or "").lower()
-        
-        skip = False
-        
-        if "Vegetarian" in restrictions or "Vegan" in restrictions:
-            meat_keywords = ['meat', 'beef', 'pork', 'chicken', 'turkey', 'fish', 'salmon', 'tuna']
-            if any(kw in desc_lower or kw in category_lower for kw in meat_keywords):
-                skip = True
-        
-        if "Vegan" in restrictions:
-            animal_keywords = ['dairy', 'milk', 'cheese', 'yogurt', 'egg']
-            if any(kw in desc_lower or kw in category_lower for kw in animal_keywords):
-                skip = True
-        
-        if "Dairy-Free" in restrictions:
-            dairy_keywords = ['dairy', 'milk', 'cheese', 'yogurt', 'butter']
-            if any(kw in desc_lower or kw in category_lower for kw in dairy_keywords):
-                skip = True
-        
-        if "Nut Allergy" in restrictions:
-            nut_keywords = ['nut', 'almond', 'walnut', 'peanut', 'cashew']
-            if any(kw in desc_lower for kw in nut_keywords):
-                skip = True
-        
-        if "Gluten-Free" in restrictions:
-            gluten_keywords = ['bread', 'wheat', 'pasta', 'oat']
-            if any(kw in desc_lower for kw in gluten_keywords):
-                skip = True
-        
-        if not skip:
-            filtered[key] = food
+    session_prices = st.session_state.mock_prices
+    missing = {key: food for key, food in foods.items() if key not in session_prices}
+    if missing:
+        session_prices.update(generate_mock_prices(missing))
     
-    return filtered
+    return {key: session_prices[key] for key in foods}
+
+
+def get_food_frame(foods):
+    """Columnar view of these foods, built once per food set"""
+    
+    key = tuple(foods.keys())
+    
+    if st.session_state.food_frame_key != key:
+        st.session_state.food_frame = FoodFrame.from_foods(foods)
+        st.session_state.food_frame_key = key
+    
+    return st.session_state.food_frame
+
+
+def get_catalog_matrix(foods):
+    """Sparse matrix of every nutrient of these foods, built once per food set"""
+    
+    key = tuple(foods.keys())
+    
+    if st.session_state.catalog_matrix_key != key:
+        st.session_state.catalog_matrix = NutrientMatrix.from_foods(foods, sparse=True)
+        st.session_state.catalog_matrix_key = key
+    
+    return st.session_state.catalog_matrix
+
+
+def get_compiled_problem(foods, prices):
+    """
+    Compiled macro + micronutrient problem for this (food set, prices),
+    rebuilt only when they change. Micronutrient rows stay free until
+    targeted, so toggling micronutrient tracking needs no rebuild.
+    """
+    
+    key = (tuple(foods.keys()), tuple(prices[k] for k in foods))
+    
+    if st.session_state.compiled_problem_key != key:
+        st.session_state.compiled_problem = SimpleDietOptimizer().compile_for_macros(
+            foods, prices, MICRONUTRIENT_NAMES, catalog=get_catalog_matrix(foods)
+        )
+        st.session_state.compiled_problem_key = key
+    
+    return st.session_state.compiled_problem
+
+
+# Restriction -> (keywords, fields they are matched in)
+RESTRICTION_KEYWORDS = {
+    "Vegetarian": (['meat', 'beef', 'pork', 'chicken', 'turkey', 'fish', 'salmon', 'tuna'], ("description", "category")),
+    "Vegan": (['dairy', 'milk', 'cheese', 'yogurt', 'egg'], ("description", "category")),
+    "Dairy-Free": (['dairy', 'milk', 'cheese', 'yogurt', 'butter'], ("description", "category")),
+    "Nut Allergy": (['nut', 'almond', 'walnut', 'peanut', 'cashew'], ("description",)),
+    "Gluten-Free": (['bread', 'wheat', 'pasta', 'oat'], ("description",)),
+}
+
+
+def apply_restrictions(frame, restrictions, excluded_foods):
+    """Filter foods based on dietary restrictions (one vectorized pass per keyword)"""
+    
+    skip = np.isin(frame.descriptions.astype(str), list(excluded_foods))
+    
+    # Vegan excludes meat too
+    active = set(restrictions) | ({"Vegetarian"} if "Vegan" in restrictions else set())
+    
+    for restriction in active:
+        if restriction in RESTRICTION_KEYWORDS:
+            keywords, fields = RESTRICTION_KEYWORDS[restriction]
+            skip |= frame.contains(keywords, fields)
+    
+    return frame.where(~skip)
 
 
 def show_welcome_screen():
@@ -629,6 +823,8 @@ def show_results_enhanced():
         st.metric("💰 Total Cost", f"${result['total_cost']:.2f}")
         if num_days > 1:
             st.caption(f"${result['total_cost']/num_days:.2f}/day")
+        if 'rounding' in result:
+            st.caption(f"+{result['rounding']['relative_increase']:.1%} for practical quantities")
     
     with col2:
         st.metric("🛒 Foods", result['num_foods'])
@@ -659,10 +855,11 @@ def show_results_enhanced():
     st.markdown("---")
     
     # Main content tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
         "🛒 Shopping List",
         "📊 Nutrition",
         "📈 Analysis",
+        "🔀 Alternatives",
         "🍳 Recipes",
         "💾 Save/Export"
     ])
@@ -677,12 +874,92 @@ def show_results_enhanced():
         show_analysis(result)
     
     with tab4:
-        show_recipes(result)
+        show_alternatives(result)
     
     with tab5:
+        show_recipes(result)
+    
+    with tab6:
         show_export_enhanced(result)
 
 
+def show_alternatives(result):
+    """Compare k distinct plans within a cost tolerance of the optimum"""
+    
+    st.subheader("🔀 Alternative Plans")
+    st.caption("Different shopping lists that still hit your targets, for a little more money")
+    
+    if (result.get('num_days', 1) > 1 or result.get('packages')
+            or st.session_state.compiled_problem is None or not result.get('selected_foods')):
+        st.info("💡 Alternatives are available for single-day plans")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        k = st.slider("Number of plans", min_value=2, max_value=6, value=3)
+    with col2:
+        tolerance = st.slider("Max extra cost (%)", min_value=0, max_value=50, value=10, step=5)
+    
+    key = (result.get('timestamp'), k, tolerance)
+    
+    if st.button("🔀 Find alternatives"):
+        # Re-solves the session's compiled model; no rebuild
+        plans = alternative_plans(
+            st.session_state.compiled_problem, result['targets'], k, tolerance / 100
+        )
+        st.session_state.alternatives = (key, plans)
+    
+    stored = st.session_state.get('alternatives')
+    if not stored or stored[0] != key:
+        return
+    
+    plans = stored[1]
+    if len(plans) < 2:
+        st.info("No other plan fits within this cost tolerance - try allowing a higher extra cost")
+        return
+    
+    summary = []
+    grams = {}
+    for plan in plans:
+        info = plan['alternative']
+        label = "Optimal" if info['rank'] == 0 else f"Plan {info['rank'] + 1}"
+        summary.append({
+            'Plan': label,
+            'Cost': plan['total_cost'],
+            'vs Optimal': f"+{info['cost_increase']:.1%}",
+            'Foods': plan['num_foods'],
+            'Overlap': f"{info['overlap']:.0%}" if info['rank'] else "-",
+            'New Foods': ", ".join(
+                plan['selected_foods'][food_key]['food'].description for food_key in info['new_foods']
+            )
+        })
+        for food_key, data in plan['selected_foods'].items():
+            grams.setdefault(data['food'].description, {})[label] = round(data['quantity_grams'])
+    
+    st.dataframe(
+        pd.DataFrame(summary),
+        use_container_width=True,
+        hide_index=True,
+        column_config={"Cost": st.column_config.NumberColumn("Cost", format="$%.2f")}
+    )
+    st.caption("Overlap: share of the plan (by weight) already in the most similar earlier plan")
+    
+    grams_df = pd.DataFrame.from_dict(grams, orient='index').fillna(0).astype(int)
+    grams_df = grams_df.reindex(columns=[row['Plan'] for row in summary], fill_value=0)
+    st.markdown("**Grams of each food per plan:**")
+    st.dataframe(grams_df, use_container_width=True)
+    
+    choice = st.selectbox("Switch to plan", [row['Plan'] for row in summary][1:])
+    if st.button("✅ Use this plan"):
+        chosen = dict(plans[[row['Plan'] for row in summary].index(choice)])
+        for field in ('num_days', 'restrictions', 'track_micros', 'micros_constrained'):
+            if field in result:
+                chosen[field] = result[field]
+        chosen['timestamp'] = datetime.now().isoformat()
+        st.session_state.optimization_result = chosen
+        st.rerun()
+
+
 def show_smart_insights(result):
     """Generate and display smart insights"""
     
@@ -734,25 +1011,25 @@ def show_shopping_list_enhanced(result):
     st.subheader("🛒 Your Shopping List")
     
     # Prepare data
+    selected = result['selected_foods']
+    plan = FoodFrame.from_foods({key: data['food'] for key, data in selected.items()}, keep_foods=False)
+    quantities = np.array([data['quantity_grams'] for data in selected.values()])
+    prices = np.array([data['price'] for data in selected.values()])
+    
+    # Calculate per package
+    protein_per_package = plan.nutrient("Protein") / 100 * quantities
+    cost_per_g_protein = plan.cost_per_nutrient(prices, "Protein", grams=quantities)
+    
     shopping_data = []
     
-    for food_key, data in result['selected_foods'].items():
-        food = data['food']
-        quantity = data['quantity_grams']
-        price = data['price']
-        protein = food.get_nutrient("Protein") or 0
-        
-        # Calculate per serving
-        protein_per_package = (protein / 100) * quantity
-        cost_per_g_protein = price / protein_per_package if protein_per_package > 0 else 0
-        
+    for j, data in enumerate(selected.values()):
         shopping_data.append({
-            'Food': food.description,
-            'Quantity': f"{quantity:.0f}g",
-            'Lbs': f"{quantity/453.6:.2f}",
-            'Price': price,
-            'Protein/Package': f"{protein_per_package:.0f}g",
-            'Cost/g Protein': f"${cost_per_g_protein:.3f}" if cost_per_g_protein > 0 else "N/A"
+            'Food': plan.descriptions[j],
+            'Quantity': format_quantity(data),
+            'Lbs': f"{quantities[j]/453.6:.2f}",
+            'Price': prices[j],
+            'Protein/Package': f"{protein_per_package[j]:.0f}g",
+            'Cost/g Protein': f"${cost_per_g_protein[j]:.3f}" if np.isfinite(cost_per_g_protein[j]) else "N/A"
         })
     
     df = pd.DataFrame(shopping_data)
@@ -788,10 +1065,100 @@ def show_shopping_list_enhanced(result):
     with col2:
         # Value ranking
         st.markdown("**Best Value Foods (by protein cost):**")
-        df_sorted = df.sort_values('Cost/g Protein')
-        for i, row in df_sorted.head(5).iterrows():
-            if row['Cost/g Protein'] != "N/A":
-                st.write(f"{i+1}. {row['Food']}: {row['Cost/g Protein']}")
+        best = plan.index_of(plan.rank(cost_per_g_protein, top=5))
+        for rank, j in enumerate(best, start=1):
+            st.write(f"{rank}. {plan.descriptions[j]}: ${cost_per_g_protein[j]:.3f}")
+    
+    show_swap_suggestions(result)
+    
+    # Package cart (whole-package results)
+    if result.get('packages'):
+        st.markdown("### 📦 Packages to Buy")
+        
+        cart_df = pd.DataFrame([{
+            'Product': item['description'] or item['food_key'],
+            'Count': item['count'],
+            'Package': f"{item['package_grams']:.0f}g",
+            'Total': item['total_price']
+        } for item in result['packages']])
+        st.dataframe(
+            cart_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={"Total": st.column_config.NumberColumn("Total", format="$%.2f")}
+        )
+        
+        mip = result['mip']
+        st.caption(
+            f"Continuous plan would cost ${mip['lp_bound']:.2f}; whole packages cost "
+            f"${mip['objective']:.2f} (within {mip['gap']:.1%} of the best possible cart)"
+        )
+    
+    # Day-by-day plan (multi-day results)
+    if result.get('days'):
+        st.markdown("### 📅 Day-by-Day Plan")
+        
+        day_rows = {}
+        for day_number, day in enumerate(result['days'], start=1):
+            for food_key, grams in day['foods'].items():
+                name = result['selected_foods'][food_key]['food'].description
+                day_rows.setdefault(name, {})[f"Day {day_number}"] = round(grams)
+        
+        day_df = pd.DataFrame.from_dict(day_rows, orient='index').fillna(0).astype(int)
+        day_df = day_df.reindex(columns=[f"Day {d}" for d in range(1, len(result['days']) + 1)], fill_value=0)
+        st.dataframe(day_df, use_container_width=True)
+        st.caption("Grams of each food to eat per day")
+
+
+def show_swap_suggestions(result):
+    """Cheapest replacements for a food the user does not want"""
+    
+    problem = st.session_state.compiled_problem
+    if (result.get('num_days', 1) > 1 or result.get('packages') or problem is None
+            or not set(result['selected_foods']) <= set(problem.foods)):
+        return
+    
+    st.markdown("### 🔄 Swap a Food")
+    
+    names = {data['food'].description: food_key for food_key, data in result['selected_foods'].items()}
+    unwanted = st.selectbox("Don't want:", list(names), key="swap_food")
+    food_key = names[unwanted]
+    
+    # Ranked from the optimal duals; only the shortlist is re-solved
+    key = (result.get('timestamp'), food_key)
+    stored = st.session_state.get('swaps')
+    if not stored or stored[0] != key:
+        st.session_state.swaps = (key, suggest_swaps(problem, result['targets'], food_key))
+    swaps = st.session_state.swaps[1]
+    
+    if not swaps:
+        st.info(
+            f"No single food can replace {unwanted} while meeting every target - "
+            "exclude it in the sidebar to re-plan from scratch"
+        )
+        return
+    
+    st.dataframe(
+        pd.DataFrame([{
+            'Replace With': problem.foods[swap['food_key']].description,
+            'Amount': f"{swap['quantity_grams']:.0f}g",
+            'Cost Change': f"+${swap['cost_increase']:.2f}",
+            'New Total': swap['total_cost'],
+        } for swap in swaps]),
+        use_container_width=True,
+        hide_index=True,
+        column_config={"New Total": st.column_config.NumberColumn("New Total", format="$%.2f")}
+    )
+    st.caption("The rest of the plan is re-balanced around the substitute")
+    
+    if st.button(f"✅ Swap in {problem.foods[swaps[0]['food_key']].description}"):
+        swapped = dict(swaps[0]['result'])
+        for field in ('num_days', 'restrictions', 'track_micros', 'micros_constrained'):
+            if field in result:
+                swapped[field] = result[field]
+        swapped['timestamp'] = datetime.now().isoformat()
+        st.session_state.optimization_result = swapped
+        st.rerun()
 
 
 def show_nutrition_enhanced(result):
@@ -805,6 +1172,8 @@ def show_nutrition_enhanced(result):
         # Macro table
         nutrition_data = []
         for nutrient_name, total in result['total_nutrients'].items():
+            if nutrient_name in MICRONUTRIENTS:
+                continue
             min_target, max_target = result['targets'][nutrient_name]
             
             status = "✅ Perfect"
@@ -846,7 +1215,39 @@ def show_nutrition_enhanced(result):
     if result.get('track_micros', False):
         st.markdown("---")
         st.subheader("🔬 Micronutrient Analysis")
-        st.info("💡 Feature coming soon: Track vitamins and minerals!")
+        
+        if result.get('micros_constrained'):
+            st.success("✅ Plan was optimized to meet Daily Values without exceeding upper limits")
+        else:
+            st.warning("⚠️ These foods cannot meet every Daily Value at once - showing what the macro plan provides")
+            if result.get('infeasibility'):
+                show_diagnosis(result['infeasibility'])
+        
+        report = micronutrient_report(
+            result['selected_foods'], result.get('num_days', 1), result.get('all_nutrient_totals')
+        )
+        status_labels = {'ok': "✅", 'low': "⚠️ Low", 'over': "⚠️ Above UL"}
+        
+        micro_df = pd.DataFrame([{
+            'Nutrient': row['nutrient'],
+            'Per Day': f"{row['amount']:.1f} {row['unit']}",
+            'Daily Value': f"{row['daily_value']:g}" if row['daily_value'] else "-",
+            'Upper Limit': f"{row['upper_limit']:g}" if row['upper_limit'] else "-",
+            '% DV': row['percent_dv'],
+            'Status': status_labels[row['status']]
+        } for row in report])
+        
+        st.dataframe(
+            micro_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "% DV": st.column_config.ProgressColumn(
+                    "% DV", format="%.0f%%", min_value=0, max_value=200
+                )
+            }
+        )
+        st.caption("Daily Values: FDA (2016 label). Upper limits: NIH, adults 19+, food sources.")
 
 
 def show_analysis(result):
@@ -861,6 +1262,8 @@ def show_analysis(result):
     maxs = []
     
     for nutrient, total in result['total_nutrients'].items():
+        if nutrient in MICRONUTRIENTS:
+            continue
         min_t, max_t = result['targets'][nutrient]
         
         short_name = (nutrient.replace('Carbohydrate, by difference', 'Carbs')
@@ -905,6 +1308,11 @@ def show_analysis(result):
     
     st.plotly_chart(fig, use_container_width=True)
     
+    # Trade-off curve
+    show_tradeoff(result)
+    
+    show_price_risk(result)
+    
     # History
     if len(st.session_state.optimization_history) > 1:
         st.markdown("---")
@@ -923,6 +1331,147 @@ def show_analysis(result):
         st.plotly_chart(fig, use_container_width=True)
 
 
+def show_tradeoff(result):
+    """Cost vs one nutrient target (Pareto sweep on the compiled problem)"""
+    
+    problem = st.session_state.compiled_problem
+    if problem is None or not set(result['selected_foods']) <= set(problem.foods):
+        return
+    
+    st.markdown("---")
+    st.subheader("💸 Cost vs Nutrition Trade-off")
+    st.caption("How much cheaper (or pricier) the plan gets as one target moves")
+    
+    # Multi-day plans: sweep one day's targets (cost per day)
+    base_targets = result['daily_targets'][0] if result.get('daily_targets') else result['targets']
+    
+    targets = {
+        name: bounds for name, bounds in base_targets.items()
+        if bounds[0] is not None
+    }
+    if not targets:
+        return
+    
+    nutrient = st.selectbox(
+        "Nutrient to vary",
+        list(targets.keys()),
+        index=list(targets.keys()).index('Protein') if 'Protein' in targets else 0,
+        format_func=lambda name: (name.replace('Carbohydrate, by difference', 'Carbs')
+                                      .replace('Total lipid (fat)', 'Fat'))
+    )
+    
+    current_min, current_max = targets[nutrient]
+    upper = current_max if current_max is not None else current_min * 1.5
+    levels = [current_min * 0.5 + (upper - current_min * 0.5) * i / 29 for i in range(30)]
+    
+    # Warm re-solves on the session's compiled problem (same process),
+    # once per plan and nutrient - not on every rerun
+    key = (result.get('timestamp'), nutrient)
+    stored = st.session_state.get('tradeoff')
+    if not stored or stored[0] != key:
+        sweep = ParetoSweep(problem, base_targets, workers=1)
+        st.session_state.tradeoff = (key, sweep.over_target(nutrient, levels))
+    frontier = st.session_state.tradeoff[1]
+    feasible = frontier[frontier['status'] == 'Optimal']
+    
+    if feasible.empty:
+        st.info("No feasible plans along this range")
+        return
+    
+    fig = px.line(
+        feasible,
+        x='level',
+        y='total_cost',
+        markers=True,
+        labels={
+            'level': f'Minimum {nutrient}',
+            'total_cost': 'Cost per Day ($)' if result.get('daily_targets') else 'Total Cost ($)'
+        }
+    )
+    fig.add_vline(x=current_min, line_dash='dash', line_color='green',
+                  annotation_text='Your target')
+    fig.update_layout(height=400)
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Marginal cost at the current target
+    nearest = (feasible['level'] - current_min).abs().idxmin()
+    marginal = feasible.loc[nearest, 'marginal_cost']
+    if pd.notna(marginal):
+        st.info(f"💡 Near your target, each extra 10 units of {nutrient} costs about ${marginal * 10:.2f}")
+
+
+def show_price_risk(result):
+    """Monte Carlo cost distribution of the current plan"""
+    
+    problem = st.session_state.compiled_problem
+    if (result.get('num_days', 1) > 1 or result.get('packages') or problem is None
+            or not set(result['selected_foods']) <= set(problem.foods)):
+        return
+    
+    st.markdown("---")
+    st.subheader("🎲 Price Risk")
+    st.caption("Prices move - what this exact shopping list could cost on another trip")
+    
+    volatility = st.slider("Price volatility (%)", min_value=5, max_value=40, value=15, step=5)
+    key = (result.get('timestamp'), volatility)
+    
+    if st.button("🎲 Simulate 10,000 price scenarios"):
+        column = {food_key: j for j, food_key in enumerate(problem.matrix.food_keys)}
+        quantities = np.zeros(problem.matrix.num_foods)
+        for food_key, data in result['selected_foods'].items():
+            quantities[column[food_key]] = data['quantity_grams']
+        
+        # Re-optimizations run on the session's model (same process)
+        with st.spinner("Simulating..."):
+            report = price_risk(
+                problem, result['targets'], quantities, 10000, volatility / 100,
+                regret_samples=100, workers=1
+            )
+        st.session_state.price_risk = (key, report)
+    
+    stored = st.session_state.get('price_risk')
+    if not stored or stored[0] != key or stored[1] is None:
+        return
+    report = stored[1]
+    
+    cost = report['plan_cost']
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Today", f"${report['base_cost']:.2f}")
+    with col2:
+        st.metric("Typical (median)", f"${cost['p50']:.2f}")
+    with col3:
+        st.metric("Good week (5%)", f"${cost['p5']:.2f}")
+    with col4:
+        st.metric("Bad week (95%)", f"${cost['p95']:.2f}")
+    
+    if report['regret']:
+        st.info(
+            f"💡 Re-optimizing for each week's prices would save ${report['regret']['mean']:.2f} "
+            f"on average ({report['regret']['mean_percent']:.1%}) - "
+            f"up to ${report['regret']['p95']:.2f} in 1 week of 20"
+        )
+    
+    stability_df = pd.DataFrame([{
+        'Food': problem.foods[food_key].description,
+        'Still Optimal': info['stability'] * 100 if info['stability'] is not None else None,
+        'Cost Range': f"${info['cost_p5']:.2f} - ${info['cost_p95']:.2f}",
+    } for food_key, info in report['foods'].items()]).sort_values('Still Optimal', ascending=False)
+    
+    st.dataframe(
+        stability_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Still Optimal": st.column_config.ProgressColumn(
+                "Still Optimal", format="%.0f%%", min_value=0, max_value=100
+            )
+        }
+    )
+    st.caption("Still Optimal: share of simulated weeks where the food stays in the cheapest plan")
+
+
 def show_recipes(result):
     """Show recipe suggestions based on selected foods"""
     
@@ -1045,6 +1594,9 @@ def save_plan(name, result):
         'restrictions': result.get('restrictions', [])
     }
     
+    if result.get('days'):
+        serializable_result['days'] = result['days']
+    
     with open(plan_file, 'w') as f:
         json.dump(serializable_result, f, indent=2)
 
@@ -1090,7 +1642,7 @@ def generate_shopping_list_text(result):
         price = data['price']
         
         text += f"\n☐ {food.description}\n"
-        text += f"   Quantity: {quantity:.0f}g ({quantity/453.6:.2f} lbs)\n"
+        text += f"   Quantity: {format_quantity(data)} ({quantity/453.6:.2f} lbs)\n"
         text += f"   Price: ${price:.2f}\n"
     
     text += "\n" + "="*60 + "\n"
@@ -1106,27 +1658,20 @@ def generate_shopping_list_text(result):
 def generate_shopping_list_df(result):
     """Generate DataFrame for CSV export"""
     
-    data = []
-    
-    for food_key, item_data in result['selected_foods'].items():
-        food = item_data['food']
-        quantity = item_data['quantity_grams']
-        price = item_data['price']
-        
-        protein = food.get_nutrient("Protein") or 0
-        calories = food.get_nutrient("Energy") or 0
-        
-        data.append({
-            'Food': food.description,
-            'Quantity_g': quantity,
-            'Quantity_lbs': quantity / 453.6,
-            'Price': price,
-            'Category': food.food_category,
-            'Protein_per_100g': protein,
-            'Calories_per_100g': calories
-        })
-    
-    return pd.DataFrame(data)
+    selected = result['selected_foods']
+    plan = FoodFrame.from_foods({key: data['food'] for key, data in selected.items()}, keep_foods=False)
+    quantities = np.array([data['quantity_grams'] for data in selected.values()])
+    
+    return pd.DataFrame({
+        'Food': plan.descriptions,
+        'Quantity_g': quantities,
+        'Quantity_lbs': quantities / 453.6,
+        'Quantity': [format_quantity(data) for data in selected.values()],
+        'Price': [data['price'] for data in selected.values()],
+        'Category': plan.categories,
+        'Protein_per_100g': plan.nutrient("Protein"),
+        'Calories_per_100g': plan.nutrient("Energy")
+    })
 
 
 def generate_mock_prices(foods):
@@ -0,0 +1,6 @@
+"""
+Performance benchmarks
+
+Run from the repository root, e.g.:
+    python -m benchmarks.bench_engines
+"""
@@ -0,0 +1,79 @@
+"""
+Benchmark: k-diverse alternatives vs exclude-and-rebuild
+
+Compares two ways of producing k different shopping lists:
+- alternative_plans: one compiled model, objective swapped to an
+  overlap penalty under a cost budget, warm-started re-solves
+- the manual way: exclude the previous plan's foods and optimize
+  again from scratch (fresh model every time, no cost control)
+
+Usage:
+    python -m benchmarks.bench_alternatives
+    python -m benchmarks.bench_alternatives --foods 1000 5000 --k 5 --tolerance 0.2
+"""
+
+import argparse
+import time
+
+import numpy as np
+from loguru import logger
+
+from src.optimization.alternatives import alternative_plans
+from src.optimization.compiled_problem import CompiledDietProblem
+from src.optimization.diet_optimizer import DietOptimizer
+from benchmarks.synthetic import make_catalog, full_targets
+
+
+def summarize(plans: list) -> str:
+    costs = [plan["total_cost"] for plan in plans]
+    return f"{len(plans):>2} plans, cost ${min(costs):.2f}-${max(costs):.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--micros", type=int, default=10)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    targets = full_targets(args.micros)
+    optimizer = DietOptimizer(engine="highs")
+
+    print(f"k={args.k}, max cost increase {args.tolerance:.0%}, {len(targets)} targets\n")
+
+    for num_foods in args.foods:
+        foods, prices = make_catalog(num_foods, args.micros)
+        problem = CompiledDietProblem.from_foods(foods, prices, list(targets))
+
+        start = time.perf_counter()
+        plans = alternative_plans(problem, targets, args.k, args.tolerance)
+        diverse = time.perf_counter() - start
+        overlaps = [plan["alternative"]["overlap"] for plan in plans[1:]]
+
+        start = time.perf_counter()
+        remaining = dict(foods)
+        manual = []
+        for _ in range(args.k):
+            result = optimizer.optimize(remaining, prices, targets)
+            if result is None:
+                break
+            manual.append(result)
+            for key in result["selected_foods"]:
+                remaining.pop(key, None)
+        exclude = time.perf_counter() - start
+
+        print(f"{num_foods} foods")
+        print(
+            f"  alternatives     {diverse * 1000:>8.1f}ms  {summarize(plans)}"
+            f"  overlap {np.mean(overlaps) if overlaps else 0:.0%} avg"
+        )
+        if manual:
+            print(f"  exclude+rebuild  {exclude * 1000:>8.1f}ms  {summarize(manual)}  overlap 0% (forced)")
+        print()
+
+
+if __name__ == "__main__":
+    main()
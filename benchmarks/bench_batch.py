@@ -0,0 +1,71 @@
+"""
+Benchmark: serial optimize_for_macros loop vs DietOptimizer.optimize_batch
+
+Generates N user profiles with different macro targets and solves them
+against one catalog, reporting throughput in solves/second.
+
+Usage:
+    python -m benchmarks.bench_batch
+    python -m benchmarks.bench_batch --users 2000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+from loguru import logger
+
+from src.optimization.diet_optimizer import SimpleDietOptimizer
+from benchmarks.synthetic import make_catalog
+
+
+def user_profiles(count: int, seed: int = 11) -> list:
+    """Random but consistent macro targets (calories derived from macros)"""
+
+    rng = np.random.default_rng(seed)
+    profiles = []
+    for _ in range(count):
+        protein = float(rng.uniform(90, 200))
+        carbs = float(rng.uniform(80, 320))
+        fat = float(rng.uniform(40, 100))
+        calories = 4 * protein + 4 * carbs + 9 * fat
+        profiles.append(SimpleDietOptimizer.macro_targets(calories, protein, carbs, fat, 0.15))
+    return profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--serial-users", type=int, default=50,
+                        help="Serial baseline is slow; time a subset and extrapolate")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    logger.remove()
+
+    foods, prices = make_catalog(args.foods, num_micronutrients=0)
+    profiles = user_profiles(args.users)
+    optimizer = SimpleDietOptimizer()
+
+    print(f"{args.foods} foods, {args.users} user profiles, {os.cpu_count()} CPUs\n")
+    print(f"{'mode':>22} {'solves/sec':>11}")
+    print("-" * 34)
+
+    serial = profiles[:args.serial_users]
+    start = time.perf_counter()
+    for targets in serial:
+        optimizer.optimize(foods, prices, targets)
+    print(f"{'serial PuLP loop':>22} {len(serial) / (time.perf_counter() - start):>11.1f}")
+
+    for workers in args.workers:
+        for _ in optimizer.optimize_batch(foods, prices, profiles, workers=workers):
+            pass
+        stats = optimizer.last_batch_stats
+        print(f"{f'batch, {workers} workers':>22} {stats['solves_per_second']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
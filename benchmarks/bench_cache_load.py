@@ -0,0 +1,119 @@
+"""
+Benchmark: loading cached foods - validated vs trusted construction
+
+Fills a temporary NutritionCache with synthetic foods (85 nutrients
+each, 10k at a time) and loads every one back, four ways:
+- legacy: get_food per ID as it was (sqlite3.Row, json.loads,
+  NutrientInfo(**n) and USDAFood(...) validation)
+- get_food: per ID, trusted construction
+- bulk, validated: iter_foods(validate=True) - one query, batches
+- bulk, trusted: iter_foods() - the default
+
+Every method keeps 1000 foods at a time, then drops them: 100k
+USDAFood objects need ~4 GB. Keeping them is what makes a bulk load
+slow beyond construction - the cyclic GC keeps re-scanning them.
+Also checks trusted and validated loads produce equal models.
+
+Usage:
+    python -m benchmarks.bench_cache_load
+    python -m benchmarks.bench_cache_load --foods 20000
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from src.database.cache import NutritionCache
+from src.ingestion.models import NutrientInfo, USDAFood
+from benchmarks.synthetic import make_catalog
+
+
+CHUNK = 10_000
+
+
+def legacy_get_food(cache: NutritionCache, fdc_id: int) -> USDAFood:
+    """The original get_food: Row access, json, full validation"""
+    cursor = cache.conn.cursor()
+    cursor.row_factory = cache.conn.row_factory
+    cursor.execute("SELECT * FROM usda_foods WHERE fdc_id = ?", (fdc_id,))
+    row = cursor.fetchone()
+    nutrients = [NutrientInfo(**n) for n in json.loads(row["nutrients_json"])]
+    return USDAFood(
+        fdc_id=row["fdc_id"],
+        description=row["description"],
+        food_category=row["food_category"],
+        nutrients=nutrients,
+        data_type=row["data_type"],
+        publication_date=row["publication_date"]
+    )
+
+
+def fill(cache: NutritionCache, num_foods: int):
+    for start in range(0, num_foods, CHUNK):
+        foods, _ = make_catalog(min(CHUNK, num_foods - start), seed=start)
+        for j, food in enumerate(foods.values()):
+            food.fdc_id = 1_000_000 + start + j
+        cache.store_foods(foods.values())
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, default=100_000)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = NutritionCache(str(Path(tmp) / "cache.db"))
+        fill(cache, args.foods)
+        ids = [1_000_000 + j for j in range(args.foods)]
+
+        # Trusted == validated, on a sample
+        sample = ids[::max(1, args.foods // 500)]
+        trusted = cache.get_foods(sample)
+        validated = cache.get_foods(sample, validate=True)
+        assert all(trusted[i] == validated[i] == legacy_get_food(cache, i) for i in sample)
+
+        def per_id(load):
+            def run():
+                for start in range(0, len(ids), 1000):
+                    batch = {fdc_id: load(fdc_id) for fdc_id in ids[start:start + 1000]}
+            return run
+
+        def bulk(validate):
+            def run():
+                for batch in cache.iter_foods(validate=validate):
+                    pass
+            return run
+
+        methods = [
+            ("legacy get_food", per_id(lambda fdc_id: legacy_get_food(cache, fdc_id))),
+            ("get_food (trusted)", per_id(cache.get_food)),
+            ("bulk, validated", bulk(True)),
+            ("bulk, trusted", bulk(False)),
+        ]
+
+        print(f"{args.foods:,} cached foods, 85 nutrients each\n")
+        print(f"{'load':<22} {'total':>9} {'per food':>10} {'speedup':>8}")
+        print("-" * 53)
+        baseline = None
+        for label, run in methods:
+            seconds = timed(run)
+            baseline = baseline or seconds
+            print(f"{label:<22} {seconds:>8.1f}s {seconds / args.foods * 1e6:>8.0f}us {baseline / seconds:>7.1f}x")
+
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark: worker cold start - replaying the cache vs mapping a snapshot
+
+Fills a temporary NutritionCache with synthetic foods (85 nutrients
+each), exports it as a catalog snapshot, then starts fresh worker
+processes that each need the catalog as a FoodFrame:
+- replay: stream the cache (iter_foods, trusted construction) into a
+  frame batch by batch - the cheapest warm start without a snapshot
+- snapshot: load_catalog() on the Arrow file
+
+Timings are taken inside the workers after imports, with the file in
+the OS page cache (it was just written). "touch" reads every nutrient
+value once, faulting in the mapped pages.
+
+The snapshot workers run side by side; each reports its resident
+(Rss) and proportional (Pss) share of the mapping from
+/proc/self/smaps. Pss ~ Rss / workers means one copy in memory.
+
+Usage:
+    python -m benchmarks.bench_catalog_snapshot
+    python -m benchmarks.bench_catalog_snapshot --foods 20000 --workers 2
+"""
+
+import argparse
+import multiprocessing as mp
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from src.database.cache import NutritionCache
+from src.database.catalog import _concat, export_catalog, load_catalog
+from src.processing.food_frame import FoodFrame
+from benchmarks.bench_cache_load import fill
+
+
+def mapped_memory(path: str):
+    """(Rss, Pss) in MB of this process's mappings of `path`, None without /proc"""
+    try:
+        lines = Path("/proc/self/smaps").read_text().splitlines()
+    except OSError:
+        return None
+
+    rss = pss = 0
+    inside = False
+    for line in lines:
+        fields = line.split()
+        if "-" in fields[0] and ":" not in fields[0]:      # mapping header
+            inside = fields[-1] == path
+        elif inside and fields[0] in ("Rss:", "Pss:"):
+            if fields[0] == "Rss:":
+                rss += int(fields[1])
+            else:
+                pss += int(fields[1])
+    return rss / 1024, pss / 1024
+
+
+def replay_worker(db_path: str, snapshot: str, results):
+    logger.remove()
+    start = time.perf_counter()
+    cache = NutritionCache(db_path)
+    frame = _concat([
+        FoodFrame.from_foods({str(fdc_id): food for fdc_id, food in batch.items()}, keep_foods=False)
+        for batch in cache.iter_foods(batch_size=10_000)
+    ])
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame.matrix.values.sum()
+    touch = time.perf_counter() - start
+
+    mapped = load_catalog(snapshot)
+    same = (
+        mapped.food_keys == frame.food_keys
+        and mapped.nutrient_names == frame.nutrient_names
+        and np.array_equal(mapped.matrix.values, frame.matrix.values)
+        and np.array_equal(mapped.fdc_ids, frame.fdc_ids)
+        and list(mapped.descriptions) == list(frame.descriptions)
+    )
+    cache.close()
+    results.put(("replay", load, touch, None, same))
+
+
+def snapshot_worker(snapshot: str, barrier, results):
+    logger.remove()
+    start = time.perf_counter()
+    frame = load_catalog(snapshot)
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame.matrix.values.sum()
+    touch = time.perf_counter() - start
+
+    # Measure while every worker holds the pages
+    barrier.wait()
+    memory = mapped_memory(str(Path(snapshot).resolve()))
+    barrier.wait()
+    results.put(("snapshot", load, touch, memory, True))
+
+
+def run(context, target, *args):
+    process = context.Process(target=target, args=args)
+    process.start()
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    logger.remove()
+    context = mp.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "cache.db")
+        snapshot = str(Path(tmp) / "catalog.arrow")
+
+        cache = NutritionCache(db_path)
+        fill(cache, args.foods)
+        start = time.perf_counter()
+        export_catalog(cache, snapshot)
+        export = time.perf_counter() - start
+        cache.close()
+
+        size = Path(snapshot).stat().st_size / 2**20
+        print(f"{args.foods:,} foods, 85 nutrients each: snapshot {size:.0f} MB, exported in {export:.1f}s\n")
+
+        results = context.Queue()
+        run(context, replay_worker, db_path, snapshot, results).join()
+        barrier = context.Barrier(args.workers)
+        workers = [run(context, snapshot_worker, snapshot, barrier, results) for _ in range(args.workers)]
+        rows = [results.get() for _ in range(args.workers + 1)]
+        for worker in workers:
+            worker.join()
+
+        print(f"{'worker':<10} {'load':>10} {'touch':>9} {'mapped Rss':>11} {'Pss':>8}")
+        print("-" * 52)
+        for label, load, touch, memory, same in rows:
+            rss, pss = (f"{memory[0]:.0f}MB", f"{memory[1]:.0f}MB") if memory else ("-", "-")
+            print(f"{label:<10} {load * 1000:>8.0f}ms {touch * 1000:>7.0f}ms {rss:>11} {pss:>8}")
+
+        replay = rows[0][1]
+        mapped = np.median([row[1] for row in rows[1:]])
+        print(f"\ncold start {replay / mapped:,.0f}x faster; snapshot frame identical: {rows[0][4]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: column generation vs one LP over the whole catalog
+
+Both find the same optimum. The full LP holds every food; column
+generation holds only the foods that priced in, so build time and
+solver memory follow the active set.
+
+Usage:
+    python -m benchmarks.bench_column_generation
+    python -m benchmarks.bench_column_generation --foods 10000 100000 300000
+"""
+
+import argparse
+import time
+
+from loguru import logger
+
+from src.optimization.compiled_problem import CompiledDietProblem
+from src.optimization.diet_optimizer import DietOptimizer
+from src.optimization.nutrient_matrix import NutrientMatrix, cost_per_gram
+from benchmarks.synthetic import make_catalog, full_targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, nargs="+", default=[10000, 50000, 200000])
+    parser.add_argument("--micros", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=25, help="Columns added per round")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    targets = full_targets(args.micros)
+    optimizer = DietOptimizer(engine="highs")
+
+    print(f"{len(targets)} targets, {args.batch} columns per round\n")
+    print(f"{'foods':>7} {'full LP':>9} {'colgen':>9} {'speedup':>8} {'rounds':>7} {'active':>7} {'cost match':>11}")
+    print("-" * 64)
+
+    for num_foods in args.foods:
+        foods, prices = make_catalog(num_foods, args.micros)
+        # Catalog matrix is shared input for both (built once per catalog)
+        catalog = NutrientMatrix.from_foods(foods, list(targets), sparse=True)
+
+        start = time.perf_counter()
+        problem = CompiledDietProblem(catalog, cost_per_gram(prices, catalog.food_keys))
+        _, _, full_cost = problem.solve_vector(targets)
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = optimizer.optimize_column_generation(
+            foods, prices, targets, columns_per_round=args.batch, catalog=catalog
+        )
+        colgen = time.perf_counter() - start
+        stats = result["solver_stats"]
+
+        print(
+            f"{num_foods:>7} {full * 1000:>7.0f}ms {colgen * 1000:>7.0f}ms {full / colgen:>7.1f}x "
+            f"{stats['rounds']:>7} {stats['active_columns']:>7} "
+            f"{abs(result['total_cost'] - full_cost) < 1e-6 * full_cost!s:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: memory per food - USDAFood vs CompactFood
+
+Generates synthetic catalogs (4 macros + 81 micronutrients, i.e. a
+full ~85-nutrient USDA profile) and measures retained heap with
+tracemalloc:
+- USDAFood: the parsed pydantic models (list of NutrientInfo per food)
+- CompactFood: registry columns + amounts arrays, shared registry
+
+The 100k USDAFood catalog needs ~4.5 GB, so by default it is
+extrapolated from the 10k measurement (per-food cost is flat); pass
+--measure-all on a machine with the memory. The 100k compact catalog
+is always measured, built 10k foods at a time.
+
+Also checks every conversion round-trips exactly and times conversion
+and lookups.
+
+Usage:
+    python -m benchmarks.bench_compact_foods
+    python -m benchmarks.bench_compact_foods --sizes 10000 100000 --measure-all
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from loguru import logger
+
+from src.ingestion.compact import CompactFood, NutrientRegistry
+from benchmarks.synthetic import make_catalog
+
+
+CHUNK = 10_000
+
+
+def traced() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def measure_models(num_foods: int) -> int:
+    """Retained bytes of a USDAFood catalog"""
+    before = traced()
+    foods, prices = make_catalog(num_foods, seed=num_foods)
+    del prices
+    size = traced() - before
+    del foods
+    return size
+
+
+def measure_compact(num_foods: int, registry: NutrientRegistry) -> int:
+    """Retained bytes of the same catalog compacted (built chunk by chunk)"""
+    before = traced()
+    compact = {}
+    for start in range(0, num_foods, CHUNK):
+        foods, _ = make_catalog(min(CHUNK, num_foods - start), seed=start)
+        for food_key, food in foods.items():
+            compact[f"{start}_{food_key}"] = CompactFood.from_food(food, registry)
+        del foods
+    size = traced() - before
+    del compact
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--measure-all", action="store_true",
+                        help="Measure USDAFood catalogs of every size instead of extrapolating")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    # Round trip, conversion and lookup timings (untraced)
+    foods, _ = make_catalog(2000)
+    registry = NutrientRegistry()
+
+    start = time.perf_counter()
+    compact = {food_key: CompactFood.from_food(food, registry) for food_key, food in foods.items()}
+    to_compact = (time.perf_counter() - start) / len(foods)
+
+    start = time.perf_counter()
+    restored = {food_key: food.to_food() for food_key, food in compact.items()}
+    to_model = (time.perf_counter() - start) / len(foods)
+
+    lossless = all(restored[food_key] == food for food_key, food in foods.items())
+
+    names = ["Energy", "Protein", "Micronutrient 040"]
+    start = time.perf_counter()
+    for food in compact.values():
+        for name in names:
+            food.get_nutrient(name)
+    lookup = (time.perf_counter() - start) / (len(compact) * len(names))
+
+    print(f"{len(registry)} registry columns, 85 nutrients per food")
+    print(f"from_food {to_compact * 1e6:.0f}us, to_food {to_model * 1e6:.0f}us per food, "
+          f"get_nutrient {lookup * 1e9:.0f}ns; round trip exact: {lossless}\n")
+    del foods, compact, restored
+
+    tracemalloc.start()
+    per_food = None
+
+    print(f"{'foods':>8} {'USDAFood':>12} {'CompactFood':>12} {'per food':>16} {'ratio':>7}")
+    print("-" * 60)
+    for num_foods in args.sizes:
+        if args.measure_all or per_food is None:
+            models = measure_models(num_foods)
+            per_food = models / num_foods
+            note = ""
+        else:
+            models = per_food * num_foods
+            note = "  (USDAFood extrapolated)"
+
+        small = measure_compact(num_foods, NutrientRegistry())
+        print(
+            f"{num_foods:>8,} {models / 2**20:>10.0f}MB {small / 2**20:>10.1f}MB "
+            f"{models / num_foods / 1024:>6.1f}KB -> {small / num_foods:>4.0f}B {models / small:>6.0f}x{note}"
+        )
+
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
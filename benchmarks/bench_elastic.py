@@ -0,0 +1,70 @@
+"""
+Benchmark: elastic infeasibility diagnosis vs trial-and-error
+
+For an infeasible target set, compares:
+- one elastic LP (slack on every target, minimize weighted violation)
+- the naive alternative: re-solve once per target with that target
+  dropped, to find which ones matter (k extra solves, and still no
+  "by how much")
+
+Usage:
+    python -m benchmarks.bench_elastic
+    python -m benchmarks.bench_elastic --foods 1000 10000 --micros 40
+"""
+
+import argparse
+import time
+
+from loguru import logger
+
+from src.optimization.compiled_problem import CompiledDietProblem
+from benchmarks.synthetic import make_catalog, full_targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--micros", type=int, default=20)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    targets = full_targets(args.micros)
+    # Two conflicts: too much protein for the fat cap, one unreachable micronutrient
+    targets["Protein"] = (400, 450)
+    targets["Total lipid (fat)"] = (None, 20)
+    targets["Micronutrient 000"] = (500, None)
+
+    print(f"{len(targets)} targets, with a protein/fat/energy conflict and an unreachable micronutrient\n")
+    print(f"{'foods':>6} {'solve':>8} {'elastic':>8} {'drop-one':>9} {'found':>6}")
+    print("-" * 42)
+
+    for num_foods in args.foods:
+        foods, prices = make_catalog(num_foods, args.micros)
+        problem = CompiledDietProblem.from_foods(foods, prices, list(targets))
+
+        start = time.perf_counter()
+        status, _, _ = problem.solve_vector(targets)
+        solve = time.perf_counter() - start
+        assert status != "Optimal"
+
+        start = time.perf_counter()
+        report = problem.diagnose(targets)
+        elastic = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for name in targets:
+            problem.solve_vector({key: value for key, value in targets.items() if key != name})
+        drop_one = time.perf_counter() - start
+
+        print(
+            f"{num_foods:>6} {solve * 1000:>6.1f}ms {elastic * 1000:>6.1f}ms "
+            f"{drop_one * 1000:>7.1f}ms {len(report.violations):>6}"
+        )
+
+        for line in report.messages():
+            print(f"         {line}")
+
+
+if __name__ == "__main__":
+    main()
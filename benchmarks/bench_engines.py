@@ -0,0 +1,61 @@
+"""
+Benchmark: PuLP engine vs matrix-native HiGHS engine
+
+Measures build + solve wall time of DietOptimizer.optimize for both
+engines at increasing catalog sizes, with the 4 macros plus 81
+micronutrient constraints (85 nutrient rows, like real USDA profiles).
+
+Usage:
+    python -m benchmarks.bench_engines
+    python -m benchmarks.bench_engines --sizes 100 1000
+"""
+
+import argparse
+import time
+
+from loguru import logger
+
+from src.optimization.diet_optimizer import DietOptimizer
+from benchmarks.synthetic import make_catalog, full_targets
+
+
+def time_engine(engine: str, foods, prices, targets) -> tuple:
+    """Return (seconds, total_cost) for one optimize() call"""
+
+    optimizer = DietOptimizer(engine=engine)
+
+    start = time.perf_counter()
+    result = optimizer.optimize(foods, prices, targets)
+    elapsed = time.perf_counter() - start
+
+    cost = result["total_cost"] if result else float("nan")
+    return elapsed, cost
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+
+    logger.remove()  # Keep benchmark output readable
+
+    targets = full_targets()
+
+    print(f"{'foods':>8} {'pulp (s)':>10} {'highs (s)':>10} {'speedup':>8} {'cost match':>11}")
+    print("-" * 52)
+
+    for size in args.sizes:
+        foods, prices = make_catalog(size)
+
+        pulp_time, pulp_cost = time_engine("pulp", foods, prices, targets)
+        highs_time, highs_cost = time_engine("highs", foods, prices, targets)
+
+        match = abs(pulp_cost - highs_cost) <= 1e-4 * max(1.0, abs(pulp_cost))
+        print(
+            f"{size:>8} {pulp_time:>10.3f} {highs_time:>10.3f} "
+            f"{pulp_time / highs_time:>7.1f}x {str(match):>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
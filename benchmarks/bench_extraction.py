@@ -0,0 +1,137 @@
+"""
+Benchmark: PuLP result extraction - per-variable loop vs solution vector
+
+Solves once per target count, then replays only the extraction step on
+the PuLP variables (values set from the solution, as after
+prob.solve()). The loop version calls value() per variable and
+get_nutrient() per selected food and targeted nutrient; the vectorized
+version reads the solution vector once and sums every nutrient of the
+plan with one sparse matrix-vector product (build_result).
+
+"sliced" is the same extraction when the caller passes optimize() a
+catalog matrix it already holds (built outside the timing): the plan's
+columns are sliced from it instead of read from the foods.
+
+Usage:
+    python -m benchmarks.bench_extraction
+    python -m benchmarks.bench_extraction --foods 5000 --targets 4 20 45 85
+"""
+
+import argparse
+import time
+
+import numpy as np
+from loguru import logger
+from pulp import LpVariable, value
+
+from src.optimization.diet_optimizer import DietOptimizer
+from src.optimization.nutrient_matrix import NutrientMatrix
+from src.optimization.solution import MIN_QUANTITY_GRAMS, build_result
+from benchmarks.synthetic import make_catalog, full_targets
+
+
+def extract_loop(foods, prices, food_vars, targets):
+    """The original extraction: value() per variable, get_nutrient() per nutrient"""
+
+    selected_foods = {}
+    total_nutrients = {}
+
+    for food_key, var in food_vars.items():
+        quantity = value(var)
+
+        if quantity > MIN_QUANTITY_GRAMS:
+            selected_foods[food_key] = {
+                "quantity_grams": quantity,
+                "food": foods[food_key],
+                "price": prices.get(food_key, 0) * (quantity / 453.6)
+            }
+            for nutrient_name in targets:
+                nutrient_value = foods[food_key].get_nutrient(nutrient_name)
+                if nutrient_value:
+                    contribution = nutrient_value * quantity / 100.0
+                    total_nutrients[nutrient_name] = total_nutrients.get(nutrient_name, 0) + contribution
+
+    return selected_foods, total_nutrients
+
+
+def extract_vector(foods, prices, food_vars, targets, total_cost, optimizer=None, catalog=None):
+    """Same steps as DietOptimizer._optimize_pulp"""
+
+    food_keys = list(food_vars)
+    quantities = np.fromiter(
+        (var.varValue or 0.0 for var in food_vars.values()), dtype=float, count=len(food_keys)
+    )
+    chosen = np.flatnonzero(quantities > MIN_QUANTITY_GRAMS)
+    selected = {food_keys[j]: foods[food_keys[j]] for j in chosen}
+    if catalog is not None:
+        matrix = optimizer._catalog_slice(catalog, list(selected))
+    else:
+        matrix = NutrientMatrix.from_foods(selected, sparse=True)
+
+    return build_result(selected, prices, matrix, quantities[chosen], total_cost, targets, catalog=matrix)
+
+
+def best_of(function, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, default=5000)
+    parser.add_argument("--targets", type=int, nargs="+", default=[4, 20, 45, 85])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    foods, prices = make_catalog(args.foods, num_micronutrients=81)
+    optimizer = DietOptimizer(engine="highs")
+    catalog = NutrientMatrix.from_foods(foods, sparse=True)
+
+    print(f"{args.foods} foods, extraction only (best of {args.repeats})\n")
+    print(f"{'targets':>7} {'selected':>9} {'loop':>9} {'vector':>9} {'speedup':>8} "
+          f"{'sliced':>9} {'max diff':>9} {'all totals':>11}")
+    print("-" * 80)
+
+    for num_targets in args.targets:
+        targets = dict(list(full_targets(81).items())[:num_targets])
+        solved = optimizer.optimize(foods, prices, targets)
+        if solved is None:
+            print(f"{num_targets:>7} {'infeasible':>9}")
+            continue
+
+        # PuLP variables as prob.solve() leaves them
+        food_vars = {}
+        for food_key in foods:
+            var = LpVariable(f"food_{food_key}", lowBound=0)
+            var.varValue = solved["selected_foods"].get(food_key, {}).get("quantity_grams", 0.0)
+            food_vars[food_key] = var
+
+        _, loop_totals = extract_loop(foods, prices, food_vars, targets)
+        result = extract_vector(foods, prices, food_vars, targets, solved["total_cost"])
+        diff = max(abs(loop_totals[name] - result["total_nutrients"][name]) for name in loop_totals)
+
+        loop = best_of(lambda: extract_loop(foods, prices, food_vars, targets), args.repeats)
+        vector = best_of(
+            lambda: extract_vector(foods, prices, food_vars, targets, solved["total_cost"]), args.repeats
+        )
+        sliced = best_of(
+            lambda: extract_vector(foods, prices, food_vars, targets, solved["total_cost"], optimizer, catalog),
+            args.repeats
+        )
+
+        print(
+            f"{num_targets:>7} {result['num_foods']:>9} {loop * 1000:>7.2f}ms {vector * 1000:>7.2f}ms "
+            f"{loop / vector:>7.1f}x {sliced * 1000:>7.2f}ms {diff:>9.1e} {len(result['all_nutrient_totals']):>11}"
+        )
+
+    print("\nThe vectorized extraction also returns all_nutrient_totals for every nutrient.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark: whole-catalog questions - dict of USDAFood vs FoodFrame
+
+Synthetic catalogs (85 nutrients per food) with descriptions and
+categories borrowed from the curated database, so dietary keywords
+actually match. Each question is answered the way the app used to
+(loop over the food dict) and with a FoodFrame built once:
+- cheapest protein per gram: top 10 foods by $/g protein
+- restrictions: the app's Vegan + Nut Allergy keyword filter
+- restricted catalog matrix: what the optimizer then needs - rebuilt
+  from the kept foods, or sliced out of the frame's matrix
+- nutrition summary: SmartFoodSearch.get_nutrition_summary per food
+
+The frame build is a one-off per food set; its nutrient matrix then
+goes to the optimizer as the catalog matrix, which the app otherwise
+builds separately.
+
+Usage:
+    python -m benchmarks.bench_food_frame
+    python -m benchmarks.bench_food_frame --sizes 1000 10000 50000
+"""
+
+import argparse
+import time
+
+import numpy as np
+from loguru import logger
+
+from src.ingestion.food_search import SmartFoodSearch
+from src.ingestion.quality_foods import QUALITY_FOOD_DATABASE
+from src.optimization.nutrient_matrix import GRAMS_PER_POUND, NutrientMatrix
+from src.processing.food_frame import FoodFrame
+from benchmarks.synthetic import make_catalog
+
+
+VEGAN = ['meat', 'beef', 'pork', 'chicken', 'turkey', 'fish', 'salmon', 'tuna',
+         'dairy', 'milk', 'cheese', 'yogurt', 'egg']
+NUTS = ['nut', 'almond', 'walnut', 'peanut', 'cashew']
+
+
+def realistic_catalog(num_foods: int):
+    """make_catalog with curated descriptions/categories cycled over the foods"""
+    foods, prices = make_catalog(num_foods)
+    names = [(info["name"], category) for category, entries in QUALITY_FOOD_DATABASE.items()
+             for info in entries.values()]
+    for j, food in enumerate(foods.values()):
+        name, category = names[j % len(names)]
+        food.description = f"{name} #{j}"
+        food.food_category = category
+    return foods, prices
+
+
+def loop_cheapest_protein(foods, prices, top=10):
+    costs = []
+    for key, food in foods.items():
+        protein = food.get_nutrient("Protein") or 0
+        if protein > 0 and key in prices:
+            costs.append((prices[key] / (protein / 100 * GRAMS_PER_POUND), key))
+    return [key for _, key in sorted(costs)[:top]]
+
+
+def frame_cheapest_protein(frame, prices, top=10):
+    return frame.rank(frame.cost_per_nutrient(prices, "Protein"), top=top)
+
+
+def loop_restrictions(foods):
+    """The app's old apply_restrictions for Vegan + Nut Allergy"""
+    kept = {}
+    for key, food in foods.items():
+        desc = food.description.lower()
+        category = (food.food_category or "").lower()
+        if any(kw in desc or kw in category for kw in VEGAN):
+            continue
+        if any(kw in desc for kw in NUTS):
+            continue
+        kept[key] = food
+    return kept
+
+
+def frame_restrictions(frame):
+    skip = frame.contains(VEGAN) | frame.contains(NUTS, ("description",))
+    return frame.where(~skip)
+
+
+def best_of(function, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    logger.remove()
+    search = SmartFoodSearch.__new__(SmartFoodSearch)  # no client needed for summaries
+
+    for num_foods in args.sizes:
+        foods, prices = realistic_catalog(num_foods)
+        price_array = np.array([prices[key] for key in foods])
+
+        # Per-food nutrient indexes are built on first use by either path
+        for food in foods.values():
+            food.nutrient_index()
+
+        build = best_of(lambda: FoodFrame.from_foods(foods), repeats=1)
+        frame = FoodFrame.from_foods(foods)
+        matrix_build = best_of(lambda: NutrientMatrix.from_foods(foods, sparse=True), repeats=1)
+
+        # Same answers both ways
+        assert loop_cheapest_protein(foods, prices) == frame_cheapest_protein(frame, prices)
+        assert list(loop_restrictions(foods)) == frame_restrictions(frame).food_keys
+
+        questions = [
+            ("cheapest protein (price dict)",
+             lambda: loop_cheapest_protein(foods, prices), lambda: frame_cheapest_protein(frame, prices)),
+            ("cheapest protein (price array)",
+             lambda: loop_cheapest_protein(foods, prices), lambda: frame_cheapest_protein(frame, price_array)),
+            ("restrictions",
+             lambda: loop_restrictions(foods), lambda: frame_restrictions(frame)),
+            ("restricted catalog matrix",
+             lambda: NutrientMatrix.from_foods(loop_restrictions(foods), sparse=True),
+             lambda: frame_restrictions(frame).matrix),
+            ("nutrition summary",
+             lambda: [search.get_nutrition_summary(food) for food in foods.values()],
+             lambda: frame.nutrition_summary()),
+        ]
+
+        per_k = 1000 / num_foods
+        print(f"\n{num_foods:,} foods - frame build {build * 1000:.0f}ms once "
+              f"(catalog matrix alone {matrix_build * 1000:.0f}ms, handed over for free)")
+        print(f"{'question':<32} {'dict loop':>14} {'FoodFrame':>14} {'speedup':>8}")
+        print("-" * 72)
+        for label, loop, vectorized in questions:
+            slow, fast = best_of(loop), best_of(vectorized)
+            print(f"{label:<32} {slow * 1e6 * per_k:>9.0f}us/1k {fast * 1e6 * per_k:>9.1f}us/1k "
+                  f"{slow / fast:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
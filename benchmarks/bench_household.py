@@ -0,0 +1,116 @@
+"""
+Benchmark: household block LP vs planning each member separately
+
+1. Grams: one model with members x days blocks vs one multi-day model
+   per member (build + solve). The cost is the same either way - with
+   gram purchases nothing is shared - so this measures time only.
+2. Packages: one shared cart of whole packages vs the sum of per-member
+   carts. Rounding up once per household instead of once per person is
+   where the savings come from.
+
+Usage:
+    python -m benchmarks.bench_household
+    python -m benchmarks.bench_household --foods 2000 --members 6 --days 7 --time-limit 10
+"""
+
+import argparse
+import time
+
+from loguru import logger
+
+from src.optimization.household import HouseholdMember, HouseholdProblem
+from src.optimization.multi_day import MultiDayProblem
+from src.optimization.packages import PackageProblem
+from benchmarks.synthetic import make_catalog, make_packages, macro_targets
+
+
+# Daily needs relative to the 2000 kcal preset: adults, a teenager, children
+MEMBER_SCALES = (1.25, 1.0, 1.1, 0.8, 0.65, 0.5, 0.9, 0.75)
+
+
+def make_members(count: int):
+    members = []
+    for i in range(count):
+        scale = MEMBER_SCALES[i % len(MEMBER_SCALES)]
+        targets = {
+            name: (low * scale, high * scale)
+            for name, (low, high) in macro_targets().items()
+        }
+        members.append(HouseholdMember(name=f"Member {i + 1}", targets=targets))
+    return members
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, default=2000)
+    parser.add_argument("--members", type=int, default=6)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--products", type=int, default=200,
+                        help="Package options for the cart comparison (two sizes per food)")
+    parser.add_argument("--package-days", type=int, default=3)
+    parser.add_argument("--time-limit", type=float, default=10.0)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    members = make_members(args.members)
+    nutrient_names = list(macro_targets())
+
+    # 1. Grams: one household model vs one model per member
+    foods, prices = make_catalog(args.foods, num_micronutrients=0)
+
+    start = time.perf_counter()
+    separate_cost = 0.0
+    for member in members:
+        problem = MultiDayProblem.from_foods(foods, prices, nutrient_names, args.days)
+        separate_cost += problem.solve(member.targets)["total_cost"]
+    separate_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    household = HouseholdProblem.from_foods(foods, prices, members, args.days)
+    result = household.solve()
+    household_time = time.perf_counter() - start
+
+    print(f"{args.members} members x {args.days} days, {args.foods} foods (gram purchases)\n")
+    print(f"{'approach':<22} {'blocks':>7} {'columns':>9} {'cost':>9} {'time':>8}")
+    print("-" * 60)
+    print(f"{'one model per member':<22} {args.days:>7} {'':>9} {separate_cost:>9.2f} {separate_time:>7.2f}s")
+    print(
+        f"{'household block LP':<22} {household.num_blocks:>7} {household.model.highs.getNumCol():>9} "
+        f"{result['total_cost']:>9.2f} {household_time:>7.2f}s"
+    )
+    print(f"\nSpeedup: {separate_time / household_time:.1f}x")
+
+    # 2. Packages: one shared cart vs one cart per member
+    foods, prices = make_catalog(args.products // 2, num_micronutrients=0)
+    packages = make_packages(foods, prices, per_food=2)
+
+    start = time.perf_counter()
+    separate_carts = 0.0
+    for member in members:
+        problem = PackageProblem(foods, packages, nutrient_names, args.package_days)
+        problem.highs.setOptionValue("time_limit", args.time_limit)
+        separate_carts += problem.solve(member.targets)["total_cost"]
+    separate_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    household = HouseholdProblem(foods, prices, members, args.package_days, packages=packages)
+    household.model.highs.setOptionValue("time_limit", args.time_limit)
+    result = household.solve()
+    household_time = time.perf_counter() - start
+
+    print(f"\n{args.members} members x {args.package_days} days, {args.products} packages (whole packages)\n")
+    print(f"{'approach':<22} {'cart':>9} {'gap':>7} {'time':>8}")
+    print("-" * 50)
+    print(f"{'one cart per member':<22} {separate_carts:>9.2f} {'':>7} {separate_time:>7.2f}s")
+    print(f"{'shared household cart':<22} {result['total_cost']:>9.2f} {result['mip']['gap']:>6.1%} {household_time:>7.2f}s")
+    print(f"\nSharing saves ${separate_carts - result['total_cost']:.2f} "
+          f"({1 - result['total_cost'] / separate_carts:.1%})")
+
+    print("\nCost shares (shared cart):")
+    for member in result["members"]:
+        print(f"  {member['name']:<10} ${member['cost_share']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
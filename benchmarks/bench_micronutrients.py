@@ -0,0 +1,83 @@
+"""
+Benchmark: micronutrient rows on a sparse catalog matrix
+
+Compares, per catalog size:
+- reading every food's nutrient list into a dense matrix per problem
+  (the old path) vs building one sparse catalog matrix and slicing rows
+- compile + solve with the 4 macro rows vs macros + 40 micronutrient rows
+
+Micronutrient rows are sparse (each food reports only some of them), so
+the extra rows should cost roughly their nonzeros, not foods x 40.
+
+Usage:
+    python -m benchmarks.bench_micronutrients
+    python -m benchmarks.bench_micronutrients --foods 1000 10000 50000 --density 0.3
+"""
+
+import argparse
+import time
+
+from loguru import logger
+
+from src.optimization.nutrient_matrix import NutrientMatrix
+from src.optimization.compiled_problem import CompiledDietProblem
+from benchmarks.synthetic import make_catalog, full_targets, macro_targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--micros", type=int, default=81,
+                        help="Micronutrients per food profile (USDA reports ~85 nutrients)")
+    parser.add_argument("--rows", type=int, default=40, help="Micronutrient rows to constrain")
+    parser.add_argument("--density", type=float, default=0.3,
+                        help="Share of micronutrients each food reports")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    macros = macro_targets()
+    targets = full_targets(args.rows)
+    # Keep the minimums reachable at low density
+    targets.update({name: (1.0, None) for name in list(targets)[len(macros):]})
+
+    print(f"{args.micros} micronutrients per profile at {args.density:.0%} density; "
+          f"{len(macros)} macro rows vs {len(targets)} rows\n")
+    print(f"{'foods':>6} {'dense read':>11} {'catalog':>9} {'slice':>8} {'nnz':>10} "
+          f"{'4 rows':>8} {f'{len(targets)} rows':>8} {'$ 4':>6} {f'$ {len(targets)}':>6}")
+    print("-" * 86)
+
+    for num_foods in args.foods:
+        foods, prices = make_catalog(num_foods, args.micros, micro_density=args.density)
+
+        start = time.perf_counter()
+        NutrientMatrix.from_foods(foods, list(targets))
+        dense_read = time.perf_counter() - start
+
+        start = time.perf_counter()
+        catalog = NutrientMatrix.from_foods(foods, sparse=True)
+        catalog_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        selected = catalog.select(list(targets))
+        slice_time = time.perf_counter() - start
+
+        timings = []
+        costs = []
+        for problem_targets in (macros, targets):
+            start = time.perf_counter()
+            problem = CompiledDietProblem.from_foods(
+                foods, prices, list(problem_targets), catalog=catalog
+            )
+            status, _, cost = problem.solve_vector(problem_targets)
+            timings.append(time.perf_counter() - start)
+            costs.append(f"{cost:>6.2f}" if status == "Optimal" else f"{'-':>6}")
+
+        print(
+            f"{num_foods:>6} {dense_read:>10.3f}s {catalog_time:>8.3f}s {slice_time * 1000:>6.1f}ms "
+            f"{selected.nnz:>10} {timings[0]:>7.3f}s {timings[1]:>7.3f}s {costs[0]} {costs[1]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
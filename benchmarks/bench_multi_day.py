@@ -0,0 +1,64 @@
+"""
+Benchmark: multi-day block LP for 7 to 28 day horizons
+
+Each day gets its own consumption variables and nutrient rows; one
+purchase vector is shared. Reports model size, build and solve time.
+
+Usage:
+    python -m benchmarks.bench_multi_day
+    python -m benchmarks.bench_multi_day --foods 10000 --days 7 14 21 28 --micros 20
+"""
+
+import argparse
+import time
+
+from loguru import logger
+
+from src.optimization.multi_day import MultiDayProblem
+from benchmarks.synthetic import make_catalog, full_targets, macro_targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--days", type=int, nargs="+", default=[7, 14, 21, 28])
+    parser.add_argument("--micros", type=int, default=0,
+                        help="Micronutrient minimums per day on top of the macros")
+    parser.add_argument("--max-grams-per-day", type=float, default=200.0,
+                        help="Max-repeat limit: grams of one food per day")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    targets = full_targets(args.micros) if args.micros else macro_targets()
+
+    print(f"{len(targets)} nutrient rows per day, max {args.max_grams_per_day:.0f} g of one food per day\n")
+    print(f"{'foods':>6} {'days':>5} {'columns':>9} {'nonzeros':>10} "
+          f"{'build':>8} {'solve':>8} {'total':>8} {'$/day':>7}")
+    print("-" * 70)
+
+    for num_foods in args.foods:
+        foods, prices = make_catalog(num_foods, args.micros)
+
+        for num_days in args.days:
+            start = time.perf_counter()
+            problem = MultiDayProblem.from_foods(
+                foods, prices, list(targets), num_days,
+                max_grams_per_day=args.max_grams_per_day
+            )
+            build = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = problem.solve(targets)
+            solve = time.perf_counter() - start
+
+            cost = f"{result['total_cost'] / num_days:>7.2f}" if result else f"{'-':>7}"
+
+            print(
+                f"{num_foods:>6} {num_days:>5} {problem.highs.getNumCol():>9} {problem.highs.getNumNz():>10} "
+                f"{build:>7.2f}s {solve:>7.2f}s {build + solve:>7.2f}s {cost}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: multi-store MILP (what to buy where, fixed cost per visit)
+
+Every store carries most of the catalog; its prices are the base price
+times a store-wide level and per-product noise, and each store runs
+specials (a random 15% of its products at 40% off). For each store count,
+reports solve time, stores visited, the optimal cost and the saving
+against the best single store.
+
+Usage:
+    python -m benchmarks.bench_multi_store
+    python -m benchmarks.bench_multi_store --products 500 --stores 1 2 3 5 8 12 --visit-cost 4
+"""
+
+import argparse
+import time
+
+import numpy as np
+from loguru import logger
+
+from src.optimization.multi_store import MultiStoreProblem
+from benchmarks.synthetic import make_catalog, full_targets
+
+
+def store_prices(prices, num_stores, carried=0.8, specials=0.15, seed=42):
+    """location -> food_key -> $/lb around the base prices"""
+
+    rng = np.random.default_rng(seed)
+    keys = list(prices)
+    base = np.array([prices[key] for key in keys])
+
+    stores = {}
+    for s in range(num_stores):
+        level = rng.uniform(0.9, 1.1)
+        noise = rng.lognormal(0.0, 0.2, len(keys))
+        sells = rng.random(len(keys)) < carried
+        noise[rng.random(len(keys)) < specials] *= 0.6
+        stores[f"store-{s:02d}"] = {
+            key: float(price)
+            for key, price, sold in zip(keys, base * level * noise, sells) if sold
+        }
+    return stores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--stores", type=int, nargs="+", default=[1, 2, 3, 5, 8, 12, 20])
+    parser.add_argument("--visit-cost", type=float, default=2.0)
+    parser.add_argument("--micros", type=int, default=10,
+                        help="Micronutrient minimums on top of the macros")
+    parser.add_argument("--days", type=int, default=7,
+                        help="Targets scaled to one shopping trip for this many days")
+    parser.add_argument("--time-limit", type=float, default=30.0)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    foods, prices = make_catalog(args.products, args.micros)
+    targets = {
+        name: (low * args.days, high * args.days if high is not None else None)
+        for name, (low, high) in full_targets(args.micros).items()
+    }
+
+    print(f"{args.products} products, {len(targets)} targets ({args.days}-day trip), "
+          f"${args.visit_cost:.2f} per store visited\n")
+    print(f"{'stores':>6} {'columns':>8} {'build':>7} {'solve':>7} {'visited':>8} "
+          f"{'cost':>8} {'best single':>12} {'saving':>7} {'gap':>6} {'nodes':>6}")
+    print("-" * 86)
+
+    for num_stores in args.stores:
+        stores = store_prices(prices, num_stores)
+
+        start = time.perf_counter()
+        problem = MultiStoreProblem(foods, stores, list(targets), args.visit_cost,
+                                    max_quantity_per_food=1000.0 * args.days)
+        problem.highs.setOptionValue("time_limit", args.time_limit)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = problem.solve(targets)
+        solve = time.perf_counter() - start
+
+        if result is None:
+            print(f"{num_stores:>6} {'infeasible':>8}")
+            continue
+
+        singles = [problem.solve(targets, stores=[location]) for location in stores]
+        best_single = min(single["total_cost"] for single in singles if single is not None)
+
+        print(
+            f"{num_stores:>6} {problem.highs.getNumCol():>8} {build:>6.2f}s {solve:>6.2f}s "
+            f"{len(result['stores']):>8} {result['total_cost']:>8.2f} {best_single:>12.2f} "
+            f"{1 - result['total_cost'] / best_single:>6.1%} {result['mip']['gap']:>5.1%} "
+            f"{result['mip']['nodes']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark: nutrient lookups - linear scan vs USDAFood's cached index
+
+Builds the curated catalog (QUALITY_FOOD_DATABASE) offline: every entry
+gets as many nutrients as its profile lists (80-135), named like USDA
+SR Legacy, with Energy reported twice (kcal and kJ) in the order the
+source happens to send them. Then looks up the optimizer's targets
+(macros + reference micronutrients) in every food, the way the model
+builders, exports and charts do, and times:
+- scan: the old get_nutrient (lowercase + scan the list per call)
+- index: get_nutrient now (dict lookup; index built on first call)
+- number: get_nutrient_by_number (USDA nutrient numbers)
+
+Also counts foods where a first-match scan returns Energy in kJ.
+
+Usage:
+    python -m benchmarks.bench_nutrient_lookup
+    python -m benchmarks.bench_nutrient_lookup --rounds 200
+"""
+
+import argparse
+import time
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+
+from src.ingestion.models import NUTRIENT_NUMBERS, NutrientInfo, USDAFood
+from src.ingestion.quality_foods import QUALITY_FOOD_DATABASE
+from src.optimization.micronutrients import MICRONUTRIENT_NAMES
+from benchmarks.synthetic import MACRO_NAMES
+
+
+def scan_nutrient(food: USDAFood, nutrient_name: str) -> Optional[float]:
+    """The original get_nutrient: first entry with a matching name"""
+    for nutrient in food.nutrients:
+        if nutrient.name.lower() == nutrient_name.lower():
+            return nutrient.amount
+    return None
+
+
+def curated_catalog(seed: int = 42):
+    """USDA-shaped profiles for every curated food (no API calls)"""
+
+    rng = np.random.default_rng(seed)
+    number_by_name = {name: number for (name, unit), number in NUTRIENT_NUMBERS.items() if unit != "kj"}
+    units = {name: unit for name, unit in NUTRIENT_NUMBERS}
+
+    foods = {}
+    for category, entries in QUALITY_FOOD_DATABASE.items():
+        for food_key, info in entries.items():
+            kcal = float(rng.uniform(20, 600))
+            nutrients = [
+                NutrientInfo(name="Energy", amount=kcal, unit="KCAL", number="208"),
+                NutrientInfo(name="Energy", amount=kcal * 4.184, unit="kJ", number="268"),
+            ]
+            if rng.random() < 0.5:
+                nutrients.reverse()
+
+            for name in MACRO_NAMES[1:] + MICRONUTRIENT_NAMES:
+                nutrients.append(NutrientInfo(
+                    name=name, amount=float(rng.lognormal()), unit=units.get(name.lower(), "mg").upper(),
+                    number=number_by_name.get(name.lower())
+                ))
+
+            # Amino acids, fatty acids, sterols, ... up to the profile size
+            for i in range(info["nutrients"] - len(nutrients)):
+                nutrients.append(NutrientInfo(name=f"Minor nutrient {i:03d}", amount=float(rng.lognormal()), unit="MG"))
+
+            # Sources do not agree on an order
+            order = rng.permutation(len(nutrients))
+            foods[food_key] = USDAFood(
+                fdc_id=info["fdc_id"],
+                description=info["name"],
+                food_category=category,
+                nutrients=[nutrients[k] for k in order],
+                data_type="sr_legacy_food"
+            )
+
+    return foods
+
+
+def best_of(function, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=100,
+                        help="Passes over catalog x targets per timing")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    foods = curated_catalog()
+    names = MACRO_NAMES + MICRONUTRIENT_NAMES
+    numbers = [NUTRIENT_NUMBERS[name.lower(), unit] for name in names
+               for (known, unit) in NUTRIENT_NUMBERS if known == name.lower() and unit != "kj"]
+    profile_sizes = [len(food.nutrients) for food in foods.values()]
+    lookups = args.rounds * len(foods) * len(names)
+
+    print(f"{len(foods)} curated foods, {min(profile_sizes)}-{max(profile_sizes)} nutrients each, "
+          f"{len(names)} targets, {lookups:,} lookups per timing\n")
+
+    # First call builds the index (one pass over the list)
+    start = time.perf_counter()
+    for food in foods.values():
+        food.get_nutrient("Protein")
+    build = time.perf_counter() - start
+
+    def run_scan():
+        for _ in range(args.rounds):
+            for food in foods.values():
+                for name in names:
+                    scan_nutrient(food, name)
+
+    def run_index():
+        for _ in range(args.rounds):
+            for food in foods.values():
+                for name in names:
+                    food.get_nutrient(name)
+
+    def run_number():
+        for _ in range(args.rounds):
+            for food in foods.values():
+                for number in numbers:
+                    food.get_nutrient_by_number(number)
+
+    print(f"{'lookup':<10} {'total':>9} {'per lookup':>11} {'speedup':>8}")
+    print("-" * 42)
+    scan = best_of(run_scan)
+    for label, seconds in (("scan", scan), ("index", best_of(run_index)), ("number", best_of(run_number))):
+        print(f"{label:<10} {seconds * 1000:>7.1f}ms {seconds / lookups * 1e9:>9.0f}ns {scan / seconds:>7.1f}x")
+
+    wrong = sum(
+        1 for food in foods.values()
+        if scan_nutrient(food, "Energy") != food.get_nutrient_by_number("208")
+    )
+    agree = all(food.get_nutrient("Energy") == food.get_nutrient_by_number("208") for food in foods.values())
+
+    print(f"\nIndex build: {build / len(foods) * 1e6:.0f}us per food, once")
+    print(f"First-match scan returns Energy in kJ for {wrong}/{len(foods)} foods; "
+          f"get_nutrient('Energy') is kcal for {'all' if agree else 'NOT all'}")
+
+
+if __name__ == "__main__":
+    main()
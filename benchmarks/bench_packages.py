@@ -0,0 +1,63 @@
+"""
+Benchmark: whole-package purchasing (integer MILP) vs the LP relaxation
+
+For each catalog size the LP relaxation gives a lower bound, rounding
+package counts up gives a feasible cart, and branch-and-bound improves
+it within the time limit. Reports all three costs, the final gap and
+the wall-clock time.
+
+Usage:
+    python -m benchmarks.bench_packages
+    python -m benchmarks.bench_packages --products 500 2000 --days 1 7 --time-limit 10
+"""
+
+import argparse
+import time
+
+from loguru import logger
+
+from src.optimization.packages import PackageProblem
+from benchmarks.synthetic import make_catalog, make_packages, macro_targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, nargs="+", default=[100, 500, 2000],
+                        help="Package options (two sizes per food)")
+    parser.add_argument("--days", type=int, nargs="+", default=[1, 7])
+    parser.add_argument("--time-limit", type=float, default=10.0)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    targets = macro_targets()
+
+    print(f"Time limit {args.time_limit:.0f}s, 2 package sizes per food\n")
+    print(f"{'products':>8} {'days':>5} {'LP bound':>9} {'rounded':>9} {'MILP':>9} "
+          f"{'gap':>7} {'nodes':>6} {'time':>7}")
+    print("-" * 68)
+
+    for num_products in args.products:
+        foods, prices = make_catalog(num_products // 2, num_micronutrients=0)
+        packages = make_packages(foods, prices, per_food=2)
+
+        for num_days in args.days:
+            start = time.perf_counter()
+            problem = PackageProblem(foods, packages, list(targets), num_days)
+            problem.highs.setOptionValue("time_limit", args.time_limit)
+            result = problem.solve(targets)
+            elapsed = time.perf_counter() - start
+
+            if result is None:
+                print(f"{num_products:>8} {num_days:>5} {'infeasible':>9}")
+                continue
+
+            mip = result["mip"]
+            print(
+                f"{num_products:>8} {num_days:>5} {mip['lp_bound']:>9.2f} {mip['rounded_cost']:>9.2f} "
+                f"{mip['objective']:>9.2f} {mip['gap']:>6.1%} {mip['nodes']:>6} {elapsed:>6.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
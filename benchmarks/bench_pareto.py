@@ -0,0 +1,70 @@
+"""
+Benchmark: 50-point protein Pareto sweep vs cold optimize() calls
+
+A sweep compiles the model once and warm-starts every grid point from
+the previous basis. The request was "roughly the time of a handful of
+cold solves"; this prints the sweep time in units of cold solves.
+
+Usage:
+    python -m benchmarks.bench_pareto
+    python -m benchmarks.bench_pareto --foods 1000 10000 --points 50 --workers 1 4
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+from loguru import logger
+
+from src.optimization.diet_optimizer import DietOptimizer
+from benchmarks.synthetic import make_catalog, macro_targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--points", type=int, default=50)
+    parser.add_argument("--cold", type=int, default=3, help="Cold solves to average")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    logger.remove()
+
+    targets = macro_targets()
+    low, high = targets["Protein"]
+    levels = np.linspace(0.6 * low, high, args.points)
+
+    print(f"{args.points}-point protein sweep, {os.cpu_count()} CPUs\n")
+    print(f"{'foods':>6} {'cold pulp':>10} {'cold highs':>11} {'workers':>8} "
+          f"{'sweep':>8} {'= cold pulp solves':>19}")
+    print("-" * 68)
+
+    for num_foods in args.foods:
+        foods, prices = make_catalog(num_foods, num_micronutrients=0)
+
+        cold = {}
+        for engine in DietOptimizer.ENGINES:
+            optimizer = DietOptimizer(engine=engine)
+            start = time.perf_counter()
+            for _ in range(args.cold):
+                optimizer.optimize(foods, prices, targets)
+            cold[engine] = (time.perf_counter() - start) / args.cold
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            sweep = DietOptimizer().pareto_sweep(foods, prices, targets, workers=workers)
+            frontier = sweep.over_target("Protein", levels)
+            elapsed = time.perf_counter() - start
+
+            assert len(frontier) == args.points
+
+            print(
+                f"{num_foods:>6} {cold['pulp']:>9.3f}s {cold['highs']:>10.3f}s "
+                f"{sweep.last_stats['workers']:>8} {elapsed:>7.3f}s {elapsed / cold['pulp']:>19.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: vectorized Monte Carlo price risk vs per-scenario loops
+
+For one optimal plan and N price scenarios, compares:
+- evaluation: one (scenarios x foods) @ plan product vs a Python loop
+  pricing the plan's foods from a dict per scenario
+- regret: re-optimizing a subsample on resident warm-started models
+  (in-process and in a process pool) vs building a fresh optimizer
+  per scenario
+
+Usage:
+    python -m benchmarks.bench_price_risk
+    python -m benchmarks.bench_price_risk --foods 1000 --scenarios 10000 --regret 200
+"""
+
+import argparse
+import os
+import random
+import time
+
+from loguru import logger
+
+from src.optimization.compiled_problem import CompiledDietProblem
+from src.optimization.diet_optimizer import DietOptimizer
+from src.optimization.nutrient_matrix import GRAMS_PER_POUND
+from src.optimization.price_scenarios import price_risk, sample_price_scenarios
+from benchmarks.synthetic import make_catalog, full_targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, default=1000)
+    parser.add_argument("--micros", type=int, default=5)
+    parser.add_argument("--scenarios", type=int, default=10000)
+    parser.add_argument("--regret", type=int, default=200, help="Scenarios re-optimized")
+    parser.add_argument("--rebuilds", type=int, default=20, help="Fresh-optimizer solves timed (extrapolated)")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    targets = full_targets(args.micros)
+    foods, prices = make_catalog(args.foods, args.micros)
+    problem = CompiledDietProblem.from_foods(foods, prices, list(targets))
+    plan = problem.resolve(targets)
+
+    print(f"{args.foods} foods, plan of {plan['num_foods']} foods, {args.scenarios} scenarios\n")
+
+    # Evaluation: loop over scenarios with dict prices
+    start = time.perf_counter()
+    rng = random.Random(0)
+    loop_costs = []
+    for _ in range(args.scenarios):
+        shocked = {key: price * rng.lognormvariate(0, 0.15) for key, price in prices.items()}
+        loop_costs.append(sum(
+            shocked[key] * data["quantity_grams"] / GRAMS_PER_POUND
+            for key, data in plan["selected_foods"].items()
+        ))
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scenarios = sample_price_scenarios(problem.costs * GRAMS_PER_POUND, args.scenarios, seed=0)
+    sampled = time.perf_counter() - start
+
+    report = price_risk(problem, targets, num_scenarios=args.scenarios, regret_samples=0, seed=0)
+    vectorized = report["timings"]["sample"] + report["timings"]["evaluate"]
+
+    print("Plan cost distribution")
+    print(f"  dict loop        {loop * 1000:>9.0f}ms")
+    print(f"  vectorized       {vectorized * 1000:>9.0f}ms  (sampling {sampled * 1000:.0f}ms, "
+          f"product {report['timings']['evaluate'] * 1000:.1f}ms)  {loop / vectorized:.0f}x")
+
+    # Regret: fresh optimizer per scenario (timed on a few, extrapolated)
+    optimizer = DietOptimizer(engine="highs")
+    start = time.perf_counter()
+    for row in scenarios[:args.rebuilds]:
+        scenario_prices = dict(zip(problem.matrix.food_keys, row))
+        optimizer.optimize(foods, scenario_prices, targets)
+    rebuild = (time.perf_counter() - start) / args.rebuilds * args.regret
+
+    print(f"\nRegret over {args.regret} re-optimized scenarios")
+    print(f"  rebuild each     {rebuild:>9.2f}s  (extrapolated from {args.rebuilds})")
+
+    for workers in sorted({1, os.cpu_count() or 1, 4}):
+        report = price_risk(
+            problem, targets, num_scenarios=args.scenarios,
+            regret_samples=args.regret, workers=workers, seed=0
+        )
+        regret = report["timings"]["regret"]
+        print(f"  resident, {workers} proc {regret:>9.2f}s  {rebuild / regret:.0f}x  "
+              f"mean regret ${report['regret']['mean']:.3f} ({report['regret']['mean_percent']:.1%})")
+
+    print("\nStability (share of re-optimized scenarios still using the food):")
+    for food_key, info in report["foods"].items():
+        print(f"  {food_key:<14} {info['stability']:>5.0%}  cost ${info['cost_p5']:.2f}-${info['cost_p95']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: full rebuild vs CompiledDietProblem.resolve
+
+Simulates an interactive session: the food set and prices stay fixed
+while the user drags macro sliders. Compares per-request latency of
+- SimpleDietOptimizer.optimize_for_macros (PuLP rebuild + CBC)
+- CompiledDietProblem.resolve (bounds update + warm-started HiGHS)
+
+Usage:
+    python -m benchmarks.bench_resolve
+    python -m benchmarks.bench_resolve --sizes 30 1000 --steps 50
+"""
+
+import argparse
+import time
+
+import numpy as np
+from loguru import logger
+
+from src.optimization.diet_optimizer import SimpleDietOptimizer
+from benchmarks.synthetic import make_catalog
+
+
+def slider_steps(count: int, seed: int = 7) -> list:
+    """Random walk of (calories, protein, carbs, fat) like a user dragging sliders"""
+
+    rng = np.random.default_rng(seed)
+    protein, carbs, fat = 150.0, 200.0, 65.0
+    steps = []
+    for _ in range(count):
+        protein = float(np.clip(protein + rng.choice([-10, 10]), 80, 220))
+        carbs = float(np.clip(carbs + rng.choice([-10, 10]), 100, 350))
+        fat = float(np.clip(fat + rng.choice([-5, 5]), 40, 110))
+        calories = 4 * protein + 4 * carbs + 9 * fat  # Keep targets consistent
+        steps.append((calories, protein, carbs, fat))
+    return steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 1000, 5000])
+    parser.add_argument("--steps", type=int, default=20)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    optimizer = SimpleDietOptimizer()
+    steps = slider_steps(args.steps)
+
+    print(f"{'foods':>6} {'rebuild (ms)':>13} {'compile (ms)':>13} {'resolve (ms)':>13} {'speedup':>8}")
+    print("-" * 58)
+
+    for size in args.sizes:
+        foods, prices = make_catalog(size, num_micronutrients=0)
+
+        start = time.perf_counter()
+        for calories, protein, carbs, fat in steps:
+            optimizer.optimize_for_macros(foods, prices, calories, protein, carbs, fat, tolerance=0.15)
+        rebuild_ms = (time.perf_counter() - start) / len(steps) * 1000
+
+        start = time.perf_counter()
+        problem = optimizer.compile_for_macros(foods, prices)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for calories, protein, carbs, fat in steps:
+            problem.resolve(optimizer.macro_targets(calories, protein, carbs, fat, tolerance=0.15))
+        resolve_ms = (time.perf_counter() - start) / len(steps) * 1000
+
+        print(
+            f"{size:>6} {rebuild_ms:>13.1f} {compile_ms:>13.1f} "
+            f"{resolve_ms:>13.2f} {rebuild_ms / resolve_ms:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: result cache - solve vs memory hit vs SQLite hit
+
+Replays a session where a handful of preset profiles are requested
+over and over against one catalog. Reports time per request for a
+cold solve, an in-process LRU hit and a SQLite hit (fresh process
+memory, same database), plus the hit/miss counters.
+
+Usage:
+    python -m benchmarks.bench_result_cache
+    python -m benchmarks.bench_result_cache --foods 1000 10000 --requests 200
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from src.database.cache import NutritionCache
+from src.optimization.diet_optimizer import DietOptimizer
+from src.optimization.result_cache import ResultCache
+from benchmarks.synthetic import make_catalog, macro_targets
+
+
+# (calories, protein) pairs standing in for the app's presets
+PRESETS = [(2000, 150), (1800, 180), (2500, 160), (2200, 200), (2800, 180)]
+
+
+def preset_targets(calories: float, protein: float):
+    targets = macro_targets()
+    targets["Energy"] = (calories * 0.85, calories * 1.15)
+    targets["Protein"] = (protein * 0.85, protein * 1.15)
+    return targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args()
+
+    logger.remove()
+    rng = random.Random(0)
+
+    print(f"{len(PRESETS)} presets, {args.requests} requests\n")
+    print(f"{'foods':>6} {'solve':>9} {'memory hit':>11} {'sqlite hit':>11} {'hit rate':>9}")
+    print("-" * 52)
+
+    for num_foods in args.foods:
+        foods, prices = make_catalog(num_foods, num_micronutrients=0)
+        requests = [preset_targets(*rng.choice(PRESETS)) for _ in range(args.requests)]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = NutritionCache(str(Path(tmp) / "cache.db"))
+            cache = ResultCache(store=store)
+            optimizer = DietOptimizer(engine="highs", cache=cache)
+
+            solve_times, hit_times = [], []
+            for targets in requests:
+                start = time.perf_counter()
+                optimizer.optimize(foods, prices, targets)
+                elapsed = time.perf_counter() - start
+                (hit_times if optimizer.last_solver_stats.get("cache") else solve_times).append(elapsed)
+
+            # New process memory, same database
+            sqlite_optimizer = DietOptimizer(engine="highs", cache=ResultCache(store=store))
+            sqlite_times = []
+            for calories, protein in PRESETS:
+                start = time.perf_counter()
+                sqlite_optimizer.optimize(foods, prices, preset_targets(calories, protein))
+                sqlite_times.append(time.perf_counter() - start)
+
+            stats = cache.stats()
+            store.close()
+
+        print(
+            f"{num_foods:>6} {1000 * sum(solve_times) / len(solve_times):>7.1f}ms "
+            f"{1000 * sum(hit_times) / len(hit_times):>9.2f}ms "
+            f"{1000 * sum(sqlite_times) / len(sqlite_times):>9.2f}ms {stats['hit_rate']:>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
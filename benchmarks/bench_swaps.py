@@ -0,0 +1,101 @@
+"""
+Benchmark: dual-ranked swap suggestions vs one re-solve per candidate
+
+For every food in the optimal plan, finds the cheapest single-food
+replacement two ways:
+- brute force: exclude the food, allow one candidate, re-solve - for
+  every food not in the plan
+- suggest_swaps: rank all candidates from the reduced costs in one
+  sparse product, add the foods a re-plan without it picks, and
+  re-solve only that shortlist
+
+Reports time per food and how often the shortlist contains the true
+best swap (and the extra cost when it does not).
+
+Usage:
+    python -m benchmarks.bench_swaps
+    python -m benchmarks.bench_swaps --foods 300 1000 --confirm 3
+"""
+
+import argparse
+import time
+
+import numpy as np
+from loguru import logger
+
+from src.optimization.compiled_problem import CompiledDietProblem
+from src.optimization.solution import MIN_QUANTITY_GRAMS
+from src.optimization.substitution import suggest_swaps
+from benchmarks.synthetic import make_catalog, full_targets
+
+
+def brute_force(problem: CompiledDietProblem, targets: dict, food_index: int) -> float:
+    """Cheapest swap cost increase by re-solving every candidate"""
+
+    _, quantities, optimal_cost = problem.solve_vector(targets)
+    keep = quantities > MIN_QUANTITY_GRAMS
+    keep[food_index] = False
+
+    best = np.inf
+    for j in np.flatnonzero(~(quantities > MIN_QUANTITY_GRAMS)):
+        upper = np.where(keep, problem.max_quantity_per_food, 0.0)
+        upper[j] = problem.max_quantity_per_food
+        problem.set_food_bounds(upper)
+        status, swapped, cost = problem.solve_vector(targets)
+        if status == "Optimal" and swapped[j] > MIN_QUANTITY_GRAMS:
+            best = min(best, cost - optimal_cost)
+
+    problem.set_food_bounds()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, nargs="+", default=[300, 1000])
+    parser.add_argument("--micros", type=int, default=5)
+    parser.add_argument("--confirm", type=int, default=3, help="Dual estimates re-solved per food")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    targets = full_targets(args.micros)
+
+    print(f"{'foods':>6} {'plan':>5} {'brute/food':>11} {'ranked/food':>12} {'speedup':>8} {'best found':>11} {'max regret':>11}")
+    print("-" * 70)
+
+    for num_foods in args.foods:
+        foods, prices = make_catalog(num_foods, args.micros)
+        problem = CompiledDietProblem.from_foods(foods, prices, list(targets))
+        plan = problem.resolve(targets)["selected_foods"]
+
+        brute_time = ranked_time = 0.0
+        found = comparable = 0
+        regret = 0.0
+
+        for food_key in plan:
+            food_index = problem.matrix.food_keys.index(food_key)
+
+            start = time.perf_counter()
+            best = brute_force(problem, targets, food_index)
+            brute_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            swaps = suggest_swaps(problem, targets, food_key, top_n=1, confirm=args.confirm)
+            ranked_time += time.perf_counter() - start
+
+            if np.isfinite(best):
+                comparable += 1
+                ranked = swaps[0]["cost_increase"] if swaps else np.inf
+                if ranked <= best + 1e-9:
+                    found += 1
+                regret = max(regret, ranked - best)
+
+        print(
+            f"{num_foods:>6} {len(plan):>5} {brute_time / len(plan) * 1000:>9.0f}ms "
+            f"{ranked_time / len(plan) * 1000:>10.1f}ms {brute_time / ranked_time:>7.0f}x "
+            f"{found:>5}/{comparable:<5} ${regret:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
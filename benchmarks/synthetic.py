@@ -0,0 +1,169 @@
+"""
+Synthetic Food Catalogs for Benchmarks
+
+Benchmarks need thousands of foods, and the USDA API allows
+1000 requests/hour. These helpers generate realistic-looking catalogs
+offline so that every benchmark is reproducible (fixed seed).
+
+Each food gets the four macros the app optimizes for, plus a tail of
+micronutrients (about 30% zeros, like real USDA profiles).
+
+`duplicate_fraction` mimics branded-food pools, where many products
+share a nutrient profile (store brands, pack sizes) at different prices.
+"""
+
+import numpy as np
+from typing import Dict, List, Tuple
+
+from src.ingestion.models import USDAFood, NutrientInfo
+from src.optimization.packages import PackageOption
+
+
+MACRO_NAMES = [
+    "Energy",
+    "Protein",
+    "Carbohydrate, by difference",
+    "Total lipid (fat)",
+]
+
+
+def micronutrient_names(count: int) -> List[str]:
+    """Placeholder names for micronutrient rows"""
+    return [f"Micronutrient {i:03d}" for i in range(count)]
+
+
+def make_catalog(
+    num_foods: int,
+    num_micronutrients: int = 81,
+    seed: int = 42,
+    duplicate_fraction: float = 0.0,
+    micro_density: float = 0.7
+) -> Tuple[Dict[str, USDAFood], Dict[str, float]]:
+    """
+    Generate a synthetic catalog
+
+    Args:
+        num_foods: Number of foods to generate
+        num_micronutrients: Micronutrient rows on top of the 4 macros
+        seed: Random seed (same seed -> same catalog)
+        duplicate_fraction: Share of foods that copy another food's
+                            nutrient profile (branded-style duplicates)
+        micro_density: Share of micronutrients each food reports
+                       (branded foods report far fewer than SR Legacy)
+
+    Returns:
+        (foods, prices) in the same shape the optimizer takes
+    """
+
+    rng = np.random.default_rng(seed)
+
+    protein = rng.uniform(0, 30, num_foods)
+    carbs = rng.uniform(0, 70, num_foods)
+    fat = rng.uniform(0, 30, num_foods)
+    energy = 4 * protein + 4 * carbs + 9 * fat
+
+    micros = rng.lognormal(mean=0.0, sigma=1.0, size=(num_foods, num_micronutrients))
+    micros[rng.random((num_foods, num_micronutrients)) < 1 - micro_density] = 0.0
+
+    # Duplicates copy the profile of one of the first num_unique foods
+    num_unique = max(1, int(round(num_foods * (1 - duplicate_fraction))))
+    source = np.arange(num_foods)
+    source[num_unique:] = rng.integers(0, num_unique, num_foods - num_unique)
+    protein, carbs, fat, energy = protein[source], carbs[source], fat[source], energy[source]
+    micros = micros[source]
+
+    micro_names = micronutrient_names(num_micronutrients)
+
+    foods = {}
+    prices = {}
+
+    for j in range(num_foods):
+        nutrients = [
+            NutrientInfo(name="Energy", amount=float(energy[j]), unit="kcal"),
+            NutrientInfo(name="Protein", amount=float(protein[j]), unit="g"),
+            NutrientInfo(name="Carbohydrate, by difference", amount=float(carbs[j]), unit="g"),
+            NutrientInfo(name="Total lipid (fat)", amount=float(fat[j]), unit="g"),
+        ]
+        nutrients.extend(
+            NutrientInfo(name=name, amount=float(micros[j, i]), unit="mg")
+            for i, name in enumerate(micro_names)
+        )
+
+        food_key = f"food_{j:06d}"
+        foods[food_key] = USDAFood(
+            fdc_id=100000 + j,
+            description=f"Synthetic food {j}",
+            food_category="Synthetic",
+            nutrients=nutrients,
+            data_type="synthetic"
+        )
+        prices[food_key] = round(float(rng.uniform(0.59, 9.99)), 2)
+
+    return foods, prices
+
+
+def macro_targets(tolerance: float = 0.15) -> Dict[str, Tuple[float, float]]:
+    """The app's "Maintenance (Balanced)" preset as (min, max) targets"""
+
+    daily = {
+        "Energy": 2000,
+        "Protein": 150,
+        "Carbohydrate, by difference": 200,
+        "Total lipid (fat)": 65,
+    }
+    return {
+        name: (amount * (1 - tolerance), amount * (1 + tolerance))
+        for name, amount in daily.items()
+    }
+
+
+def full_targets(
+    num_micronutrients: int = 81,
+    tolerance: float = 0.15
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Macro targets plus a lower bound on every micronutrient
+
+    Micronutrients average ~1.15 units per 100g, so a minimum of 5 units
+    is reachable by any reasonable ~2000 kcal mix and problems stay feasible.
+    """
+
+    targets = macro_targets(tolerance)
+    for name in micronutrient_names(num_micronutrients):
+        targets[name] = (5.0, None)
+    return targets
+
+
+def make_packages(
+    foods: Dict[str, USDAFood],
+    prices: Dict[str, float],
+    per_food: int = 2,
+    seed: int = 42
+) -> List[PackageOption]:
+    """
+    Store packages for a synthetic catalog
+
+    Each food is sold in `per_food` sizes between 8 oz and 5 lb; the
+    per-pound price (prices[food_key]) gets a bulk discount of up to 20%
+    for the largest sizes, like a real store shelf.
+
+    Returns:
+        List of PackageOption, per_food per food
+    """
+
+    rng = np.random.default_rng(seed)
+    sizes_lb = np.array([0.5, 1.0, 1.5, 2.0, 3.0, 5.0])
+
+    packages = []
+    for food_key, price_per_lb in prices.items():
+        for pounds in rng.choice(sizes_lb, size=min(per_food, len(sizes_lb)), replace=False):
+            discount = 1.0 - 0.04 * np.log2(pounds / 0.5)
+            packages.append(PackageOption(
+                food_key=food_key,
+                package_grams=float(pounds * 453.6),
+                price=round(float(price_per_lb * pounds * discount), 2),
+                product_id=f"{food_key}_{pounds:g}lb",
+                description=f"{foods[food_key].description}, {pounds:g} lb"
+            ))
+
+    return packages
@@ -14,17 +14,39 @@ Pattern: "Read-Through Cache"
 This is how production systems scale without hitting rate limits.
 """
 
+import gc
 import sqlite3
 import json
-from typing import Optional, List
+import orjson
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 from loguru import logger
 
-from ..ingestion.models import USDAFood, NutrientInfo
+from ..ingestion.models import USDAFood, NutrientInfo, trusted_food, trusted_nutrients
 from ..config import get_settings
 
 
+@contextmanager
+def _gc_paused():
+    """
+    Hold off cyclic garbage collection while decoding a batch
+    
+    A batch allocates ~85 objects per food and keeps them all, so the
+    collector keeps firing and re-scanning them - about half of bulk
+    load time. Decoded models hold no reference cycles; collection
+    resumes (and catches up) when the batch is done.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
 class NutritionCache:
     """
     SQLite-based cache for USDA nutrition data
@@ -32,6 +54,8 @@ class NutritionCache:
     Schema:
     - usda_foods: Stores complete food records
     - search_cache: Stores search query results
+    - result_cache: Stores optimization results by problem fingerprint
+    - pantry: Food on hand per user (carried between weekly plans)
     
     Why SQLite?
     - Zero setup (file-based)
@@ -40,6 +64,9 @@ class NutritionCache:
     - ACID compliant (safe concurrent access)
     """
     
+    # Column order _food_from_row expects
+    _FOOD_COLUMNS = "fdc_id, description, food_category, data_type, nutrients_json, publication_date"
+    
     def __init__(self, db_path: str = None):
         """
         Initialize cache and create tables if needed
@@ -102,20 +129,51 @@ class NutritionCache:
             )
         """)
         
+        # Table 3: Optimization results (fingerprint -> compact result JSON)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS result_cache (
+                fingerprint TEXT PRIMARY KEY,
+                result_json TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Table 4: Pantry inventory (one row per lot: same food, different expiry)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pantry (
+                user_id TEXT NOT NULL,
+                fdc_id INTEGER NOT NULL,
+                grams REAL NOT NULL,
+                expires_on TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pantry_user 
+            ON pantry(user_id)
+        """)
+        
         self.conn.commit()
         logger.debug("Cache tables created/verified")
     
-    def get_food(self, fdc_id: int) -> Optional[USDAFood]:
+    def get_food(self, fdc_id: int, validate: bool = False) -> Optional[USDAFood]:
         """
         Retrieve a food from cache by FDC ID
         
+        Args:
+            fdc_id: USDA FoodData Central ID
+            validate: Re-run pydantic validation (rows are validated
+                      when stored; only for rows written elsewhere)
+        
         Returns:
             USDAFood object if cached, None if cache miss
         """
         
         cursor = self.conn.cursor()
+        cursor.row_factory = None
         cursor.execute(
-            "SELECT * FROM usda_foods WHERE fdc_id = ?",
+            f"SELECT {self._FOOD_COLUMNS} FROM usda_foods WHERE fdc_id = ?",
             (fdc_id,)
         )
         
@@ -127,17 +185,98 @@ class NutritionCache:
         
         logger.debug(f"Cache HIT: Food {fdc_id}")
         
-        # Reconstruct USDAFood from cached data
-        nutrients_data = json.loads(row["nutrients_json"])
-        nutrients = [NutrientInfo(**n) for n in nutrients_data]
-        
-        return USDAFood(
-            fdc_id=row["fdc_id"],
-            description=row["description"],
-            food_category=row["food_category"],
-            nutrients=nutrients,
-            data_type=row["data_type"],
-            publication_date=row["publication_date"]
+        return self._food_from_row(row, validate)
+    
+    def get_foods(self, fdc_ids: List[int], validate: bool = False) -> Dict[int, USDAFood]:
+        """
+        Retrieve many foods at once (cache hits only)
+        
+        One query per 500 IDs instead of one per food.
+        
+        Returns:
+            Dict mapping fdc_id -> USDAFood for the IDs found
+        """
+        
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        
+        foods = {}
+        for start in range(0, len(fdc_ids), 500):
+            chunk = list(fdc_ids[start:start + 500])
+            cursor.execute(
+                f"SELECT {self._FOOD_COLUMNS} FROM usda_foods "
+                f"WHERE fdc_id IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            with _gc_paused():
+                for row in cursor:
+                    foods[row[0]] = self._food_from_row(row, validate)
+        
+        logger.debug(f"Cache: {len(foods)}/{len(fdc_ids)} foods found")
+        return foods
+    
+    def iter_foods(self, batch_size: int = 1000, validate: bool = False) -> Iterator[Dict[int, USDAFood]]:
+        """
+        Every cached food, in batches (a 100k catalog does not have to
+        fit in memory as USDAFood objects at once)
+        
+        Yields:
+            Dicts mapping fdc_id -> USDAFood, in FDC ID order
+        """
+        
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"SELECT {self._FOOD_COLUMNS} FROM usda_foods ORDER BY fdc_id")
+        
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            with _gc_paused():
+                batch = {row[0]: self._food_from_row(row, validate) for row in rows}
+            yield batch
+    
+    def get_all_foods(self, validate: bool = False) -> Dict[int, USDAFood]:
+        """
+        Every cached food
+        
+        Returns:
+            Dict mapping fdc_id -> USDAFood
+        """
+        
+        foods = {}
+        for batch in self.iter_foods(validate=validate):
+            foods.update(batch)
+        
+        logger.debug(f"Loaded {len(foods)} foods from cache")
+        return foods
+    
+    @staticmethod
+    def _food_from_row(row: Tuple, validate: bool = False) -> USDAFood:
+        """
+        Reconstruct USDAFood from a cached row (_FOOD_COLUMNS order)
+        
+        Rows were validated on the way in (API data goes through
+        USDAClient._parse_food), so by default they are rebuilt with
+        the trusted constructors - about half the time of validating again.
+        """
+        
+        fdc_id, description, food_category, data_type, nutrients_json, publication_date = row
+        nutrients_data = orjson.loads(nutrients_json)
+        
+        if validate:
+            return USDAFood(
+                fdc_id=fdc_id,
+                description=description,
+                food_category=food_category,
+                nutrients=[NutrientInfo(**n) for n in nutrients_data],
+                data_type=data_type,
+                publication_date=publication_date
+            )
+        
+        return trusted_food(
+            fdc_id, description, food_category,
+            trusted_nutrients(nutrients_data), data_type, publication_date
         )
     
     def store_food(self, food: USDAFood):
@@ -148,29 +287,35 @@ class NutritionCache:
         This is called after fetching from USDA API.
         """
         
-        cursor = self.conn.cursor()
+        self.store_foods([food])
+        logger.debug(f"Cached food: {food.description} (FDC {food.fdc_id})")
+    
+    def store_foods(self, foods: Iterable[USDAFood]):
+        """Store many foods in one transaction"""
         
-        # Serialize nutrients to JSON
-        nutrients_json = json.dumps([
-            {"name": n.name, "amount": n.amount, "unit": n.unit}
-            for n in food.nutrients
-        ])
+        cursor = self.conn.cursor()
         
-        cursor.execute("""
+        cursor.executemany("""
             INSERT OR REPLACE INTO usda_foods 
             (fdc_id, description, food_category, data_type, nutrients_json, publication_date)
             VALUES (?, ?, ?, ?, ?, ?)
         """, (
-            food.fdc_id,
-            food.description,
-            food.food_category,
-            food.data_type,
-            nutrients_json,
-            food.publication_date
+            (
+                food.fdc_id,
+                food.description,
+                food.food_category,
+                food.data_type,
+                # Serialize nutrients to JSON
+                orjson.dumps([
+                    {"name": n.name, "amount": n.amount, "unit": n.unit, "number": n.number}
+                    for n in food.nutrients
+                ]).decode(),
+                food.publication_date
+            )
+            for food in foods
         ))
         
         self.conn.commit()
-        logger.debug(f"Cached food: {food.description} (FDC {food.fdc_id})")
     
     def get_search_results(self, query: str) -> Optional[List[int]]:
         """
@@ -216,6 +361,80 @@ class NutritionCache:
         self.conn.commit()
         logger.debug(f"Cached search: '{query}' -> {len(fdc_ids)} results")
     
+    def get_result(self, fingerprint: str) -> Optional[str]:
+        """
+        Get a cached optimization result
+        
+        Returns:
+            Result JSON (see ResultCache) if cached, None if cache miss
+        """
+        
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT result_json FROM result_cache WHERE fingerprint = ?",
+            (fingerprint,)
+        )
+        
+        row = cursor.fetchone()
+        
+        if row is None:
+            logger.debug(f"Cache MISS: Result {fingerprint[:12]}")
+            return None
+        
+        logger.debug(f"Cache HIT: Result {fingerprint[:12]}")
+        return row["result_json"]
+    
+    def store_result(self, fingerprint: str, result_json: str):
+        """
+        Cache an optimization result
+        
+        The JSON is produced by ResultCache (food references are
+        stored as keys, not as full food records).
+        """
+        
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO result_cache (fingerprint, result_json)
+            VALUES (?, ?)
+        """, (fingerprint, result_json))
+        
+        self.conn.commit()
+        logger.debug(f"Cached result: {fingerprint[:12]}")
+    
+    def get_pantry(self, user_id: str) -> List[Tuple[int, float, Optional[str]]]:
+        """
+        Get a user's pantry
+        
+        Returns:
+            List of (fdc_id, grams, expires_on ISO date or None);
+            empty if nothing is stored
+        """
+        
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT fdc_id, grams, expires_on FROM pantry WHERE user_id = ?",
+            (user_id,)
+        )
+        
+        return [(row["fdc_id"], row["grams"], row["expires_on"]) for row in cursor.fetchall()]
+    
+    def store_pantry(self, user_id: str, lots: List[Tuple[int, float, Optional[str]]]):
+        """
+        Replace a user's pantry
+        
+        Delete + insert in one transaction, so a reader never sees
+        half of last week's pantry and half of this week's.
+        """
+        
+        with self.conn:
+            self.conn.execute("DELETE FROM pantry WHERE user_id = ?", (user_id,))
+            self.conn.executemany(
+                "INSERT INTO pantry (user_id, fdc_id, grams, expires_on) VALUES (?, ?, ?, ?)",
+                [(user_id, fdc_id, grams, expires_on) for fdc_id, grams, expires_on in lots]
+            )
+        
+        logger.debug(f"Stored pantry: {user_id} -> {len(lots)} lots")
+    
     def get_cache_stats(self) -> dict:
         """
         Get cache statistics for monitoring
@@ -231,6 +450,12 @@ class NutritionCache:
         cursor.execute("SELECT COUNT(*) as count FROM search_cache")
         searches_count = cursor.fetchone()["count"]
         
+        cursor.execute("SELECT COUNT(*) as count FROM result_cache")
+        results_count = cursor.fetchone()["count"]
+        
+        cursor.execute("SELECT COUNT(DISTINCT user_id) as count FROM pantry")
+        pantry_users = cursor.fetchone()["count"]
+        
         # Get database file size
         db_size_bytes = Path(self.db_path).stat().st_size
         db_size_mb = db_size_bytes / (1024 * 1024)
@@ -238,6 +463,8 @@ class NutritionCache:
         return {
             "foods_cached": foods_count,
             "searches_cached": searches_count,
+            "results_cached": results_count,
+            "pantry_users": pantry_users,
             "db_size_mb": round(db_size_mb, 2)
         }
     
@@ -251,6 +478,7 @@ class NutritionCache:
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM usda_foods")
         cursor.execute("DELETE FROM search_cache")
+        cursor.execute("DELETE FROM result_cache")
         self.conn.commit()
         
         logger.warning("Cache cleared!")
@@ -0,0 +1,289 @@
+"""
+Catalog Snapshots - The Whole Catalog in One Memory-Mapped File
+
+A warm start replays the SQLite cache: one row per food, a JSON blob
+per row, ~85 NutrientInfo objects rebuilt per food, then a FoodFrame
+built from those objects. Even with trusted construction that is
+~20 seconds for a 100k-food catalog - in EVERY worker process, each
+holding its own copy.
+
+A snapshot is the catalog already in its final shape, written once
+as an Arrow IPC file (uncompressed):
+- metadata columns: food_key, fdc_id, description, category and
+  data_type (dictionary-encoded), nutrient counts
+- one float64 column per nutrient, per 100g (0 = not reported)
+
+Loading memory-maps the file. Numeric columns are views straight
+into the mapping - nothing is parsed or copied - and because Arrow
+writes a record batch's buffers back to back, the nutrient columns
+form one strided (nutrients x foods) array: the FoodFrame's matrix
+IS the file. Pages are read on first touch and live in the OS page
+cache, so every worker mapping the same snapshot shares one copy.
+Only the text columns become Python strings.
+
+Why Arrow IPC and not Parquet? Parquet pages are encoded and
+compressed; every reader decodes them into private memory. Arrow's
+on-disk format is its in-memory format. pandas (`read_feather`),
+Polars and DuckDB read the file as-is.
+
+Industry Pattern: Memory-Mapped Model Artifacts
+Serving fleets ship read-only artifacts (embeddings, indexes, feature
+tables) as files that every worker maps instead of loading.
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from loguru import logger
+from scipy import sparse as sp
+
+from ..optimization.nutrient_matrix import NutrientMatrix
+from ..processing.food_frame import FoodFrame
+
+
+# Schema metadata identifying a snapshot file
+CATALOG_FORMAT = "nutritional-arbitrage-catalog"
+CATALOG_VERSION = "1"
+
+# Leading columns of every snapshot; the rest are nutrients
+METADATA_COLUMNS = (
+    "food_key", "fdc_id", "description", "category", "data_type",
+    "nutrient_count", "nonzero_count",
+)
+
+
+def write_catalog(frame: FoodFrame, path: Union[str, Path], source: str = "") -> Path:
+    """
+    Write a FoodFrame as a catalog snapshot
+
+    The file is written next to `path` and renamed into place, so a
+    worker never maps half a snapshot; workers that mapped the old
+    file keep reading it until they reload.
+
+    Args:
+        frame: Foods to write (row order is kept)
+        path: Snapshot file (conventionally *.arrow)
+        source: Free-form note stored in the file (e.g. cache path)
+
+    Returns:
+        The snapshot path
+    """
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    values = frame.matrix.values
+    columns = [
+        pa.array(frame.food_keys, type=pa.string()),
+        pa.array(frame.fdc_ids),
+        pa.array(frame.descriptions, type=pa.string()),
+        pa.array(frame.categories, type=pa.string()).dictionary_encode(),
+        pa.array(frame.data_types, type=pa.string()).dictionary_encode(),
+        pa.array(frame.nutrient_counts),
+        pa.array(frame.nonzero_counts),
+    ] + [pa.array(values[i], type=pa.float64()) for i in range(frame.matrix.num_nutrients)]
+
+    schema = pa.schema(
+        [pa.field(name, column.type) for name, column in zip(METADATA_COLUMNS, columns)]
+        + [pa.field(name, pa.float64()) for name in frame.nutrient_names],
+        metadata={
+            "format": CATALOG_FORMAT,
+            "version": CATALOG_VERSION,
+            "created_at": datetime.now().isoformat(),
+            "source": source,
+        }
+    )
+
+    # One record batch: the nutrient buffers must be contiguous to map as one array
+    partial = path.with_name(path.name + ".partial")
+    with ipc.new_file(str(partial), schema) as writer:
+        writer.write_batch(pa.record_batch(columns, schema=schema))
+    os.replace(partial, path)
+
+    logger.info(
+        f"Catalog snapshot: {frame.num_foods} foods x {frame.matrix.num_nutrients} nutrients "
+        f"-> {path} ({path.stat().st_size / 2**20:.1f} MB)"
+    )
+    return path
+
+
+def export_catalog(cache, path: Union[str, Path], batch_size: int = 10_000) -> Path:
+    """
+    Snapshot every food in a NutritionCache, keyed by str(fdc_id)
+
+    Streams the cache in batches: each batch becomes a small FoodFrame
+    and its USDAFood objects are dropped, so a 100k catalog never
+    exists as models all at once.
+
+    Args:
+        cache: NutritionCache instance
+        path: Snapshot file to write
+        batch_size: Foods decoded at a time
+
+    Returns:
+        The snapshot path
+
+    Example:
+        >>> export_catalog(NutritionCache(), "data/catalog.arrow")
+        >>> frame = load_catalog("data/catalog.arrow")   # in each worker
+    """
+
+    frames = [
+        FoodFrame.from_foods({str(fdc_id): food for fdc_id, food in batch.items()}, keep_foods=False)
+        for batch in cache.iter_foods(batch_size=batch_size)
+    ]
+    return write_catalog(_concat(frames), path, source=str(getattr(cache, "db_path", "")))
+
+
+def load_catalog(path: Union[str, Path]) -> FoodFrame:
+    """
+    Memory-map a catalog snapshot as a FoodFrame
+
+    The nutrient matrix, FDC ids and counts are read-only views of the
+    mapped file; food keys and descriptions are decoded to strings.
+    The frame keeps no USDAFood objects (to_foods() is unavailable) -
+    fetch the models a plan needs from the cache.
+
+    Args:
+        path: File written by write_catalog / export_catalog
+
+    Returns:
+        FoodFrame backed by the mapping (dense nutrient matrix)
+
+    Raises:
+        ValueError: If the file is not a catalog snapshot
+    """
+
+    source = pa.memory_map(str(path), "r")
+    reader = ipc.open_file(source)
+    metadata = reader.schema.metadata or {}
+    if metadata.get(b"format") != CATALOG_FORMAT.encode():
+        raise ValueError(f"{path} is not a catalog snapshot")
+    if metadata.get(b"version") != CATALOG_VERSION.encode():
+        raise ValueError(f"{path} is snapshot version {metadata.get(b'version', b'?').decode()}, "
+                         f"expected {CATALOG_VERSION}")
+
+    if reader.num_record_batches == 1:
+        batch = reader.get_batch(0)
+    else:
+        # Written by another tool in several batches: merge (copies)
+        batch = reader.read_all().combine_chunks().to_batches()[0]
+
+    num_meta = len(METADATA_COLUMNS)
+    names = batch.schema.names
+    if tuple(names[:num_meta]) != METADATA_COLUMNS:
+        raise ValueError(f"{path} does not start with the columns {METADATA_COLUMNS}")
+
+    meta = {name: batch.column(i) for i, name in enumerate(METADATA_COLUMNS)}
+    nutrient_names = names[num_meta:]
+    values = _nutrient_values(batch.columns[num_meta:], batch.num_rows)
+
+    frame = FoodFrame(
+        NutrientMatrix(meta["food_key"].to_pylist(), nutrient_names, values),
+        fdc_ids=_numbers(meta["fdc_id"]),
+        descriptions=meta["description"].to_numpy(zero_copy_only=False),
+        categories=_decode(meta["category"]),
+        data_types=_decode(meta["data_type"]),
+        nutrient_counts=_numbers(meta["nutrient_count"]),
+        nonzero_counts=_numbers(meta["nonzero_count"])
+    )
+    logger.debug(f"Mapped catalog snapshot {path}: {frame.num_foods} foods x {len(nutrient_names)} nutrients")
+    return frame
+
+
+# ----- Internals -----------------------------------------------------
+
+def _concat(frames: Sequence[FoodFrame]) -> FoodFrame:
+    """
+    Stack frames row-wise (no USDAFood objects)
+
+    Nutrient rows are matched case-insensitively, in order of first
+    appearance across the frames - as if one frame had been built
+    from all the foods.
+    """
+
+    names: List[str] = []
+    row_index: Dict[str, int] = {}
+    for frame in frames:
+        for name in frame.nutrient_names:
+            if name.lower() not in row_index:
+                row_index[name.lower()] = len(names)
+                names.append(name)
+
+    blocks = []
+    for frame in frames:
+        block = frame.matrix.sparse.tocoo()
+        row_map = np.array([row_index[name.lower()] for name in frame.nutrient_names], dtype=np.int64)
+        blocks.append(sp.csr_matrix(
+            (block.data, (row_map[block.row] if block.nnz else block.row, block.col)),
+            shape=(len(names), frame.num_foods)
+        ))
+
+    keys = [key for frame in frames for key in frame.food_keys]
+    matrix = sp.hstack(blocks, format="csr") if blocks else sp.csr_matrix((0, 0))
+
+    def stacked(attribute):
+        return np.concatenate([getattr(frame, attribute) for frame in frames]) if frames else []
+
+    return FoodFrame(
+        NutrientMatrix(keys, names, matrix),
+        stacked("fdc_ids"),
+        stacked("descriptions"),
+        stacked("categories"),
+        stacked("data_types"),
+        stacked("nutrient_counts"),
+        stacked("nonzero_counts")
+    )
+
+
+def _nutrient_values(columns: Sequence[pa.Array], num_foods: int) -> np.ndarray:
+    """
+    The nutrient columns as one (nutrients x foods) array
+
+    Zero-copy when the column buffers are evenly spaced in the mapping
+    (always, for files write_catalog produced); otherwise stacked into
+    a private copy.
+    """
+
+    if not columns:
+        return np.zeros((0, num_foods))
+
+    buffers = [column.buffers()[1] for column in columns]
+    addresses = np.array([buffer.address for buffer in buffers], dtype=np.int64)
+    stride = int(addresses[1] - addresses[0]) if len(columns) > 1 else num_foods * 8
+    evenly_spaced = (
+        num_foods > 0
+        and all(column.null_count == 0 and column.offset == 0 for column in columns)
+        and np.all(np.diff(addresses) == stride)
+        and stride >= num_foods * 8 and stride % 8 == 0
+    )
+
+    if evenly_spaced:
+        # One buffer spanning every column (kept alive by the first column's buffer)
+        span = pa.foreign_buffer(buffers[0].address, stride * (len(columns) - 1) + num_foods * 8, base=buffers[0])
+        return np.ndarray(
+            shape=(len(columns), num_foods), dtype=np.float64,
+            buffer=span, strides=(stride, 8)
+        )
+
+    logger.debug("Snapshot nutrient columns are not contiguous - copying")
+    return np.vstack([column.to_numpy(zero_copy_only=False) for column in columns])
+
+
+def _numbers(column: pa.Array) -> np.ndarray:
+    """Numeric column as a view of the mapping"""
+    return column.to_numpy(zero_copy_only=column.null_count == 0)
+
+
+def _decode(column: pa.Array) -> np.ndarray:
+    """Dictionary-encoded strings -> object array (one str per distinct value)"""
+    if not pa.types.is_dictionary(column.type):
+        return column.to_numpy(zero_copy_only=False)
+    distinct = np.array(column.dictionary.to_pylist() + [None], dtype=object)
+    codes = column.indices.fill_null(len(distinct) - 1).to_numpy()
+    return distinct[codes]
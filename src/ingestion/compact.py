@@ -0,0 +1,311 @@
+"""
+Compact Foods - Nutrient Profiles as Arrays
+
+A parsed `USDAFood` holds 50-135 `NutrientInfo` objects, and every one
+carries its own copy of the name and unit strings plus pydantic's
+per-instance bookkeeping: ~45 KB per food, ~4.5 GB for a 100k-food
+catalog. The names and units are the same few hundred strings over
+and over.
+
+This module stores them once:
+- NutrientRegistry: one column per nutrient identity (name, unit,
+  USDA number), shared by every food in the process
+- CompactFood: a slotted object holding the food's metadata and two
+  packed arrays - registry columns (uint16) and amounts, in the
+  source order
+
+Amounts stay float64: float32 would halve them again, but USDA values
+("3.3") do not survive float32, and the conversion back to `USDAFood`
+must be exact. The arrays are stdlib `array.array`, not NumPy: a
+per-food lookup is one `.index()` call (a C loop, ~100ns over 85
+entries) where a NumPy compare costs microseconds of call overhead,
+and the object header is half the size. `row()` and np.frombuffer
+give NumPy views when needed.
+
+Industry Pattern: Dictionary Encoding
+Columnar stores (Parquet, Arrow) replace repeated values with small
+integer codes into a shared dictionary - the same trick, per food.
+"""
+
+import sys
+import threading
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import NUTRIENT_NUMBERS, PREFERRED_UNITS, NutrientInfo, USDAFood, normalize_unit
+
+
+# (name, unit, number) exactly as the source sent them - the registry
+# must give back the same strings for conversion to be lossless
+NutrientKey = Tuple[str, str, Optional[str]]
+
+
+class NutrientRegistry:
+    """
+    Maps nutrient identity -> column index, for the whole process
+
+    A nutrient is identified by its exact name, unit and USDA number,
+    so "Energy" in kcal and in kJ get separate columns. Columns are
+    assigned in order of first appearance and never change; lookups
+    by lowercase name or by USDA number resolve to columns.
+
+    Example:
+        >>> column = NUTRIENT_REGISTRY.register("Protein", "G", "203")
+        >>> NUTRIENT_REGISTRY.key(column)
+        ('Protein', 'G', '203')
+    """
+
+    # Column indexes are stored as uint16 in every CompactFood
+    MAX_COLUMNS = np.iinfo(np.uint16).max + 1
+
+    def __init__(self):
+        self._columns: Dict[NutrientKey, int] = {}
+        self._keys: List[NutrientKey] = []
+        self._by_name: Dict[str, List[int]] = {}
+        self._by_number: Dict[str, List[int]] = {}
+        # (lowercase name, unit) -> columns, filled by lookups
+        self._named: Dict[Tuple[str, Optional[str]], List[int]] = {}
+        # Registration is rare and may come from concurrent fetch threads;
+        # lookups are plain dict reads and take no lock
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __getstate__(self):
+        # Locks do not pickle; foods sent to worker processes bring their registry
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def register(self, name: str, unit: str, number: Optional[str] = None) -> int:
+        """Column for a nutrient identity, adding it on first sight"""
+
+        key = (name, unit, number)
+        column = self._columns.get(key)
+        if column is not None:
+            return column
+
+        with self._lock:
+            column = self._columns.get(key)
+            if column is not None:
+                return column
+
+            column = len(self._keys)
+            if column >= self.MAX_COLUMNS:
+                raise ValueError(f"Nutrient registry is full ({self.MAX_COLUMNS} columns)")
+
+            key = (sys.intern(name), sys.intern(unit), sys.intern(number) if number else number)
+            self._keys.append(key)
+            self._by_name.setdefault(name.lower(), []).append(column)
+            canonical = number or NUTRIENT_NUMBERS.get((name.lower(), normalize_unit(unit)))
+            if canonical is not None:
+                self._by_number.setdefault(canonical, []).append(column)
+            self._named.clear()
+            self._columns[key] = column
+
+        return column
+
+    def key(self, column: int) -> NutrientKey:
+        """(name, unit, number) of a column"""
+        return self._keys[column]
+
+    def columns_named(self, nutrient_name: str, unit: Optional[str] = None) -> List[int]:
+        """Columns with this name (case-insensitive), optionally in one unit"""
+
+        cache_key = (nutrient_name.lower(), unit)
+        columns = self._named.get(cache_key)
+        if columns is None:
+            columns = self._by_name.get(cache_key[0], [])
+            if unit is not None:
+                unit = normalize_unit(unit)
+                columns = [column for column in columns if normalize_unit(self._keys[column][1]) == unit]
+            self._named[cache_key] = columns
+        return columns
+
+    def columns_numbered(self, number: str) -> List[int]:
+        """Columns carrying a USDA nutrient number (sent or looked up)"""
+        return self._by_number.get(number, [])
+
+
+# The registry every CompactFood uses unless given another
+NUTRIENT_REGISTRY = NutrientRegistry()
+
+
+class CompactFood:
+    """
+    A USDAFood in ~1/30 of the memory
+
+    Same read API as USDAFood (get_nutrient, get_nutrient_by_number,
+    nutrients, metadata fields); `from_food` / `to_food` convert
+    without loss - names, units, numbers, order and amounts all come
+    back exactly.
+
+    Lookups scan one small integer array: slower than USDAFood's
+    index, far faster than the old list scan. Convert with `to_food()`
+    for hot loops.
+
+    Example:
+        >>> compact = CompactFood.from_food(food)
+        >>> compact.get_nutrient("Protein") == food.get_nutrient("Protein")
+        True
+        >>> compact.to_food() == food
+        True
+    """
+
+    __slots__ = (
+        "fdc_id", "description", "food_category", "data_type", "publication_date",
+        "columns", "amounts", "registry",
+    )
+
+    def __init__(
+        self,
+        fdc_id: int,
+        description: str,
+        data_type: str,
+        columns: Sequence[int],
+        amounts: Sequence[float],
+        food_category: Optional[str] = None,
+        publication_date: Optional[str] = None,
+        registry: Optional[NutrientRegistry] = None
+    ):
+        """
+        Args:
+            fdc_id, description, data_type, food_category,
+            publication_date: As on USDAFood
+            columns: Registry column of each nutrient, source order
+            amounts: Amount per 100g of each nutrient (float64)
+            registry: Registry the columns refer to (default: NUTRIENT_REGISTRY)
+        """
+        if len(columns) != len(amounts):
+            raise ValueError(f"{len(columns)} columns but {len(amounts)} amounts")
+
+        self.fdc_id = fdc_id
+        self.description = description
+        # Categories and data types repeat across the catalog - share them
+        self.food_category = sys.intern(food_category) if food_category else food_category
+        self.data_type = sys.intern(data_type)
+        self.publication_date = publication_date
+        self.columns = columns if isinstance(columns, array) and columns.typecode == "H" else array("H", columns)
+        self.amounts = amounts if isinstance(amounts, array) and amounts.typecode == "d" else array("d", amounts)
+        self.registry = registry if registry is not None else NUTRIENT_REGISTRY
+
+    @classmethod
+    def from_food(cls, food: USDAFood, registry: Optional[NutrientRegistry] = None) -> "CompactFood":
+        """Compact a USDAFood (registers any nutrients not seen before)"""
+
+        registry = registry if registry is not None else NUTRIENT_REGISTRY
+        register = registry.register
+        return cls(
+            fdc_id=food.fdc_id,
+            description=food.description,
+            data_type=food.data_type,
+            columns=array("H", [register(n.name, n.unit, n.number) for n in food.nutrients]),
+            amounts=array("d", [n.amount for n in food.nutrients]),
+            food_category=food.food_category,
+            publication_date=food.publication_date,
+            registry=registry
+        )
+
+    def to_food(self) -> USDAFood:
+        """The equivalent USDAFood"""
+        return USDAFood(
+            fdc_id=self.fdc_id,
+            description=self.description,
+            food_category=self.food_category,
+            nutrients=self.nutrients,
+            data_type=self.data_type,
+            publication_date=self.publication_date
+        )
+
+    @property
+    def nutrients(self) -> List[NutrientInfo]:
+        """Nutrient entries as NutrientInfo objects (built on each access)"""
+        key = self.registry.key
+        entries = []
+        for column, amount in zip(self.columns, self.amounts):
+            name, unit, number = key(column)
+            entries.append(NutrientInfo(name=name, amount=amount, unit=unit, number=number))
+        return entries
+
+    def get_nutrient(self, nutrient_name: str, unit: Optional[str] = None) -> Optional[float]:
+        """
+        Nutrient value by name - same answers as USDAFood.get_nutrient
+
+        A name USDA reports in several units resolves to its preferred
+        unit (Energy -> kcal); pass `unit` to ask for another.
+        """
+        if unit is not None:
+            number = NUTRIENT_NUMBERS.get((nutrient_name.lower(), normalize_unit(unit)))
+            if number is not None:
+                return self.get_nutrient_by_number(number)
+            return self._first(self.registry.columns_named(nutrient_name, unit))
+
+        preferred = PREFERRED_UNITS.get(nutrient_name.lower())
+        if preferred is not None:
+            amount = self._first(self.registry.columns_named(nutrient_name, preferred))
+            if amount is not None:
+                return amount
+        return self._first(self.registry.columns_named(nutrient_name))
+
+    def get_nutrient_by_number(self, number: str) -> Optional[float]:
+        """Nutrient value by USDA nutrient number (e.g. "208" = Energy in kcal)"""
+        return self._first(self.registry.columns_numbered(number))
+
+    def row(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Dense (values, present) over every registry column
+
+        Absent nutrients are 0.0 with present=False. A column the food
+        reports twice keeps its first amount, as lookups do.
+        """
+        width = len(self.registry)
+        values = np.zeros(width)
+        present = np.zeros(width, dtype=bool)
+        columns = np.frombuffer(self.columns, dtype=np.uint16)
+        # Assign in reverse so the first occurrence wins
+        values[columns[::-1]] = np.frombuffer(self.amounts)[::-1]
+        present[columns] = True
+        return values, present
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the nutrient arrays"""
+        return self.columns.itemsize * len(self.columns) + self.amounts.itemsize * len(self.amounts)
+
+    def _first(self, columns: List[int]) -> Optional[float]:
+        """Amount of the earliest entry in any of `columns`, in source order"""
+        best = None
+        for column in columns:
+            try:
+                position = self.columns.index(column)
+            except ValueError:
+                continue
+            if best is None or position < best:
+                best = position
+        return self.amounts[best] if best is not None else None
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __repr__(self) -> str:
+        return f"CompactFood(fdc_id={self.fdc_id}, description={self.description!r}, nutrients={len(self)})"
+
+
+def compact_foods(
+    foods: Dict[str, USDAFood],
+    registry: Optional[NutrientRegistry] = None
+) -> Dict[str, CompactFood]:
+    """Compact a food dict, keeping its keys"""
+    return {food_key: CompactFood.from_food(food, registry) for food_key, food in foods.items()}
+
+
+def expand_foods(foods: Dict[str, CompactFood]) -> Dict[str, USDAFood]:
+    """USDAFood dict back from compact_foods(), for code that needs the models"""
+    return {food_key: food.to_food() for food_key, food in foods.items()}
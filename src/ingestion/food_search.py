@@ -8,11 +8,13 @@ Industry Pattern: Data Quality Filtering
 Never pass garbage into your optimizer - filter at the ingestion layer.
 """
 
-from typing import List, Optional
+import pandas as pd
+from typing import Dict, List, Optional
 from loguru import logger
 
 from .usda_client import USDAClient
 from .models import USDAFood
+from ..processing.food_frame import FoodFrame
 
 
 class SmartFoodSearch:
@@ -133,12 +135,12 @@ class SmartFoodSearch:
         total_nutrients = len(food.nutrients)
         non_zero = sum(1 for n in food.nutrients if n.amount > 0)
         
-        # Check for essential macros
+        # Check for essential macros (USDA nutrient numbers; 208 = kcal)
         essential = {
-            "Protein": food.get_nutrient("Protein"),
-            "Energy": food.get_nutrient("Energy"),
-            "Fat": food.get_nutrient("Total lipid (fat)"),
-            "Carbs": food.get_nutrient("Carbohydrate, by difference")
+            "Protein": food.get_nutrient_by_number("203"),
+            "Energy": food.get_nutrient_by_number("208"),
+            "Fat": food.get_nutrient_by_number("204"),
+            "Carbs": food.get_nutrient_by_number("205")
         }
         
         has_essentials = sum(1 for v in essential.values() if v and v > 0)
@@ -208,14 +210,24 @@ class SmartFoodSearch:
             "fdc_id": food.fdc_id,
             "data_type": food.data_type,
             "category": food.food_category,
-            "calories": food.get_nutrient("Energy"),
-            "protein_g": food.get_nutrient("Protein"),
-            "fat_g": food.get_nutrient("Total lipid (fat)"),
-            "carbs_g": food.get_nutrient("Carbohydrate, by difference"),
-            "fiber_g": food.get_nutrient("Fiber, total dietary"),
+            "calories": food.get_nutrient_by_number("208"),
+            "protein_g": food.get_nutrient_by_number("203"),
+            "fat_g": food.get_nutrient_by_number("204"),
+            "carbs_g": food.get_nutrient_by_number("205"),
+            "fiber_g": food.get_nutrient_by_number("291"),
             "total_nutrients": len(food.nutrients),
             "non_zero_nutrients": sum(1 for n in food.nutrients if n.amount > 0)
         }
+    
+    def get_nutrition_summaries(self, foods: Dict[str, USDAFood]) -> pd.DataFrame:
+        """
+        get_nutrition_summary for many foods at once
+        
+        Returns:
+            DataFrame with one row per food (indexed by food key)
+        """
+        
+        return FoodFrame.from_foods(foods, keep_foods=False).nutrition_summary()
 
 
 def print_food_summary(food: USDAFood):
@@ -12,8 +12,10 @@ Most commercial APIs use OAuth2. This shows you know how to handle it.
 """
 
 import requests
+import threading
 import time
-from typing import List, Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Sequence
 from datetime import datetime, timedelta
 from loguru import logger
 
@@ -43,9 +45,11 @@ class KrogerClient:
         
         self.session = requests.Session()
         
-        # OAuth2 token management
+        # OAuth2 token management (the lock keeps concurrent prefetch
+        # threads from refreshing the token all at once)
         self._access_token = None
         self._token_expires_at = None
+        self._token_lock = threading.Lock()
         
         # Get initial token
         self._refresh_token()
@@ -107,9 +111,10 @@ class KrogerClient:
     def _ensure_valid_token(self):
         """Check if token is expired and refresh if needed"""
         
-        if self._token_expires_at is None or datetime.now() >= self._token_expires_at:
-            logger.info("Token expired, refreshing...")
-            self._refresh_token()
+        with self._token_lock:
+            if self._token_expires_at is None or datetime.now() >= self._token_expires_at:
+                logger.info("Token expired, refreshing...")
+                self._refresh_token()
     
     def search_products(
         self, 
@@ -175,12 +180,13 @@ class KrogerClient:
             logger.error(f"Search failed for '{query}': {e}")
             return []
     
-    def get_product_by_id(self, product_id: str) -> Optional[KrogerProduct]:
+    def get_product_by_id(self, product_id: str, location_id: str = None) -> Optional[KrogerProduct]:
         """
         Get detailed product info by Kroger product ID
         
         Args:
             product_id: Kroger product ID
+            location_id: Store location ID (uses config default if None)
             
         Returns:
             KrogerProduct object or None
@@ -191,7 +197,7 @@ class KrogerClient:
         logger.info(f"Fetching Kroger product: {product_id}")
         
         endpoint = f"{self.BASE_URL}/products/{product_id}"
-        params = {"filter.locationId": self.location_id}
+        params = {"filter.locationId": location_id or self.location_id}
         
         try:
             response = self._make_request_with_retry(endpoint, params)
@@ -219,6 +225,59 @@ class KrogerClient:
             logger.error(f"Failed to fetch product {product_id}: {e}")
             return None
     
+    def search_locations(
+        self,
+        queries: Dict[str, str],
+        location_ids: Sequence[str],
+        limit: int = 5,
+        max_workers: int = 8
+    ) -> Dict[str, Dict[str, List[KrogerProduct]]]:
+        """
+        Search the same products at several stores concurrently
+        
+        Every (location, query) pair is one API call; they are I/O bound,
+        so a thread pool overlaps the network waits. 5 stores x 100 foods
+        take about as long as 63 sequential calls with 8 workers instead
+        of 500.
+        
+        Args:
+            queries: food_key -> search term
+            location_ids: Store location IDs
+            limit: Results per search
+            max_workers: Concurrent requests (keep well under the rate limit)
+            
+        Returns:
+            location_id -> food_key -> products (empty list on a failed search)
+            
+        Example:
+            >>> products = client.search_locations({"oats": "rolled oats"}, ["01400943", "01400376"])
+            >>> products["01400376"]["oats"][0].price
+            3.49
+        """
+        
+        self._ensure_valid_token()
+        
+        pairs = [(location_id, food_key) for location_id in location_ids for food_key in queries]
+        
+        logger.info(
+            f"Prefetching {len(queries)} products at {len(location_ids)} locations "
+            f"({len(pairs)} searches, {max_workers} workers)"
+        )
+        
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = pool.map(
+                lambda pair: self.search_products(queries[pair[1]], limit, pair[0]),
+                pairs
+            )
+            products: Dict[str, Dict[str, List[KrogerProduct]]] = {location_id: {} for location_id in location_ids}
+            for (location_id, food_key), found in zip(pairs, results):
+                products[location_id][food_key] = found
+        
+        logger.success(f"Prefetched {len(pairs)} searches in {time.perf_counter() - start:.1f}s")
+        
+        return products
+    
     def _parse_product(self, raw_data: dict) -> KrogerProduct:
         """
         Parse raw Kroger API response into KrogerProduct model
@@ -295,7 +354,8 @@ class KrogerClient:
                 # Token expired mid-request
                 if response.status_code == 401:
                     logger.warning("Token expired, refreshing...")
-                    self._refresh_token()
+                    with self._token_lock:
+                        self._refresh_token()
                     continue
                 
                 return response
@@ -12,8 +12,60 @@ If the API returns unexpected data, you catch it immediately
 instead of crashing later in your optimization logic.
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Dict, Optional, List, Tuple
+
+
+# USDA nutrient numbers by (name, unit), lowercase. Used when a source
+# carries only names (older cache rows, hand-built foods); the USDA API
+# sends the number itself. Energy is the reason units are part of the
+# key: USDA reports it twice under one name, in kcal (208) and kJ (268).
+NUTRIENT_NUMBERS: Dict[Tuple[str, str], str] = {
+    ("energy", "kcal"): "208",
+    ("energy", "kj"): "268",
+    ("protein", "g"): "203",
+    ("total lipid (fat)", "g"): "204",
+    ("carbohydrate, by difference", "g"): "205",
+    ("water", "g"): "255",
+    ("sugars, total including nlea", "g"): "269",
+    ("fiber, total dietary", "g"): "291",
+    ("calcium, ca", "mg"): "301",
+    ("iron, fe", "mg"): "303",
+    ("magnesium, mg", "mg"): "304",
+    ("phosphorus, p", "mg"): "305",
+    ("potassium, k", "mg"): "306",
+    ("sodium, na", "mg"): "307",
+    ("zinc, zn", "mg"): "309",
+    ("copper, cu", "mg"): "312",
+    ("manganese, mn", "mg"): "315",
+    ("selenium, se", "ug"): "317",
+    ("vitamin a, rae", "ug"): "320",
+    ("vitamin e (alpha-tocopherol)", "mg"): "323",
+    ("vitamin d (d2 + d3)", "ug"): "328",
+    ("vitamin c, total ascorbic acid", "mg"): "401",
+    ("thiamin", "mg"): "404",
+    ("riboflavin", "mg"): "405",
+    ("niacin", "mg"): "406",
+    ("pantothenic acid", "mg"): "410",
+    ("vitamin b-6", "mg"): "415",
+    ("vitamin b-12", "ug"): "418",
+    ("choline, total", "mg"): "421",
+    ("vitamin k (phylloquinone)", "ug"): "430",
+    ("folate, dfe", "ug"): "435",
+    ("cholesterol", "mg"): "601",
+    ("fatty acids, total saturated", "g"): "606",
+}
+
+# Unit a name-only lookup means when USDA reports a name in several units
+PREFERRED_UNITS: Dict[str, str] = {
+    "energy": "kcal",
+}
+
+
+def normalize_unit(unit: str) -> str:
+    """USDA writes "UG", "µg" and "mcg" for the same unit"""
+    unit = unit.strip().lower()
+    return "ug" if unit in ("µg", "μg", "mcg") else unit
 
 
 class NutrientInfo(BaseModel):
@@ -26,15 +78,22 @@ class NutrientInfo(BaseModel):
     name: str = Field(..., description="Nutrient name (e.g., 'Protein')")
     amount: float = Field(..., description="Amount per 100g")
     unit: str = Field(..., description="Unit (e.g., 'g', 'mg')")
+    number: Optional[str] = Field(None, description="USDA nutrient number (e.g., '203' for Protein)")
     
     class Config:
         json_schema_extra = {
             "example": {
                 "name": "Protein",
                 "amount": 3.3,
-                "unit": "g"
+                "unit": "g",
+                "number": "203"
             }
         }
+    
+    @property
+    def canonical_number(self) -> Optional[str]:
+        """USDA nutrient number, from the source or looked up by name and unit"""
+        return self.number or NUTRIENT_NUMBERS.get((self.name.lower(), normalize_unit(self.unit)))
 
 
 class USDAFood(BaseModel):
@@ -54,6 +113,11 @@ class USDAFood(BaseModel):
     
     publication_date: Optional[str] = Field(None, description="When data was published")
     
+    # Lookup indexes (nutrients list they were built from, by name, by
+    # number), built on first use. Replacing `nutrients` rebuilds them;
+    # editing the list in place does not - nutrients are fixed once parsed.
+    _index: Optional[Tuple[List[NutrientInfo], Dict[str, NutrientInfo], Dict[str, NutrientInfo]]] = PrivateAttr(default=None)
+    
     class Config:
         json_schema_extra = {
             "example": {
@@ -68,17 +132,160 @@ class USDAFood(BaseModel):
             }
         }
     
-    def get_nutrient(self, nutrient_name: str) -> Optional[float]:
+    def get_nutrient(self, nutrient_name: str, unit: Optional[str] = None) -> Optional[float]:
         """
         Helper to extract a specific nutrient value
         
+        O(1): looks the name up in an index built on the first call.
+        A name USDA reports in several units resolves to its preferred
+        unit (Energy -> kcal, never kJ), whatever order the entries
+        came in; pass `unit` to ask for another.
+        
         Example:
             protein = food.get_nutrient("Protein")
+            kilojoules = food.get_nutrient("Energy", unit="kJ")
         """
+        if unit is not None:
+            number = NUTRIENT_NUMBERS.get((nutrient_name.lower(), normalize_unit(unit)))
+            if number is not None:
+                return self.get_nutrient_by_number(number)
+            nutrient = next(
+                (n for n in self.nutrients
+                 if n.name.lower() == nutrient_name.lower() and normalize_unit(n.unit) == normalize_unit(unit)),
+                None
+            )
+            return nutrient.amount if nutrient is not None else None
+        
+        nutrient = self._lookup()[1].get(nutrient_name.lower())
+        return nutrient.amount if nutrient is not None else None
+    
+    def get_nutrient_by_number(self, number: str) -> Optional[float]:
+        """
+        Nutrient value by USDA nutrient number (e.g. "208" = Energy in kcal)
+        
+        Numbers are unambiguous where names are not, and stable across
+        USDA renames.
+        """
+        nutrient = self._lookup()[2].get(number)
+        return nutrient.amount if nutrient is not None else None
+    
+    def nutrient_index(self) -> Dict[str, NutrientInfo]:
+        """
+        Lowercase name -> the entry name lookups resolve to
+        
+        One entry per name, in order of first appearance: the first
+        entry with that name, or the first in its preferred unit (see
+        PREFERRED_UNITS).
+        """
+        return self._lookup()[1]
+    
+    def __eq__(self, other) -> bool:
+        # The indexes are a cache: a looked-up food equals its fresh copy
+        if not isinstance(other, USDAFood):
+            return NotImplemented
+        return type(self) is type(other) and self.__dict__ == other.__dict__
+    
+    def _lookup(self) -> Tuple[List[NutrientInfo], Dict[str, NutrientInfo], Dict[str, NutrientInfo]]:
+        """Both indexes, rebuilt if `nutrients` was replaced since - one pass over the list"""
+        # Read from the private-attribute dict: `self._index` only resolves
+        # after a failed normal lookup (BaseModel.__getattr__), ~30x slower
+        index = self.__pydantic_private__["_index"]
+        if index is not None and index[0] is self.nutrients:
+            return index
+        
+        by_name: Dict[str, NutrientInfo] = {}
+        by_number: Dict[str, NutrientInfo] = {}
+        
         for nutrient in self.nutrients:
-            if nutrient.name.lower() == nutrient_name.lower():
-                return nutrient.amount
-        return None
+            name = nutrient.name.lower()
+            current = by_name.get(name)
+            if current is None:
+                by_name[name] = nutrient
+            elif (name in PREFERRED_UNITS
+                  and normalize_unit(current.unit) != PREFERRED_UNITS[name]
+                  and normalize_unit(nutrient.unit) == PREFERRED_UNITS[name]):
+                by_name[name] = nutrient
+            
+            number = nutrient.canonical_number
+            if number is not None:
+                by_number.setdefault(number, nutrient)
+        
+        self._index = (self.nutrients, by_name, by_number)
+        return self._index
+
+
+# ----- Trusted construction ------------------------------------------
+#
+# Validation is for data from outside (USDAClient._parse_food builds
+# models normally). Records we serialized ourselves - cache rows,
+# catalog snapshots - were validated when they were written, and
+# re-validating ~85 nutrients per food dominates bulk loads. These
+# build the same objects pydantic would, without running validators.
+# model_construct() is no help: it is pure Python and slower than
+# validating.
+
+_new = object.__new__
+_set = object.__setattr__
+
+# Every field is set on trusted objects, so one fields-set is shared
+_NUTRIENT_FIELDS = set(NutrientInfo.model_fields)
+_FOOD_FIELDS = set(USDAFood.model_fields)
+
+
+def trusted_nutrients(entries: List[Dict]) -> List[NutrientInfo]:
+    """
+    NutrientInfo objects from dicts we wrote (name, amount, unit, number)
+    
+    The dicts become the objects' field storage - do not reuse them.
+    Entries without "number" (written before it existed) get None.
+    """
+    nutrients = []
+    for entry in entries:
+        fields_set = _NUTRIENT_FIELDS
+        if len(entry) != 4:
+            fields_set = _NUTRIENT_FIELDS & set(entry)
+            entry = {"name": entry["name"], "amount": entry["amount"],
+                     "unit": entry["unit"], "number": entry.get("number")}
+        nutrient = _new(NutrientInfo)
+        _set(nutrient, "__dict__", entry)
+        _set(nutrient, "__pydantic_fields_set__", fields_set)
+        _set(nutrient, "__pydantic_extra__", None)
+        _set(nutrient, "__pydantic_private__", None)
+        nutrients.append(nutrient)
+    return nutrients
+
+
+def trusted_food(
+    fdc_id: int,
+    description: str,
+    food_category: Optional[str],
+    nutrients: List[NutrientInfo],
+    data_type: str,
+    publication_date: Optional[str] = None
+) -> USDAFood:
+    """
+    USDAFood from fields we wrote, without validation
+    
+    Equal to USDAFood(...) with the same arguments - only for data
+    that already passed through the model once.
+    
+    Example:
+        food = trusted_food(row["fdc_id"], row["description"], row["food_category"],
+                            trusted_nutrients(entries), row["data_type"])
+    """
+    food = _new(USDAFood)
+    _set(food, "__dict__", {
+        "fdc_id": fdc_id,
+        "description": description,
+        "food_category": food_category,
+        "nutrients": nutrients,
+        "data_type": data_type,
+        "publication_date": publication_date,
+    })
+    _set(food, "__pydantic_fields_set__", _FOOD_FIELDS)
+    _set(food, "__pydantic_extra__", None)
+    _set(food, "__pydantic_private__", {"_index": None})
+    return food
 
 
 class KrogerProduct(BaseModel):
@@ -303,8 +303,18 @@ class QualityFoodDatabase:
             logger.error(f"Category '{category}' not found")
             return {}
         
+        # One cache query for the whole category; misses go to the API below
+        entries = QUALITY_FOOD_DATABASE[category]
+        missing = {f"{category}:{key}": info["fdc_id"] for key, info in entries.items()
+                   if f"{category}:{key}" not in self._cache}
+        if missing and self.client.use_cache:
+            cached = self.client.cache.get_foods(list(missing.values()))
+            for cache_key, fdc_id in missing.items():
+                if fdc_id in cached:
+                    self._cache[cache_key] = cached[fdc_id]
+        
         foods = {}
-        for food_key in QUALITY_FOOD_DATABASE[category].keys():
+        for food_key in entries.keys():
             food = self.get_food(category, food_key)
             if food:
                 foods[food_key] = food
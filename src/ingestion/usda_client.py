@@ -205,9 +205,11 @@ class USDAClient:
                 nutrient_info = nutrient_data["nutrient"]
                 name = nutrient_info.get("name", "Unknown")
                 unit = nutrient_info.get("unitName", "")
+                number = nutrient_info.get("number")
             else:
                 name = nutrient_data.get("nutrientName", "Unknown")
                 unit = nutrient_data.get("unitName", "")
+                number = nutrient_data.get("nutrientNumber")
             
             amount = nutrient_data.get("amount", 0.0)
             
@@ -217,7 +219,8 @@ class USDAClient:
             nutrients.append(NutrientInfo(
                 name=name,
                 amount=float(amount),
-                unit=unit
+                unit=unit,
+                number=str(number) if number else None
             ))
         
         food_category = None
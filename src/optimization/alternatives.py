@@ -0,0 +1,135 @@
+"""
+Alternative Plans - Several Good Shopping Lists, Not One
+
+The cheapest plan is rarely the only acceptable one. Excluding foods by
+hand and re-optimizing is slow and tends to swap one food for its
+nearest twin. Instead, each alternative is one more LP on the SAME
+compiled model:
+
+    min   sum_j penalty_j * x_j            (overlap with earlier plans)
+    s.t.  nutrient targets as before
+          cost @ x <= (1 + max_cost_increase) * optimal_cost
+
+penalty_j counts, for every earlier plan that used food j, 1 / (grams in
+that plan) - i.e. the objective is the share of the new plan made of
+foods earlier plans already rely on. A tiny cost term breaks ties toward
+the cheaper plan. Only the objective row and the budget bound change,
+so every solve warm-starts from the last basis.
+
+Industry Pattern: Solution Pool / Diverse Near-Optimal Solutions
+MIP solvers keep a pool of good solutions; planners show users a few
+distinct options instead of one "optimal" answer.
+"""
+
+import time
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from loguru import logger
+
+from .compiled_problem import CompiledDietProblem
+from .solution import MIN_QUANTITY_GRAMS, build_result
+
+
+# Weight of cost relative to overlap (both per gram, cost normalized by the optimum)
+COST_TIE_BREAK = 1e-3
+
+
+def plan_overlap(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Share of grams two plans have in common (0 = disjoint, 1 = identical mix)
+
+    Args:
+        a, b: Grams per food, aligned with the same food_keys
+    """
+    total_a, total_b = a.sum(), b.sum()
+    if total_a <= 0 or total_b <= 0:
+        return 0.0
+    return float(np.minimum(a / total_a, b / total_b).sum())
+
+
+def alternative_plans(
+    problem: CompiledDietProblem,
+    nutrition_targets: Dict[str, Tuple[Optional[float], Optional[float]]],
+    k: int = 3,
+    max_cost_increase: float = 0.10
+) -> List[Dict]:
+    """
+    Up to k distinct plans within a cost tolerance of the optimum
+
+    The first plan is the optimum itself. Generation stops early when
+    the next solve would only repeat an earlier food set.
+
+    Args:
+        problem: Compiled problem (left with its cost objective restored)
+        nutrition_targets: Dict mapping nutrient_name -> (min, max)
+        k: Maximum number of plans (including the optimum)
+        max_cost_increase: Allowed cost above optimal (0.10 = +10%)
+
+    Returns:
+        Result dicts, cheapest first; each has result["alternative"] with
+        rank, cost_increase, overlap (with the closest earlier plan) and
+        new_foods (foods no earlier plan used). Empty if infeasible.
+    """
+
+    start = time.perf_counter()
+
+    previous_objective = problem.objective_nutrient
+    problem.set_objective(None)
+
+    try:
+        status, optimum, optimal_cost = problem.solve_vector(nutrition_targets)
+        if status != "Optimal":
+            logger.warning(f"No optimal plan to diversify: {status}")
+            return []
+
+        plans = [optimum]
+        costs = [optimal_cost]
+        budget = optimal_cost * (1 + max_cost_increase)
+        tie_break = COST_TIE_BREAK * problem.costs / max(optimal_cost, 1e-9)
+        penalty = np.zeros(problem.matrix.num_foods)
+
+        while len(plans) < k:
+            used = plans[-1] > MIN_QUANTITY_GRAMS
+            penalty[used] += 1.0 / plans[-1].sum()
+
+            problem.set_objective_weights(penalty + tie_break)
+            status, quantities, cost = problem.solve_vector(nutrition_targets, budget)
+
+            if status != "Optimal":
+                break
+
+            support = frozenset(np.flatnonzero(quantities > MIN_QUANTITY_GRAMS))
+            if any(support == frozenset(np.flatnonzero(plan > MIN_QUANTITY_GRAMS)) for plan in plans):
+                logger.info(f"Only {len(plans)} distinct plan(s) within +{max_cost_increase:.0%}")
+                break
+
+            plans.append(quantities)
+            costs.append(cost)
+    finally:
+        problem.set_objective(previous_objective)
+
+    results = []
+    seen = np.zeros(problem.matrix.num_foods, dtype=bool)
+
+    for rank, (quantities, cost) in enumerate(zip(plans, costs)):
+        result = build_result(
+            problem.foods, problem.prices, problem.matrix, quantities, cost,
+            nutrition_targets, "Optimal"
+        )
+
+        used = quantities > MIN_QUANTITY_GRAMS
+        result["alternative"] = {
+            "rank": rank,
+            "cost_increase": cost / optimal_cost - 1 if optimal_cost > 0 else 0.0,
+            "overlap": max((plan_overlap(quantities, plans[i]) for i in range(rank)), default=0.0),
+            "new_foods": [problem.matrix.food_keys[j] for j in np.flatnonzero(used & ~seen)],
+        }
+        seen |= used
+        results.append(result)
+
+    logger.info(
+        f"Alternative plans: {len(results)} within +{max_cost_increase:.0%} "
+        f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+    )
+
+    return results
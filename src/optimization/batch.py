@@ -0,0 +1,346 @@
+"""
+Batch Optimization - Many Target Profiles, One Catalog
+
+Nightly jobs compute plans for thousands of users against the same
+curated catalog. Looping over optimize_for_macros() rebuilds the same
+model every time and runs on one core.
+
+This module fans the work out to a process pool:
+1. The nutrient matrix (CSR arrays - nonzeros only) and cost vector
+   are copied ONCE into shared memory (multiprocessing.shared_memory)
+2. Each worker attaches to those buffers (no pickling of USDAFood
+   objects) and compiles a resident HiGHS model once
+3. Tasks are just (index, nutrition_targets) - a few hundred bytes
+4. Workers return the nonzero part of the solution; the parent
+   rehydrates full result dicts as results stream in
+
+Industry Pattern: Scatter/Gather with Shared Read-Only Data
+Same idea as serving a model from shared memory to many workers.
+"""
+
+import os
+import time
+import numpy as np
+from scipy import sparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Tuple
+from loguru import logger
+
+from ..ingestion.models import USDAFood
+from .nutrient_matrix import NutrientMatrix, cost_per_gram
+from .compiled_problem import CompiledDietProblem
+from .solution import MIN_QUANTITY_GRAMS, build_result
+from .solvers import SolverOptions
+
+
+class SharedProblemData:
+    """
+    Nutrient matrix + cost vector living in shared memory
+
+    The parent creates it; workers receive only `spec` (names of the
+    shared memory blocks, shapes and labels) and attach to the buffers.
+    """
+
+    def __init__(
+        self,
+        matrix: NutrientMatrix,
+        costs: np.ndarray,
+        max_quantity_per_food: float,
+        options: Optional[SolverOptions] = None,
+        objective: Optional[str] = None
+    ):
+        # The CSR arrays (nonzeros only) plus the cost vector
+        csr = matrix.sparse
+        arrays = {
+            "data": csr.data.astype(np.float64),
+            "indices": csr.indices.astype(np.int32),
+            "indptr": csr.indptr.astype(np.int32),
+            "costs": np.asarray(costs, dtype=np.float64),
+        }
+
+        self._shm = {}
+        self.spec = {
+            "shape": csr.shape,
+            "food_keys": matrix.food_keys,
+            "nutrient_names": matrix.nutrient_names,
+            "max_quantity_per_food": max_quantity_per_food,
+            "options": options,
+            "objective": objective,
+        }
+
+        for name, array in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+            self._shm[name] = shm
+            self.spec[name] = (shm.name, array.shape, array.dtype.str)
+
+    def close(self):
+        """Release and remove the shared memory blocks"""
+        for shm in self._shm.values():
+            shm.close()
+            shm.unlink()
+
+
+# Per-process state, set by the pool initializer
+_worker_problem: Optional[CompiledDietProblem] = None
+_worker_shm: List[shared_memory.SharedMemory] = []
+
+
+def _init_worker(spec: Dict):
+    """Attach to shared buffers and compile the model once per worker"""
+
+    global _worker_problem, _worker_shm
+
+    arrays = {}
+    _worker_shm = []
+    for name in ("data", "indices", "indptr", "costs"):
+        shm_name, shape, dtype = spec[name]
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker_shm.append(shm)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+    values = sparse.csr_matrix(
+        (arrays["data"], arrays["indices"], arrays["indptr"]), shape=spec["shape"], copy=False
+    )
+    costs = arrays["costs"]
+
+    matrix = NutrientMatrix(spec["food_keys"], spec["nutrient_names"], values)
+    _worker_problem = CompiledDietProblem(
+        matrix, costs, spec["max_quantity_per_food"], options=spec["options"]
+    )
+    if spec.get("objective"):
+        _worker_problem.set_objective(spec["objective"])
+
+
+def _solve_point(
+    index: int,
+    nutrition_targets: Dict,
+    budget: Optional[float] = None
+) -> Tuple[int, str, np.ndarray, np.ndarray, Optional[float], Dict]:
+    """
+    Solve one target profile on this worker's resident model
+
+    Returns:
+        (index, status, selected column indices, their grams, total cost, solver stats)
+    """
+
+    status, quantities, objective = _worker_problem.solve_vector(nutrition_targets, budget)
+    stats = dict(_worker_problem.last_stats)
+
+    if quantities is None:
+        return index, status, np.empty(0, dtype=np.int64), np.empty(0), None, stats
+
+    selected = np.flatnonzero(quantities > MIN_QUANTITY_GRAMS)
+    return index, status, selected, quantities[selected], objective, stats
+
+
+def _solve_task(task: Tuple[int, Dict]) -> Tuple:
+    """Solve one target profile in a worker"""
+    index, nutrition_targets = task
+    return _solve_point(index, nutrition_targets)
+
+
+def _solve_chunk(tasks: List[Tuple[int, Dict, Optional[float]]]) -> List[Tuple]:
+    """Solve neighbouring points in order, each warm-started from the last"""
+    return [_solve_point(*task) for task in tasks]
+
+
+def solve_chunks(
+    matrix: NutrientMatrix,
+    costs: np.ndarray,
+    chunks: List[List[Tuple[int, Dict, Optional[float]]]],
+    max_quantity_per_food: float = 1000.0,
+    options: Optional[SolverOptions] = None,
+    objective: Optional[str] = None
+) -> List[Tuple]:
+    """
+    Solve chunks of (index, targets, budget) points, one chunk per worker
+
+    Points within a chunk run sequentially on the same resident model,
+    so each one starts from the previous basis. Used by parameter sweeps
+    where neighbouring points have nearly identical solutions.
+
+    Args:
+        matrix: Nutrient matrix (every row any point may target)
+        costs: Cost per gram, aligned with matrix.food_keys
+        chunks: Lists of (index, nutrition_targets, budget or None)
+        max_quantity_per_food: Maximum grams of any single food
+        options: HiGHS settings applied in every worker
+        objective: None to minimize cost, or a nutrient name to maximize
+
+    Returns:
+        (index, status, selected, grams, total cost, solver stats) per point
+    """
+
+    shared = SharedProblemData(matrix, costs, max_quantity_per_food, options, objective)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=len(chunks),
+            initializer=_init_worker,
+            initargs=(shared.spec,)
+        ) as pool:
+            return [point for chunk in pool.map(_solve_chunk, chunks) for point in chunk]
+    finally:
+        shared.close()
+
+
+def _solve_cost_chunk(task: Tuple[Dict, np.ndarray, np.ndarray]) -> List[Tuple]:
+    """Re-optimize one worker's share of cost vectors, each warm-started from the last"""
+
+    nutrition_targets, indices, cost_rows = task
+    points = []
+
+    for index, costs in zip(indices, cost_rows):
+        _worker_problem.set_objective_weights(costs)
+        status, quantities, _ = _worker_problem.solve_vector(nutrition_targets)
+
+        if quantities is None:
+            points.append((int(index), status, np.empty(0, dtype=np.int64), None))
+            continue
+
+        selected = np.flatnonzero(quantities > MIN_QUANTITY_GRAMS)
+        points.append((int(index), status, selected, float(costs @ quantities)))
+
+    return points
+
+
+def solve_cost_scenarios(
+    matrix: NutrientMatrix,
+    cost_scenarios: np.ndarray,
+    nutrition_targets: Dict[str, Tuple[float, float]],
+    workers: Optional[int] = None,
+    max_quantity_per_food: float = 1000.0,
+    options: Optional[SolverOptions] = None
+) -> List[Tuple]:
+    """
+    Re-optimize the same targets under many cost vectors
+
+    Only the objective changes between scenarios, so each worker keeps
+    one resident model and warm-starts every solve from the previous one.
+
+    Args:
+        matrix: Nutrient matrix (shared with the workers once)
+        cost_scenarios: (scenarios x foods) cost per gram
+        nutrition_targets: Dict mapping nutrient_name -> (min, max)
+        workers: Process count (defaults to CPU count)
+        max_quantity_per_food: Maximum grams of any single food
+        options: HiGHS settings applied in every worker
+
+    Returns:
+        (scenario index, status, selected column indices, optimal cost)
+        per scenario, in scenario order
+    """
+
+    workers = min(workers or os.cpu_count() or 1, len(cost_scenarios))
+    indices = np.array_split(np.arange(len(cost_scenarios)), workers)
+
+    shared = SharedProblemData(matrix, cost_scenarios[0], max_quantity_per_food, options)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shared.spec,)
+        ) as pool:
+            tasks = [(nutrition_targets, chunk, cost_scenarios[chunk]) for chunk in indices]
+            points = [point for chunk in pool.map(_solve_cost_chunk, tasks) for point in chunk]
+    finally:
+        shared.close()
+
+    return sorted(points, key=lambda point: point[0])
+
+
+def solve_batch(
+    foods: Dict[str, USDAFood],
+    prices: Dict[str, float],
+    targets_list: List[Dict[str, Tuple[float, float]]],
+    workers: Optional[int] = None,
+    max_quantity_per_food: float = 1000.0,
+    options: Optional[SolverOptions] = None,
+    stats: Optional[Dict] = None
+) -> Iterator[Tuple[int, Optional[Dict]]]:
+    """
+    Solve many target profiles over one catalog in a process pool
+
+    Results are yielded as soon as each solve finishes, so callers can
+    stream them to disk or a queue instead of holding thousands in memory.
+
+    Args:
+        foods: Dict mapping food_key -> USDAFood
+        prices: Dict mapping food_key -> price in dollars
+        targets_list: One nutrition_targets dict per plan
+        workers: Process count (defaults to CPU count)
+        max_quantity_per_food: Maximum grams of any single food
+        options: HiGHS settings applied in every worker
+        stats: Optional dict filled with throughput numbers when done
+
+    Yields:
+        (index into targets_list, result dict or None if infeasible)
+    """
+
+    workers = workers or os.cpu_count() or 1
+
+    # Every nutrient any profile touches becomes a row
+    nutrient_names = list(dict.fromkeys(
+        name for targets in targets_list for name in targets
+    ))
+
+    # One scan of the catalog: targeted rows for the workers, every
+    # nutrient for the parent's all_nutrient_totals
+    catalog = NutrientMatrix.from_foods(foods, sparse=True)
+    matrix = catalog.select(nutrient_names)
+    costs = cost_per_gram(prices, matrix.food_keys)
+
+    logger.info(
+        f"Batch optimization: {len(targets_list)} profiles, "
+        f"{matrix.num_foods} foods, {workers} workers"
+    )
+
+    shared = SharedProblemData(matrix, costs, max_quantity_per_food, options)
+    start = time.perf_counter()
+    solved = 0
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shared.spec,)
+        ) as pool:
+            futures = [
+                pool.submit(_solve_task, (index, targets))
+                for index, targets in enumerate(targets_list)
+            ]
+
+            for future in as_completed(futures):
+                index, status, selected, grams, objective, _ = future.result()
+                solved += 1
+
+                if status != "Optimal":
+                    yield index, None
+                    continue
+
+                quantities = np.zeros(matrix.num_foods)
+                quantities[selected] = grams
+                yield index, build_result(
+                    foods, prices, matrix, quantities, objective,
+                    targets_list[index], status, catalog
+                )
+    finally:
+        shared.close()
+
+        elapsed = time.perf_counter() - start
+        throughput = solved / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"Batch finished: {solved} solves in {elapsed:.2f}s "
+            f"({throughput:.1f} solves/sec)"
+        )
+
+        if stats is not None:
+            stats.update({
+                "solves": solved,
+                "seconds": elapsed,
+                "solves_per_second": throughput,
+                "workers": workers,
+            })
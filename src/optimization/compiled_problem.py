@@ -0,0 +1,379 @@
+"""
+Compiled Diet Problem - Build Once, Re-Solve Many Times
+
+In the Streamlit app every slider tweak used to rebuild the whole LP,
+even though the foods and prices had not changed - only the right-hand
+sides of the nutrient constraints moved.
+
+A CompiledDietProblem is built once per (food set, prices):
+- Columns: grams of each food (cost and bounds fixed)
+- Rows: ONE ranged row per nutrient  (min <= A_i @ x <= max)
+        plus one cost row             (c @ x <= budget, free by default)
+
+`resolve(targets)` only rewrites row bounds. The HiGHS model object
+keeps its last optimal basis, so the next solve warm-starts from it
+(dual simplex typically needs a handful of pivots instead of a cold
+start).
+
+Industry Pattern: Persistent Solver Models
+Trading and logistics systems keep models resident and patch them,
+because rebuilding is often slower than solving.
+"""
+
+import time
+import highspy
+import numpy as np
+from scipy import sparse
+from typing import Dict, List, Optional, Sequence, Tuple
+from loguru import logger
+
+from ..ingestion.models import USDAFood
+from .nutrient_matrix import NutrientMatrix, cost_per_gram
+from .solution import build_result
+from .solvers import LpArrays, SolverOptions, apply_highs_options, pass_lp
+from .elastic import InfeasibilityReport, diagnose_infeasibility
+
+
+# HiGHS model status -> PuLP status names (what the rest of the app expects)
+HIGHS_STATUS = {
+    highspy.HighsModelStatus.kOptimal: "Optimal",
+    highspy.HighsModelStatus.kInfeasible: "Infeasible",
+    highspy.HighsModelStatus.kUnbounded: "Unbounded",
+    highspy.HighsModelStatus.kUnboundedOrInfeasible: "Infeasible",
+    highspy.HighsModelStatus.kTimeLimit: "Not Solved",
+    highspy.HighsModelStatus.kIterationLimit: "Not Solved",
+}
+
+
+class CompiledDietProblem:
+    """
+    Reusable LP template for a fixed food set and price list
+
+    Example:
+        >>> problem = DietOptimizer().compile(foods, prices, ["Energy", "Protein"])
+        >>> result = problem.resolve({"Energy": (1800, 2200), "Protein": (120, 180)})
+        >>> result = problem.resolve({"Energy": (1900, 2300), "Protein": (130, 190)})  # fast
+    """
+
+    def __init__(
+        self,
+        matrix: NutrientMatrix,
+        costs: np.ndarray,
+        max_quantity_per_food: float = 1000.0,
+        foods: Optional[Dict[str, USDAFood]] = None,
+        prices: Optional[Dict[str, float]] = None,
+        options: Optional[SolverOptions] = None
+    ):
+        """
+        Build the HiGHS model
+
+        Args:
+            matrix: Nutrient matrix (rows = every nutrient that may be targeted)
+            costs: Cost per gram, aligned with matrix.food_keys
+            max_quantity_per_food: Upper bound on grams of any single food
+            foods: Food objects, needed to build full result dicts
+            prices: Package prices, needed to build full result dicts
+            options: Solver settings (time limit, threads, log output)
+        """
+
+        self.matrix = matrix
+        self.costs = costs
+        self.max_quantity_per_food = max_quantity_per_food
+        self.foods = foods or {}
+        self.prices = prices or {}
+        self.options = options or SolverOptions(name="highs")
+
+        self._row_index = {name.lower(): i for i, name in enumerate(matrix.nutrient_names)}
+        self._budget_row = matrix.num_nutrients
+        self.objective_nutrient: Optional[str] = None
+        self._custom_objective = False
+        self._targeted: List[str] = []
+
+        start = time.perf_counter()
+
+        self.highs = highspy.Highs()
+        apply_highs_options(self.highs, self.options)
+        pass_lp(self.highs, self._build_lp())
+
+        self.build_time = time.perf_counter() - start
+        self.last_solve_time = 0.0
+        self.last_stats: Dict = {}
+
+        logger.info(
+            f"Compiled diet problem: {matrix.num_foods} foods x "
+            f"{matrix.num_nutrients} nutrients ({matrix.nnz} nonzeros) in {self.build_time * 1000:.1f}ms"
+        )
+
+    @classmethod
+    def from_foods(
+        cls,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrient_names: Sequence[str],
+        max_quantity_per_food: float = 1000.0,
+        options: Optional[SolverOptions] = None,
+        catalog: Optional[NutrientMatrix] = None
+    ) -> "CompiledDietProblem":
+        """
+        Compile straight from the optimizer's usual inputs
+
+        Pass `catalog` (a sparse matrix of every nutrient, built once per
+        food set) to slice the rows out of it instead of re-reading every
+        food's nutrient list.
+        """
+
+        start = time.perf_counter()
+        if catalog is not None:
+            matrix = catalog.select(nutrient_names, list(foods))
+        else:
+            matrix = NutrientMatrix.from_foods(foods, nutrient_names, sparse=True)
+        costs = cost_per_gram(prices, matrix.food_keys)
+        problem = cls(matrix, costs, max_quantity_per_food, foods, prices, options)
+
+        # Count matrix assembly as part of the build
+        problem.build_time = time.perf_counter() - start
+        return problem
+
+    def _build_lp(self) -> LpArrays:
+        """Column-wise sparse LP with free rows (bounds are set per resolve)"""
+
+        a_matrix = sparse.vstack([
+            self.matrix.per_gram_sparse(),
+            sparse.csr_matrix(self.costs)
+        ]).tocsc()
+        num_foods = self.matrix.num_foods
+        num_rows = self.matrix.num_nutrients + 1
+
+        return LpArrays(
+            col_cost=self.costs,
+            col_lower=np.zeros(num_foods),
+            col_upper=np.full(num_foods, self.max_quantity_per_food),
+            row_lower=np.full(num_rows, -highspy.kHighsInf),
+            row_upper=np.full(num_rows, highspy.kHighsInf),
+            a_matrix=a_matrix
+        )
+
+    def _set_targets(
+        self,
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        budget: Optional[float] = None
+    ):
+        """Rewrite every row's bounds; untargeted nutrients become free rows"""
+
+        lower = np.full(self.matrix.num_nutrients + 1, -highspy.kHighsInf)
+        upper = np.full(self.matrix.num_nutrients + 1, highspy.kHighsInf)
+
+        for nutrient_name, (min_amount, max_amount) in nutrition_targets.items():
+            i = self._row_index.get(nutrient_name.lower())
+            if i is None:
+                raise ValueError(
+                    f"Nutrient '{nutrient_name}' was not compiled into this problem"
+                )
+            if min_amount is not None:
+                lower[i] = min_amount
+            if max_amount is not None:
+                upper[i] = max_amount
+
+        if budget is not None:
+            upper[self._budget_row] = budget
+
+        rows = np.arange(self.matrix.num_nutrients + 1, dtype=np.int32)
+        self.highs.changeRowsBounds(len(rows), rows, lower, upper)
+        self._targeted = list(nutrition_targets)
+
+    def set_objective(self, nutrient_name: Optional[str] = None):
+        """
+        Choose what the LP optimizes
+
+        Args:
+            nutrient_name: None to minimize cost (default), or a compiled
+                           nutrient to maximize instead (pair with a budget)
+        """
+
+        if nutrient_name is None:
+            objective = self.costs
+        else:
+            i = self._row_index.get(nutrient_name.lower())
+            if i is None:
+                raise ValueError(
+                    f"Nutrient '{nutrient_name}' was not compiled into this problem"
+                )
+            # Tiny cost term: among equally nutritious plans, prefer the cheapest
+            objective = -self.matrix.rows([i])[0] / 100.0 + 1e-6 * self.costs
+
+        self._change_costs(objective)
+        self.objective_nutrient = nutrient_name
+        self._custom_objective = False
+
+    def set_objective_weights(self, weights: np.ndarray):
+        """
+        Minimize weights @ x instead of cost (e.g. overlap penalties)
+
+        solve_vector() still reports the plan's real cost; pair with a
+        budget to keep it near the optimum. Undo with set_objective().
+
+        Args:
+            weights: Objective coefficient per gram, aligned with food_keys
+        """
+
+        self._change_costs(weights)
+        self.objective_nutrient = None
+        self._custom_objective = True
+
+    def set_food_bounds(self, upper: Optional[np.ndarray] = None):
+        """
+        Per-food upper bounds in grams (0 excludes a food)
+
+        Args:
+            upper: Bound per food, aligned with food_keys
+                   (None = back to max_quantity_per_food for every food)
+        """
+
+        if upper is None:
+            upper = np.full(self.matrix.num_foods, self.max_quantity_per_food)
+        columns = np.arange(self.matrix.num_foods, dtype=np.int32)
+        self.highs.changeColsBounds(
+            len(columns), columns, np.zeros(len(columns)), np.ascontiguousarray(upper, dtype=np.float64)
+        )
+
+    def sensitivity(self) -> Tuple[Dict[str, float], np.ndarray]:
+        """
+        Duals of the last optimal solve
+
+        Shadow price of a nutrient = change in cost per unit its binding
+        bound moves (positive when a minimum binds, negative for a maximum).
+        Reduced cost of a food = how much its price per gram would have to
+        drop before buying it pays off (0 for foods in the plan).
+
+        Returns:
+            (nutrient_name -> shadow price for every targeted nutrient,
+             reduced cost per gram aligned with food_keys)
+        """
+
+        solution = self.highs.getSolution()
+        row_dual = np.asarray(solution.row_dual)
+        shadow_prices = {
+            name: float(row_dual[self._row_index[name.lower()]]) + 0.0 for name in self._targeted
+        }
+        return shadow_prices, np.asarray(solution.col_dual)
+
+    def sensitivity_summary(self) -> Dict:
+        """sensitivity() as a plain dict for result dicts (food_key -> reduced cost)"""
+
+        shadow_prices, reduced_costs = self.sensitivity()
+        return {
+            "shadow_prices": shadow_prices,
+            "reduced_costs": dict(zip(self.matrix.food_keys, reduced_costs.tolist())),
+        }
+
+    def _change_costs(self, objective: np.ndarray):
+        """Swap the objective row in place (the basis stays warm)"""
+        columns = np.arange(self.matrix.num_foods, dtype=np.int32)
+        self.highs.changeColsCost(len(columns), columns, np.ascontiguousarray(objective, dtype=np.float64))
+
+    def solve_vector(
+        self,
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        budget: Optional[float] = None
+    ) -> Tuple[str, Optional[np.ndarray], Optional[float]]:
+        """
+        Re-solve for new targets and return the raw solution
+
+        Args:
+            nutrition_targets: Dict mapping nutrient_name -> (min, max)
+            budget: Optional cap on total cost in dollars
+
+        Returns:
+            (status, grams per food or None, total cost or None)
+        """
+
+        start = time.perf_counter()
+        self._set_targets(nutrition_targets, budget)
+        update_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.highs.run()
+        self.last_solve_time = time.perf_counter() - start
+
+        status = HIGHS_STATUS.get(self.highs.getModelStatus(), "Undefined")
+        info = self.highs.getInfo()
+
+        self.last_stats = {
+            "solver": "highs",
+            "build_time": update_time,  # Only the bounds changed
+            "solve_time": self.last_solve_time,
+            "iterations": max(info.simplex_iteration_count, 0) + max(info.ipm_iteration_count, 0),
+            "status": status,
+        }
+
+        if status != "Optimal":
+            return status, None, None
+
+        quantities = np.asarray(self.highs.getSolution().col_value)
+
+        if self.objective_nutrient is not None or self._custom_objective:
+            return status, quantities, float(self.costs @ quantities)
+        return status, quantities, info.objective_function_value
+
+    def resolve(
+        self,
+        nutrition_targets: Dict[str, Tuple[float, float]]
+    ) -> Optional[Dict]:
+        """
+        Re-solve for new targets, warm-starting from the previous basis
+
+        Args:
+            nutrition_targets: Dict mapping nutrient_name -> (min, max)
+
+        Returns:
+            Same result dict as DietOptimizer.optimize(), or None if infeasible
+        """
+
+        status, quantities, objective = self.solve_vector(nutrition_targets)
+
+        logger.info(
+            f"Re-solve status: {status} ({self.last_solve_time * 1000:.1f}ms)"
+        )
+
+        if status != "Optimal":
+            logger.warning(f"No optimal solution found: {status}")
+            return None
+
+        result = build_result(
+            self.foods, self.prices, self.matrix, quantities, objective,
+            nutrition_targets, status
+        )
+        result["solver_stats"] = dict(self.last_stats)
+        result["sensitivity"] = self.sensitivity_summary()
+        return result
+
+    def diagnose(
+        self,
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        max_quantity_per_food: Optional[float] = None,
+        weights: Optional[Dict[str, float]] = None
+    ) -> Optional[InfeasibilityReport]:
+        """
+        Which targets conflict, and by how much (one elastic LP)
+
+        Runs on its own HiGHS model, so the resident model and its warm
+        basis are untouched - safe to call from another thread while
+        resolve() runs.
+
+        Args:
+            nutrition_targets: Dict mapping nutrient_name -> (min, max)
+            max_quantity_per_food: Override the compiled per-food cap
+            weights: nutrient_name -> penalty per unit of violation
+
+        Returns:
+            InfeasibilityReport (see elastic.py), or None if it failed
+        """
+
+        return diagnose_infeasibility(
+            self.matrix,
+            self.costs,
+            nutrition_targets,
+            max_quantity_per_food or self.max_quantity_per_food,
+            weights,
+            self.options
+        )
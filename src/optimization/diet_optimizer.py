@@ -12,11 +12,36 @@ Linear programming is used in supply chain, logistics, finance, etc.
 This shows you understand mathematical optimization - a rare skill.
 """
 
+import os
+import tempfile
+import time
+import numpy as np
+from scipy import sparse as sp
 from pulp import LpMinimize, LpProblem, LpStatus, LpVariable, lpSum, value
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple, Union
 from loguru import logger
 
 from ..ingestion.models import USDAFood, KrogerProduct
+from ..database.cache import NutritionCache
+from .nutrient_matrix import NutrientMatrix, cost_per_gram
+from .solution import MIN_QUANTITY_GRAMS, build_result
+from .compiled_problem import CompiledDietProblem
+from .batch import solve_batch
+from .solvers import SolverOptions, make_pulp_solver, pulp_iterations
+from .presolve import presolve_foods
+from .pareto import ParetoSweep
+from .multi_day import MultiDayProblem
+from .packages import PackageOption, PackageProblem
+from .household import HouseholdMember, HouseholdProblem
+from .rolling_horizon import RollingHorizonPlanner
+from .multi_store import MultiStoreProblem
+from .elastic import InfeasibilityReport, diagnose_infeasibility
+from .result_cache import ResultCache, problem_fingerprint
+from .alternatives import alternative_plans
+from .column_generation import active_matrix, seed_columns, solve_column_generation
+from .substitution import suggest_swaps
+from .price_scenarios import price_risk
+from .rounding import PracticalUnit, format_quantity, round_quantities
 
 
 class DietOptimizer:
@@ -38,17 +63,118 @@ class DietOptimizer:
         x_i <= max_quantity_i  (optional max per food)
     
     This is a Linear Program (LP) - solvable in polynomial time!
+    
+    Engines:
+        "pulp"  - Symbolic PuLP model solved by CBC, HiGHS or GLPK
+                  (the original path; solver chosen with `solver`)
+        "highs" - NumPy nutrient matrix handed straight to an in-process
+                  HiGHS model (no expression building, no files)
+    
+    Every result carries result["solver_stats"] (solver, build_time,
+    solve_time, iterations, status); the latest stats are also kept in
+    self.last_solver_stats, even when no solution was found. The pulp
+    engine reads iterations from in-process HiGHS or parses them from
+    the CBC / HiGHS / GLPK log; they are None when msg=True (the log
+    goes to stdout instead of a file) or a log has no count.
+    
+    LP results also carry result["sensitivity"]: the shadow price of every
+    target (dollars per unit of nutrient) and the reduced cost of every
+    food (dollars per gram); suggest_swaps() builds on the same duals.
+    
+    With presolve=True, duplicate and dominated foods are dropped before
+    the model is built (see presolve.py) and result["presolve"] reports
+    what was removed: food_key -> (reason, kept food responsible), the
+    foods restored after the cap check, and the counts.
+    
+    With elastic=True, an infeasible optimize() still returns None but
+    also runs one elastic LP (see elastic.py); self.last_diagnosis then
+    says which targets conflict and by how much.
+    
+    With a ResultCache, optimize() first looks the problem up by its
+    fingerprint (foods, prices, bounds, targets, and the engine, solver,
+    gap and presolve settings); repeats skip the solve.
+    
+    Results sum every nutrient of the plan's foods with one sparse
+    product. Pass the `catalog` you already hold to optimize() and the
+    plan's columns are sliced from it instead of read from the foods.
     """
     
-    def __init__(self, problem_name: str = "Nutritional Arbitrage"):
+    ENGINES = ("pulp", "highs")
+    
+    def __init__(
+        self,
+        problem_name: str = "Nutritional Arbitrage",
+        engine: str = "pulp",
+        solver: Optional[str] = None,
+        threads: Optional[int] = None,
+        gap_rel: Optional[float] = None,
+        msg: bool = False,
+        presolve: bool = False,
+        elastic: bool = False,
+        cache: Optional[ResultCache] = None
+    ):
         """
         Initialize optimizer
         
         Args:
             problem_name: Name for the optimization problem
+            engine: "pulp" or "highs" (see class docstring)
+            solver: "cbc", "highs" or "glpk" for the pulp engine
+                    (default "cbc"); the highs engine always uses HiGHS
+            threads: Solver threads (None = solver default)
+            gap_rel: Relative MIP gap tolerance
+            msg: Show solver logs on stdout
+            presolve: Drop duplicate/dominated foods before building the model
+            elastic: Diagnose infeasible targets automatically
+            cache: Result cache consulted before every optimize()
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}'. Choose from {self.ENGINES}")
+        
+        if engine == "highs" and solver not in (None, "highs"):
+            raise ValueError(f"The highs engine cannot use solver '{solver}'")
+        
         self.problem_name = problem_name
-        logger.info(f"Diet optimizer initialized: {problem_name}")
+        self.engine = engine
+        self.solver = solver or ("highs" if engine == "highs" else "cbc")
+        self.threads = threads
+        self.gap_rel = gap_rel
+        self.msg = msg
+        self.presolve = presolve
+        self.elastic = elastic
+        self.cache = cache
+        
+        self.last_solver_stats: Dict = {}
+        self.last_batch_stats: Dict = {}
+        self.last_diagnosis: Optional[InfeasibilityReport] = None
+        
+        # (catalog, column index, CSC copy) of the last catalog sliced
+        self._catalog_columns: Optional[Tuple[NutrientMatrix, Dict[str, int], sp.csc_matrix]] = None
+        
+        # Fail fast if the requested solver is not installed
+        if engine == "pulp":
+            make_pulp_solver(self.solver_options())
+        
+        logger.info(
+            f"Diet optimizer initialized: {problem_name} "
+            f"(engine: {engine}, solver: {self.solver})"
+        )
+    
+    def solver_options(self, time_limit: Optional[float] = None, name: Optional[str] = None) -> SolverOptions:
+        """
+        Solver settings for one solve
+        
+        Args:
+            time_limit: Wall-clock limit in seconds
+            name: Override the solver name (e.g. "highs" for compiled problems)
+        """
+        return SolverOptions(
+            name=name or self.solver,
+            time_limit=time_limit,
+            threads=self.threads,
+            gap_rel=self.gap_rel,
+            msg=self.msg
+        )
     
     def optimize(
         self,
@@ -56,7 +182,8 @@ class DietOptimizer:
         prices: Dict[str, float],
         nutrition_targets: Dict[str, Tuple[float, float]],
         max_quantity_per_food: float = 1000.0,  # Max grams per food
-        time_limit: int = 60  # Solver time limit in seconds
+        time_limit: int = 60,  # Solver time limit in seconds
+        catalog: Optional[NutrientMatrix] = None
     ) -> Optional[Dict]:
         """
         Optimize food selection to meet nutrition goals at minimum cost
@@ -68,6 +195,8 @@ class DietOptimizer:
                               e.g., {"Protein": (100, 150), "Carbs": (200, 300)}
             max_quantity_per_food: Maximum grams of any single food (prevents absurd solutions)
             time_limit: Maximum solver time
+            catalog: Sparse all-nutrient matrix covering these foods, if
+                     the caller already has one (results slice it)
             
         Returns:
             Dict with optimization results or None if infeasible
@@ -86,6 +215,131 @@ class DietOptimizer:
             f"{len(nutrition_targets)} nutrition targets"
         )
         
+        self.last_diagnosis = None
+        
+        fingerprint = None
+        if self.cache is not None:
+            # Solver settings are part of the key: a shared cache must not
+            # hand one configuration's plan (and its stats/duals) to another
+            fingerprint = problem_fingerprint(
+                foods, prices, nutrition_targets, max_quantity_per_food=max_quantity_per_food,
+                engine=self.engine, solver=self.solver, gap_rel=self.gap_rel, presolve=self.presolve
+            )
+            result = self.cache.get(fingerprint, foods)
+            if result is not None:
+                self.last_solver_stats = dict(result["solver_stats"])
+                logger.success(f"Cache hit! Cost: ${result['total_cost']:.2f}")
+                return result
+        
+        if self.presolve:
+            result = self._optimize_presolved(
+                foods, prices, nutrition_targets, max_quantity_per_food, time_limit, catalog
+            )
+        else:
+            result = self._solve(foods, prices, nutrition_targets, max_quantity_per_food, time_limit, catalog)
+        
+        if result is None and self.elastic:
+            self.last_diagnosis = self.diagnose(
+                foods, prices, nutrition_targets, max_quantity_per_food, time_limit=time_limit
+            )
+        
+        if result is not None and fingerprint is not None:
+            self.cache.put(fingerprint, result)
+        
+        return result
+    
+    def _catalog_slice(self, catalog: NutrientMatrix, food_keys: List[str]) -> NutrientMatrix:
+        """Columns of `catalog` for some food keys, in this order"""
+        
+        if food_keys == catalog.food_keys:
+            return catalog
+        
+        # Column slices of CSR touch every nonzero; of CSC, only the columns taken
+        if self._catalog_columns is None or self._catalog_columns[0] is not catalog:
+            index = {key: j for j, key in enumerate(catalog.food_keys)}
+            self._catalog_columns = (catalog, index, catalog.sparse.tocsc())
+        _, index, by_column = self._catalog_columns
+        columns = np.fromiter((index[key] for key in food_keys), dtype=np.int64, count=len(food_keys))
+        return NutrientMatrix(food_keys, catalog.nutrient_names, by_column[:, columns])
+    
+    def diagnose(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        max_quantity_per_food: float = 1000.0,
+        weights: Optional[Dict[str, float]] = None,
+        time_limit: int = 60
+    ) -> Optional[InfeasibilityReport]:
+        """
+        Find which targets conflict and by how much - one extra LP solve
+        
+        Every target gets slack that lets it miss its bounds; the LP
+        minimizes the weighted (by default relative) total miss. No
+        trial-and-error re-solves.
+        
+        Args:
+            foods: Dict mapping food_key -> USDAFood object
+            prices: Dict mapping food_key -> price in dollars
+            nutrition_targets: Dict mapping nutrient_name -> (min, max)
+            max_quantity_per_food: Maximum grams of any single food
+            weights: nutrient_name -> penalty per unit of violation
+                     (raise one to make it the last target to give)
+            time_limit: Solver time limit
+            
+        Returns:
+            InfeasibilityReport or None if the elastic LP failed
+            
+        Example:
+            >>> report = optimizer.diagnose(foods, prices, targets)
+            >>> for line in report.messages():
+            ...     print(line)
+            >>> result = optimizer.optimize(foods, prices, report.relaxed_targets)
+        """
+        
+        matrix = NutrientMatrix.from_foods(foods, list(nutrition_targets.keys()), sparse=True)
+        return diagnose_infeasibility(
+            matrix,
+            cost_per_gram(prices, matrix.food_keys),
+            nutrition_targets,
+            max_quantity_per_food,
+            weights,
+            self.solver_options(time_limit, name="highs")
+        )
+    
+    def _solve(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        max_quantity_per_food: float,
+        time_limit: int,
+        catalog: Optional[NutrientMatrix]
+    ) -> Optional[Dict]:
+        """Build and solve with the configured engine"""
+        
+        if self.engine == "highs":
+            return self._optimize_matrix(
+                foods, prices, nutrition_targets, max_quantity_per_food, time_limit, catalog
+            )
+        
+        return self._optimize_pulp(
+            foods, prices, nutrition_targets, max_quantity_per_food, time_limit, catalog
+        )
+    
+    def _optimize_pulp(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        max_quantity_per_food: float,
+        time_limit: int,
+        catalog: Optional[NutrientMatrix]
+    ) -> Optional[Dict]:
+        """The original symbolic PuLP model"""
+        
+        build_start = time.perf_counter()
+        
         # Create optimization problem
         prob = LpProblem(self.problem_name, LpMinimize)
         
@@ -113,75 +367,864 @@ class DietOptimizer:
             if food_key in prices
         ]), "Total_Cost"
         
-        # Nutritional constraints
+        # Nutritional constraints (kept per nutrient to read their duals back)
+        nutrient_constraints = {}
         for nutrient_name, (min_amount, max_amount) in nutrition_targets.items():
             # Sum of nutrient from all foods must meet requirements
             nutrient_sum = lpSum([
                 (foods[food_key].get_nutrient(nutrient_name) or 0) * food_vars[food_key] / 100.0
                 for food_key in foods.keys()
             ])
+            nutrient_constraints[nutrient_name] = []
             
             # Minimum constraint
             if min_amount is not None:
-                prob += nutrient_sum >= min_amount, f"Min_{nutrient_name}"
+                constraint = nutrient_sum >= min_amount
+                prob += constraint, f"Min_{nutrient_name}"
+                nutrient_constraints[nutrient_name].append(constraint)
             
             # Maximum constraint
             if max_amount is not None:
-                prob += nutrient_sum <= max_amount, f"Max_{nutrient_name}"
+                constraint = nutrient_sum <= max_amount
+                prob += constraint, f"Max_{nutrient_name}"
+                nutrient_constraints[nutrient_name].append(constraint)
+        
+        build_time = time.perf_counter() - build_start
         
         logger.info("Solving optimization problem...")
         
-        # Solve
-        prob.solve()
+        # Solve with the configured backend (time limit, threads, quiet logs);
+        # the command-line solvers log to a file we read the iterations from
+        with tempfile.TemporaryDirectory() as log_dir:
+            log_path = os.path.join(log_dir, "solver.log")
+            solver = make_pulp_solver(self.solver_options(time_limit), log_path)
+            
+            solve_start = time.perf_counter()
+            prob.solve(solver)
+            solve_time = time.perf_counter() - solve_start
+            
+            iterations = pulp_iterations(prob, solver, log_path)
         
         # Check status
         status = LpStatus[prob.status]
-        logger.info(f"Optimization status: {status}")
+        logger.info(f"Optimization status: {status} ({solve_time * 1000:.0f}ms)")
+        
+        self.last_solver_stats = {
+            "solver": self.solver,
+            "build_time": build_time,
+            "solve_time": solve_time,
+            "iterations": iterations,
+            "status": status
+        }
         
         if status != 'Optimal':
             logger.warning(f"No optimal solution found: {status}")
             return None
         
-        # Extract results
-        solution = {}
-        total_cost = value(prob.objective)
-        
-        selected_foods = {}
-        total_nutrients = {}
-        
-        for food_key, var in food_vars.items():
-            quantity = value(var)
-            
-            if quantity > 0.1:  # Only include foods with meaningful quantities
-                selected_foods[food_key] = {
-                    "quantity_grams": quantity,
-                    "food": foods[food_key],
-                    "price": prices.get(food_key, 0) * (quantity / 453.6)  # Scale price
-                }
-                
-                # Calculate nutrient contributions
-                for nutrient_name in nutrition_targets.keys():
-                    nutrient_value = foods[food_key].get_nutrient(nutrient_name)
-                    if nutrient_value:
-                        contribution = nutrient_value * quantity / 100.0
-                        total_nutrients[nutrient_name] = total_nutrients.get(nutrient_name, 0) + contribution
-        
-        result = {
-            "status": status,
-            "total_cost": total_cost,
-            "selected_foods": selected_foods,
-            "total_nutrients": total_nutrients,
-            "targets": nutrition_targets,
-            "num_foods": len(selected_foods)
-        }
+        # Extract results: the whole solution vector at once, then one
+        # matrix-vector product over every nutrient of just the foods in the plan
+        food_keys = list(food_vars)
+        quantities = np.fromiter(
+            (var.varValue or 0.0 for var in food_vars.values()), dtype=float, count=len(food_keys)
+        )
+        chosen = np.flatnonzero(quantities > MIN_QUANTITY_GRAMS)
+        selected = {food_keys[j]: foods[food_keys[j]] for j in chosen}
+        if catalog is not None:
+            matrix = self._catalog_slice(catalog, list(selected))
+        else:
+            matrix = NutrientMatrix.from_foods(selected, sparse=True)
+        
+        result = build_result(
+            selected, prices, matrix, quantities[chosen], value(prob.objective),
+            nutrition_targets, status, catalog=matrix
+        )
+        result["solver_stats"] = dict(self.last_solver_stats)
+        
+        # Duals, when the solver reports them (CBC and HiGHS do for LPs)
+        if all(var.dj is not None for var in food_vars.values()):
+            result["sensitivity"] = {
+                "shadow_prices": {
+                    nutrient_name: sum(constraint.pi or 0.0 for constraint in constraints) + 0.0
+                    for nutrient_name, constraints in nutrient_constraints.items()
+                },
+                "reduced_costs": {food_key: var.dj for food_key, var in food_vars.items()},
+            }
+        
+        logger.success(
+            f"Optimization complete! Cost: ${result['total_cost']:.2f}, "
+            f"Foods: {result['num_foods']}"
+        )
+        
+        return result
+    
+    def _optimize_presolved(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        max_quantity_per_food: float,
+        time_limit: int,
+        catalog: Optional[NutrientMatrix]
+    ) -> Optional[Dict]:
+        """
+        Presolve, solve the reduced model, then verify
+        
+        Dominance is only exact while the dominating food is below its
+        max-quantity cap. If a kept food ends up at the cap, the foods it
+        dominated are put back and the model is re-solved.
+        """
+        
+        matrix = NutrientMatrix.from_foods(foods, list(nutrition_targets.keys()))
+        costs = cost_per_gram(prices, matrix.food_keys)
+        report = presolve_foods(matrix, costs, nutrition_targets)
+        
+        active = list(report.kept)
+        
+        while True:
+            reduced = {key: foods[key] for key in active}
+            result = self._solve(reduced, prices, nutrition_targets, max_quantity_per_food, time_limit, catalog)
+            
+            if result is None:
+                # Only the cap exception can make the reduced model
+                # infeasible - fall back to the full model
+                logger.warning("Presolved model has no solution, re-solving without presolve")
+                report.restored = list(report.removed)
+                result = self._solve(foods, prices, nutrition_targets, max_quantity_per_food, time_limit, catalog)
+                break
+            
+            capped = [
+                key for key, data in result["selected_foods"].items()
+                if data["quantity_grams"] >= max_quantity_per_food * (1 - 1e-9)
+            ]
+            restore = report.dominated_by(capped)
+            
+            if not restore:
+                break
+            
+            logger.info(f"{len(restore)} removed foods restored (dominating food at cap)")
+            report.restored.extend(restore)
+            active.extend(restore)
+        
+        if result is not None:
+            result["presolve"] = {
+                "removed": dict(report.removed),
+                "restored": list(report.restored),
+                **report.summary()
+            }
+        
+        return result
+    
+    def _optimize_matrix(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        max_quantity_per_food: float,
+        time_limit: int,
+        catalog: Optional[NutrientMatrix]
+    ) -> Optional[Dict]:
+        """
+        Same LP as optimize(), built as arrays and solved in-process
+        
+        min  c @ x
+        s.t. min_targets <= A @ x <= max_targets
+             0 <= x <= max_quantity_per_food
+        """
+        
+        problem = CompiledDietProblem.from_foods(
+            foods,
+            prices,
+            list(nutrition_targets.keys()),
+            max_quantity_per_food,
+            self.solver_options(time_limit),
+            catalog=catalog
+        )
+        
+        logger.info("Solving optimization problem...")
+        
+        status, quantities, total_cost = problem.solve_vector(nutrition_targets)
+        
+        # One-shot solve: the compile counts as build time
+        self.last_solver_stats = dict(problem.last_stats)
+        self.last_solver_stats["build_time"] += problem.build_time
+        
+        logger.info(f"Optimization status: {status} ({problem.last_solve_time * 1000:.0f}ms)")
+        
+        if status != 'Optimal':
+            logger.warning(f"No optimal solution found: {status}")
+            return None
+        
+        result = build_result(
+            foods, prices, problem.matrix, quantities, total_cost, nutrition_targets, status,
+            catalog=self._catalog_slice(catalog, problem.matrix.food_keys) if catalog is not None else None
+        )
+        result["solver_stats"] = dict(self.last_solver_stats)
+        result["sensitivity"] = problem.sensitivity_summary()
+        
+        logger.success(
+            f"Optimization complete! Cost: ${result['total_cost']:.2f}, "
+            f"Foods: {result['num_foods']}"
+        )
+        
+        return result
+    
+    def optimize_multi_day(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrition_targets: Union[Dict[str, Tuple[float, float]], List[Dict[str, Tuple[float, float]]]],
+        num_days: int,
+        max_quantity_per_food: float = 1000.0,
+        max_grams_per_day: Optional[Union[float, Dict[str, float]]] = None,
+        time_limit: int = 60
+    ) -> Optional[Dict]:
+        """
+        Plan several days at once: every day meets its targets, one shopping list
+        
+        Args:
+            foods: Dict mapping food_key -> USDAFood object
+            prices: Dict mapping food_key -> price in dollars
+            nutrition_targets: DAILY targets (one dict for every day, or a list per day)
+            num_days: Planning horizon
+            max_quantity_per_food: Maximum grams of any single food on one day
+            max_grams_per_day: Max-repeat limit (grams of one food per day),
+                               a single number or food_key -> grams
+            time_limit: Solver time limit
+            
+        Returns:
+            Result dict (see MultiDayProblem.solve) or None if infeasible
+            
+        Example:
+            >>> result = optimizer.optimize_multi_day(foods, prices, daily, num_days=7,
+            ...                                       max_grams_per_day=300)
+            >>> for day in result["days"]:
+            ...     print(day["foods"])
+        """
+        
+        daily = nutrition_targets if isinstance(nutrition_targets, list) else [nutrition_targets]
+        nutrient_names = list(dict.fromkeys(name for targets in daily for name in targets))
+        
+        logger.info(
+            f"Starting {num_days}-day optimization: {len(foods)} foods, "
+            f"{len(nutrient_names)} nutrition targets per day"
+        )
+        
+        problem = MultiDayProblem.from_foods(
+            foods, prices, nutrient_names, num_days, max_quantity_per_food,
+            max_grams_per_day, self.solver_options(time_limit, name="highs")
+        )
+        result = problem.solve(nutrition_targets)
+        
+        self.last_solver_stats = dict(problem.last_stats)
+        self.last_solver_stats["build_time"] += problem.build_time
+        
+        if result is not None:
+            result["solver_stats"] = dict(self.last_solver_stats)
+            logger.success(
+                f"Optimization complete! Cost: ${result['total_cost']:.2f} "
+                f"for {num_days} days, Foods: {result['num_foods']}"
+            )
+        
+        return result
+    
+    def optimize_packages(
+        self,
+        foods: Dict[str, USDAFood],
+        packages: List[PackageOption],
+        nutrition_targets: Union[Dict[str, Tuple[float, float]], List[Dict[str, Tuple[float, float]]]],
+        num_days: int = 1,
+        max_quantity_per_food: float = 1000.0,
+        max_packages: int = 20,
+        time_limit: int = 10
+    ) -> Optional[Dict]:
+        """
+        Cheapest cart of WHOLE packages (integer counts) meeting the targets
+        
+        Solves the LP relaxation first (lower bound), rounds package counts
+        up for a guaranteed feasible cart, then searches for a cheaper one
+        until time_limit. result["mip"]["gap"] says how far from proven
+        optimal the returned cart may be.
+        
+        Args:
+            foods: Dict mapping food_key -> USDAFood object
+            packages: Purchasable packages (see packages_from_products)
+            nutrition_targets: DAILY targets (one dict, or a list per day)
+            num_days: Planning horizon (the cart covers every day)
+            max_quantity_per_food: Maximum grams of any single food on one day
+            max_packages: Maximum packages of any single product
+            time_limit: Branch-and-bound time limit in seconds
+        
+        Returns:
+            Result dict with "packages" (the cart) and "mip" (bound and gap),
+            or None if infeasible
+        
+        Example:
+            >>> packages = packages_from_products({"chicken": kroger_products})
+            >>> result = optimizer.optimize_packages(foods, packages, targets, num_days=7)
+            >>> for item in result["packages"]:
+            ...     print(item["count"], "x", item["description"])
+        """
+        
+        daily = nutrition_targets if isinstance(nutrition_targets, list) else [nutrition_targets]
+        nutrient_names = list(dict.fromkeys(name for targets in daily for name in targets))
+        
+        logger.info(
+            f"Starting package optimization: {len(packages)} packages, "
+            f"{num_days} day(s), {len(nutrient_names)} nutrition targets"
+        )
+        
+        problem = PackageProblem(
+            foods, packages, nutrient_names, num_days, max_quantity_per_food,
+            max_packages, self.solver_options(time_limit, name="highs")
+        )
+        result = problem.solve(nutrition_targets)
+        
+        self.last_solver_stats = dict(problem.last_stats)
+        
+        if result is not None:
+            logger.success(
+                f"Optimization complete! Cart: ${result['total_cost']:.2f} "
+                f"({len(result['packages'])} products, gap {result['mip']['gap']:.2%})"
+            )
+        
+        return result
+    
+    def optimize_household(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        members: List[HouseholdMember],
+        num_days: int = 7,
+        max_quantity_per_food: float = 1000.0,
+        packages: Optional[List[PackageOption]] = None,
+        max_packages: int = 40,
+        time_limit: int = 60
+    ) -> Optional[Dict]:
+        """
+        Plan for several people at once: everyone meets their own targets,
+        the household shares one shopping list (or one cart of packages)
+        
+        Args:
+            foods: Dict mapping food_key -> USDAFood object
+            prices: Dict mapping food_key -> price in dollars (ignored with packages)
+            members: HouseholdMember per person, each with DAILY targets
+            num_days: Planning horizon
+            max_quantity_per_food: Maximum grams of any single food per person-day
+            packages: Buy whole packages instead of grams (shared integer cart)
+            max_packages: Maximum packages of any single product
+            time_limit: Solver time limit (branch-and-bound limit with packages)
+        
+        Returns:
+            Result dict (see HouseholdProblem.solve) or None if infeasible
+        
+        Example:
+            >>> members = [HouseholdMember(name="Alex", targets=adult),
+            ...            HouseholdMember(name="Sam", targets=child)]
+            >>> result = optimizer.optimize_household(foods, prices, members, num_days=7)
+            >>> for member in result["members"]:
+            ...     print(member["name"], f"${member['cost_share']:.2f}")
+        """
+        
+        logger.info(
+            f"Starting household optimization: {len(members)} members x {num_days} days, "
+            f"{len(foods)} foods{', whole packages' if packages is not None else ''}"
+        )
+        
+        problem = HouseholdProblem(
+            foods, prices, members, num_days, max_quantity_per_food,
+            packages, max_packages, self.solver_options(time_limit, name="highs")
+        )
+        result = problem.solve()
+        
+        self.last_solver_stats = dict(problem.model.last_stats)
+        self.last_solver_stats["build_time"] = problem.build_time
+        
+        if result is not None:
+            result["solver_stats"] = dict(self.last_solver_stats)
+            logger.success(
+                f"Optimization complete! Cost: ${result['total_cost']:.2f} "
+                f"for {len(members)} members x {num_days} days, Foods: {result['num_foods']}"
+            )
+        
+        return result
+    
+    def rolling_planner(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrient_names: List[str],
+        horizon_days: int = 7,
+        max_quantity_per_food: float = 1000.0,
+        max_grams_per_day: Optional[Union[float, Dict[str, float]]] = None,
+        shelf_life_days: Optional[Dict[str, int]] = None,
+        store: Optional[NutritionCache] = None,
+        time_limit: int = 60
+    ) -> RollingHorizonPlanner:
+        """
+        Build a resident planner for weekly re-plans from a pantry
+        
+        One planner serves every user with the same foods: each plan()
+        only changes the pantry bounds and warm-starts from the last basis.
+        
+        Args:
+            foods: Dict mapping food_key -> USDAFood object
+            prices: Dict mapping food_key -> price in dollars
+            nutrient_names: Every nutrient that may later be targeted
+            horizon_days: Days per plan (one shopping trip)
+            max_quantity_per_food: Maximum grams of any single food on one day
+            max_grams_per_day: Max-repeat limit (grams of one food per day)
+            shelf_life_days: food_key -> days a fresh purchase keeps
+            store: NutritionCache holding pantries by user_id
+            time_limit: Solver time limit per plan
+        
+        Returns:
+            RollingHorizonPlanner - call .plan(targets, user_id=...) on it
+        
+        Example:
+            >>> planner = optimizer.rolling_planner(foods, prices, list(targets),
+            ...                                     store=NutritionCache())
+            >>> result = planner.plan(targets, user_id="alex")
+            >>> result["pantry_used"], result["wasted"]
+        """
+        
+        return RollingHorizonPlanner(
+            foods, prices, nutrient_names, horizon_days, max_quantity_per_food,
+            max_grams_per_day, shelf_life_days, store,
+            self.solver_options(time_limit, name="highs")
+        )
+    
+    def optimize_multi_store(
+        self,
+        foods: Dict[str, USDAFood],
+        store_prices: Dict[str, Dict[str, float]],
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        visit_costs: Union[float, Dict[str, float]] = 5.0,
+        max_quantity_per_food: float = 1000.0,
+        time_limit: int = 10
+    ) -> Optional[Dict]:
+        """
+        Choose what to buy at which store, paying a fixed cost per store visited
+        
+        Args:
+            foods: Dict mapping food_key -> USDAFood object
+            store_prices: location_id -> food_key -> price per pound
+                          (see multi_store.prices_from_products and
+                          KrogerClient.search_locations)
+            nutrition_targets: Dict mapping nutrient_name -> (min, max)
+            visit_costs: Dollars per store visited (one number, or per location)
+            max_quantity_per_food: Maximum grams of any single food
+            time_limit: Branch-and-bound time limit in seconds
+        
+        Returns:
+            Result dict with "stores" (location -> foods, subtotal) and
+            "mip" (bound, gap), or None if infeasible
+        
+        Example:
+            >>> found = kroger.search_locations(queries, ["01400943", "01400376"])
+            >>> store_prices = {loc: prices_from_products(p) for loc, p in found.items()}
+            >>> result = optimizer.optimize_multi_store(foods, store_prices, targets, visit_costs=3.0)
+            >>> for location, stop in result["stores"].items():
+            ...     print(location, f"${stop['subtotal']:.2f}", list(stop["foods"]))
+        """
+        
+        logger.info(
+            f"Starting multi-store optimization: {len(store_prices)} stores, "
+            f"{len(foods)} foods, {len(nutrition_targets)} nutrition targets"
+        )
+        
+        problem = MultiStoreProblem(
+            foods, store_prices, list(nutrition_targets), visit_costs,
+            max_quantity_per_food, self.solver_options(time_limit, name="highs")
+        )
+        result = problem.solve(nutrition_targets)
+        
+        self.last_solver_stats = dict(problem.last_stats)
+        
+        if result is not None:
+            logger.success(
+                f"Optimization complete! Cost: ${result['total_cost']:.2f} "
+                f"at {len(result['stores'])} store(s) (gap {result['mip']['gap']:.2%})"
+            )
+        
+        return result
+    
+    def compile(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrient_names: List[str],
+        max_quantity_per_food: float = 1000.0,
+        time_limit: int = 60,
+        catalog: Optional[NutrientMatrix] = None
+    ) -> CompiledDietProblem:
+        """
+        Build a reusable problem for a fixed food set and price list
+        
+        Use this when the same foods are optimized repeatedly with
+        different targets (e.g. interactive slider changes).
+        
+        Args:
+            foods: Dict mapping food_key -> USDAFood object
+            prices: Dict mapping food_key -> price in dollars
+            nutrient_names: Every nutrient that may later be targeted
+            max_quantity_per_food: Maximum grams of any single food
+            time_limit: Solver time limit per resolve
+            catalog: Sparse all-nutrient matrix of these foods
+                     (NutrientMatrix.from_foods(foods, sparse=True));
+                     rows are sliced from it instead of rebuilt
+            
+        Returns:
+            CompiledDietProblem - call .resolve(nutrition_targets) on it
+        """
+        
+        return CompiledDietProblem.from_foods(
+            foods,
+            prices,
+            nutrient_names,
+            max_quantity_per_food,
+            self.solver_options(time_limit, name="highs"),
+            catalog
+        )
+    
+    def optimize_batch(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        targets_list: List[Dict[str, Tuple[float, float]]],
+        workers: Optional[int] = None,
+        max_quantity_per_food: float = 1000.0
+    ) -> Iterator[Tuple[int, Optional[Dict]]]:
+        """
+        Solve many target profiles against one catalog in parallel
+        
+        The nutrient matrix is built once and shared with worker
+        processes through shared memory. Results stream back as they
+        finish (not in input order), so consume the iterator as you go.
+        Throughput is logged and stored in self.last_batch_stats.
+        
+        Args:
+            foods: Dict mapping food_key -> USDAFood object
+            prices: Dict mapping food_key -> price in dollars
+            targets_list: One nutrition_targets dict per plan
+            workers: Number of worker processes (defaults to CPU count)
+            max_quantity_per_food: Maximum grams of any single food
+            
+        Yields:
+            (index into targets_list, result dict or None if infeasible)
+            
+        Example:
+            >>> optimizer = DietOptimizer()
+            >>> for i, result in optimizer.optimize_batch(foods, prices, user_targets, workers=8):
+            ...     save_plan(user_ids[i], result)
+            >>> print(optimizer.last_batch_stats["solves_per_second"])
+        """
+        
+        self.last_batch_stats = {}
+        return solve_batch(
+            foods, prices, targets_list, workers, max_quantity_per_food,
+            options=self.solver_options(name="highs"),
+            stats=self.last_batch_stats
+        )
+    
+    def optimize_alternatives(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        k: int = 3,
+        max_cost_increase: float = 0.10,
+        max_quantity_per_food: float = 1000.0,
+        time_limit: int = 60
+    ) -> List[Dict]:
+        """
+        k distinct shopping lists, each within a cost tolerance of optimal
+        
+        The model is compiled once; each further plan re-solves it with an
+        objective that penalizes foods earlier plans used, under a budget
+        of (1 + max_cost_increase) x the optimal cost.
+        
+        Args:
+            foods: Dict mapping food_key -> USDAFood object
+            prices: Dict mapping food_key -> price in dollars
+            nutrition_targets: Dict mapping nutrient_name -> (min, max)
+            k: Maximum number of plans (the optimum counts as the first)
+            max_cost_increase: Allowed cost above optimal (0.10 = +10%)
+            max_quantity_per_food: Maximum grams of any single food
+            time_limit: Solver time limit per solve
+            
+        Returns:
+            List of result dicts, cheapest first (see alternatives.py);
+            empty if the targets are infeasible
+            
+        Example:
+            >>> plans = optimizer.optimize_alternatives(foods, prices, targets, k=3)
+            >>> for plan in plans:
+            ...     print(plan["total_cost"], plan["alternative"]["new_foods"])
+        """
+        
+        problem = CompiledDietProblem.from_foods(
+            foods, prices, list(nutrition_targets.keys()), max_quantity_per_food,
+            self.solver_options(time_limit, name="highs")
+        )
+        
+        return alternative_plans(problem, nutrition_targets, k, max_cost_increase)
+    
+    def suggest_swaps(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        food_key: str,
+        top_n: int = 3,
+        max_quantity_per_food: float = 1000.0,
+        time_limit: int = 60
+    ) -> List[Dict]:
+        """
+        Cheapest replacements for one food of the optimal plan
+        
+        Every candidate is ranked at once from the optimal duals (reduced
+        costs); only the best few are re-solved to confirm - instead of one
+        re-solve per food in the catalog.
+        
+        Args:
+            foods: Dict mapping food_key -> USDAFood object
+            prices: Dict mapping food_key -> price in dollars
+            nutrition_targets: Dict mapping nutrient_name -> (min, max)
+            food_key: Food to replace
+            top_n: Number of swaps to return
+            max_quantity_per_food: Maximum grams of any single food
+            time_limit: Solver time limit per solve
+            
+        Returns:
+            Swaps cheapest first (see substitution.py); empty if no single
+            food can take its place
+            
+        Example:
+            >>> swaps = optimizer.suggest_swaps(foods, prices, targets, "chicken_breast")
+            >>> swaps[0]["food_key"], swaps[0]["cost_increase"]
+            ('turkey_breast', 0.12)
+        """
+        
+        problem = CompiledDietProblem.from_foods(
+            foods, prices, list(nutrition_targets.keys()), max_quantity_per_food,
+            self.solver_options(time_limit, name="highs")
+        )
+        
+        return suggest_swaps(problem, nutrition_targets, food_key, top_n)
+    
+    def price_risk(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        result: Optional[Dict] = None,
+        num_scenarios: int = 10000,
+        volatility: float = 0.15,
+        regret_samples: int = 200,
+        workers: Optional[int] = None,
+        max_quantity_per_food: float = 1000.0,
+        seed: Optional[int] = None
+    ) -> Optional[Dict]:
+        """
+        How the plan's cost holds up when prices move (Monte Carlo)
+        
+        Samples num_scenarios price vectors as one array, costs the fixed
+        plan under all of them in one product, and re-optimizes a
+        subsample in a process pool to measure regret and how often each
+        selected food stays optimal (see price_scenarios.py).
+        
+        Args:
+            foods: Dict mapping food_key -> USDAFood object
+            prices: Dict mapping food_key -> price in dollars
+            nutrition_targets: Dict mapping nutrient_name -> (min, max)
+            result: Plan to analyze (default: the optimal plan)
+            num_scenarios: Price scenarios
+            volatility: Standard deviation of log price (0.15 = ~15%)
+            regret_samples: Scenarios re-optimized for regret
+            workers: Processes for the re-optimizations (1 = in-process)
+            max_quantity_per_food: Maximum grams of any single food
+            seed: RNG seed for reproducible scenarios
+            
+        Returns:
+            Risk report dict, or None if the targets are infeasible
+            
+        Example:
+            >>> risk = optimizer.price_risk(foods, prices, targets, result)
+            >>> print(f"95% of weeks under ${risk['plan_cost']['p95']:.2f}")
+        """
+        
+        problem = CompiledDietProblem.from_foods(
+            foods, prices, list(nutrition_targets.keys()), max_quantity_per_food,
+            self.solver_options(name="highs")
+        )
+        
+        quantities = None
+        if result is not None:
+            column = {key: j for j, key in enumerate(problem.matrix.food_keys)}
+            quantities = np.zeros(problem.matrix.num_foods)
+            for food_key, data in result["selected_foods"].items():
+                quantities[column[food_key]] = data["quantity_grams"]
+        
+        return price_risk(
+            problem, nutrition_targets, quantities, num_scenarios, volatility,
+            regret_samples=regret_samples, workers=workers, seed=seed
+        )
+    
+    def round_quantities(
+        self,
+        result: Dict,
+        units: Optional[Dict[str, PracticalUnit]] = None,
+        window: int = 2,
+        max_quantity_per_food: Optional[float] = None,
+        polish: bool = False,
+        time_limit: Optional[float] = None
+    ) -> Optional[Dict]:
+        """
+        Snap a plan to practical units (eggs, slices, servings)
+        
+        Nearest unit first, then a greedy repair of any target it broke,
+        over just the plan's foods; a tiny MILP takes over if the repair
+        gets stuck (see rounding.py). Milliseconds when the repair
+        succeeds, a fraction of a second when the MILP runs - not a
+        re-solve.
+        
+        Args:
+            result: Single-plan result dict (optimize(), resolve(), ...)
+            units: food_key -> PracticalUnit overrides
+            window: Units each food may move away from its LP amount
+            max_quantity_per_food: Cap on grams of any single food
+            polish: Also run the MILP when the repair succeeded
+            time_limit: MILP time limit in seconds (None = sized to the
+                        plan, see rounding.milp_time_limit)
+            
+        Returns:
+            Rounded result dict with "rounding" (cost vs the LP optimum;
+            targets_met=False if the MILP timed out first and the plan is
+            the closest repair), or None if the MILP proves no rounding
+            near the plan meets the targets
+            
+        Example:
+            >>> rounded = optimizer.round_quantities(result)
+            >>> print(f"Rounding costs ${rounded['rounding']['cost_increase']:.2f}")
+        """
+        
+        return round_quantities(
+            result, units, window, max_quantity_per_food, polish,
+            self.solver_options(time_limit, name="highs")
+        )
+    
+    def optimize_column_generation(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        seed_keys: Optional[List[str]] = None,
+        max_quantity_per_food: float = 1000.0,
+        columns_per_round: int = 25,
+        time_limit: int = 60,
+        catalog: Optional[NutrientMatrix] = None
+    ) -> Optional[Dict]:
+        """
+        Same optimum as optimize(), for catalogs far too big for one LP
+        
+        Solves over a small active set (seed foods) and adds foods whose
+        reduced cost, priced against the whole catalog in one sparse
+        product, is negative - until none are left (see column_generation.py).
+        
+        Args:
+            foods: Dict mapping food_key -> USDAFood (the full candidate pool)
+            prices: Dict mapping food_key -> price in dollars
+            nutrition_targets: Dict mapping nutrient_name -> (min, max)
+            seed_keys: Foods to start from (default: the curated quality
+                       foods present in `foods`, plus the best value per target)
+            max_quantity_per_food: Maximum grams of any single food
+            columns_per_round: Foods added per pricing round
+            time_limit: Solver time limit per master solve
+            catalog: Prebuilt sparse nutrient matrix of `foods` (reuse it
+                     across calls; built here if omitted)
+            
+        Returns:
+            Result dict (solver_stats adds rounds, active_columns,
+            catalog_size, master_time, pricing_time) or None if infeasible
+            
+        Example:
+            >>> foods = usda_client.search_foods("", page_size=200)  # huge pool
+            >>> result = optimizer.optimize_column_generation(foods, prices, targets)
+            >>> result["solver_stats"]["active_columns"]
+            38
+        """
+        
+        if catalog is None:
+            catalog = NutrientMatrix.from_foods(foods, list(nutrition_targets.keys()), sparse=True)
+        costs = cost_per_gram(prices, catalog.food_keys)
+        
+        seed = seed_columns(catalog, costs, nutrition_targets, foods, seed_keys)
+        solution = solve_column_generation(
+            catalog, costs, nutrition_targets, seed, max_quantity_per_food, columns_per_round,
+            options=self.solver_options(time_limit, name="highs")
+        )
+        self.last_solver_stats = dict(solution.stats)
+        
+        if solution.status != "Optimal":
+            logger.warning(f"No optimal solution found: {solution.status}")
+            return None
+        
+        result = build_result(
+            foods, prices, active_matrix(catalog, list(nutrition_targets), solution.active),
+            solution.quantities, solution.total_cost, nutrition_targets, solution.status
+        )
+        result["solver_stats"] = dict(solution.stats)
         
         logger.success(
-            f"Optimization complete! Cost: ${total_cost:.2f}, "
-            f"Foods: {len(selected_foods)}"
+            f"Optimization complete! Cost: ${result['total_cost']:.2f}, "
+            f"Foods: {result['num_foods']} ({solution.stats['active_columns']} of "
+            f"{solution.stats['catalog_size']} priced in)"
         )
         
         return result
     
+    def pareto_sweep(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        extra_nutrients: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+        max_quantity_per_food: float = 1000.0,
+        time_limit: int = 60
+    ) -> ParetoSweep:
+        """
+        Prepare cost-vs-nutrition trade-off sweeps
+        
+        The problem is compiled once; every grid point is a warm re-solve.
+        Large grids are split across worker processes.
+        
+        Args:
+            foods: Dict mapping food_key -> USDAFood object
+            prices: Dict mapping food_key -> price in dollars
+            nutrition_targets: Targets held fixed while one nutrient is swept
+            extra_nutrients: Untargeted nutrients you also want to sweep
+            workers: Processes for large grids (None = CPU count, 1 = in-process)
+            max_quantity_per_food: Maximum grams of any single food
+            time_limit: Solver time limit per grid point
+            
+        Returns:
+            ParetoSweep - call .over_target() or .over_budget() on it
+            
+        Example:
+            >>> sweep = optimizer.pareto_sweep(foods, prices, targets)
+            >>> frontier = sweep.over_target("Protein", range(100, 181, 5))
+            >>> px.line(frontier, x="level", y="total_cost")
+        """
+        
+        nutrient_names = list(dict.fromkeys(list(nutrition_targets) + list(extra_nutrients or [])))
+        options = self.solver_options(time_limit, name="highs")
+        
+        problem = CompiledDietProblem.from_foods(
+            foods, prices, nutrient_names, max_quantity_per_food, options
+        )
+        return ParetoSweep(problem, nutrition_targets, workers, options)
+    
     def print_solution(self, result: Dict):
         """
         Pretty-print optimization results
@@ -199,6 +1242,12 @@ class DietOptimizer:
         print("="*70)
         
         print(f"\n💰 Total Cost: ${result['total_cost']:.2f}")
+        if 'rounding' in result:
+            rounding = result['rounding']
+            print(f"   (+${rounding['cost_increase']:.2f} / {rounding['relative_increase']:.1%} "
+                  f"over the unrounded optimum for practical quantities)")
+            if not rounding['targets_met']:
+                print("   ⚠️  Rounding timed out - this plan misses some targets")
         print(f"📦 Foods Selected: {result['num_foods']}")
         
         print(f"\n🛒 Shopping List:")
@@ -210,7 +1259,7 @@ class DietOptimizer:
             price = data['price']
             
             print(f"\n{food.description}")
-            print(f"   Quantity: {quantity:.0f}g ({quantity/453.6:.2f} lbs)")
+            print(f"   Quantity: {format_quantity(data)} ({quantity/453.6:.2f} lbs)")
             print(f"   Cost: ${price:.2f}")
         
         print(f"\n📊 Nutritional Profile:")
@@ -242,6 +1291,67 @@ class SimpleDietOptimizer(DietOptimizer):
     Makes it easy to optimize without specifying all constraints manually.
     """
     
+    MACRO_NUTRIENTS = [
+        "Energy",
+        "Protein",
+        "Carbohydrate, by difference",
+        "Total lipid (fat)"
+    ]
+    
+    @staticmethod
+    def macro_targets(
+        target_calories: float = 2000,
+        target_protein_g: float = 150,
+        target_carbs_g: float = 200,
+        target_fat_g: float = 65,
+        tolerance: float = 0.1
+    ) -> Dict[str, Tuple[float, float]]:
+        """
+        Build (min, max) nutrition targets for the four macros
+        
+        Args:
+            target_calories: Daily calorie target
+            target_protein_g: Daily protein in grams
+            target_carbs_g: Daily carbs in grams
+            target_fat_g: Daily fat in grams
+            tolerance: How flexible targets are (0.1 = ±10%)
+            
+        Returns:
+            Dict mapping nutrient_name -> (min, max)
+        """
+        
+        amounts = [target_calories, target_protein_g, target_carbs_g, target_fat_g]
+        
+        return {
+            nutrient_name: (amount * (1 - tolerance), amount * (1 + tolerance))
+            for nutrient_name, amount in zip(SimpleDietOptimizer.MACRO_NUTRIENTS, amounts)
+        }
+    
+    def compile_for_macros(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        extra_nutrients: Optional[List[str]] = None,
+        catalog: Optional[NutrientMatrix] = None
+    ) -> CompiledDietProblem:
+        """
+        Compile a reusable macro problem (pair with macro_targets())
+        
+        Args:
+            foods: Available foods
+            prices: Food prices
+            extra_nutrients: More rows to compile (e.g. MICRONUTRIENT_NAMES);
+                             they stay unconstrained until targeted
+            catalog: Sparse all-nutrient matrix to slice rows from
+        
+        Example:
+            >>> optimizer = SimpleDietOptimizer()
+            >>> problem = optimizer.compile_for_macros(foods, prices, MICRONUTRIENT_NAMES)
+            >>> result = problem.resolve(optimizer.macro_targets(2200, 160))
+        """
+        nutrient_names = list(dict.fromkeys(self.MACRO_NUTRIENTS + list(extra_nutrients or [])))
+        return self.compile(foods, prices, nutrient_names, catalog=catalog)
+    
     def optimize_for_macros(
         self,
         foods: Dict[str, USDAFood],
@@ -269,23 +1379,12 @@ class SimpleDietOptimizer(DietOptimizer):
         """
         
         # Build nutrition targets with tolerance
-        nutrition_targets = {
-            "Energy": (
-                target_calories * (1 - tolerance),
-                target_calories * (1 + tolerance)
-            ),
-            "Protein": (
-                target_protein_g * (1 - tolerance),
-                target_protein_g * (1 + tolerance)
-            ),
-            "Carbohydrate, by difference": (
-                target_carbs_g * (1 - tolerance),
-                target_carbs_g * (1 + tolerance)
-            ),
-            "Total lipid (fat)": (
-                target_fat_g * (1 - tolerance),
-                target_fat_g * (1 + tolerance)
-            )
-        }
+        nutrition_targets = self.macro_targets(
+            target_calories,
+            target_protein_g,
+            target_carbs_g,
+            target_fat_g,
+            tolerance
+        )
         
         return self.optimize(foods, prices, nutrition_targets)
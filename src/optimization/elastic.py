@@ -0,0 +1,231 @@
+"""
+Elastic Constraints - Why Is My Diet Infeasible?
+
+"No feasible solution" tells the user nothing. Which target is the
+problem - protein, fat, a vitamin? And by how much?
+
+The elastic LP answers in ONE extra solve. Every targeted nutrient row
+gets slack columns that let it miss its bounds, at a price:
+
+    min   sum_i w_i * (under_i + over_i)  +  tiny * cost @ x
+    s.t.  min_i <= A_i @ x + under_i - over_i <= max_i
+          0 <= x <= max_quantity_per_food,  under, over >= 0
+
+This LP is always feasible (slack can absorb anything). At the optimum
+only the conflicting targets have nonzero slack, and the slack is
+exactly how far each one has to move. Weights default to 1 / |target|,
+so the violation is measured relative to each target: missing protein
+by 10 g of 150 counts the same as missing energy by 133 kcal of 2000.
+
+Industry Pattern: Elastic Programming / Goal Programming
+Commercial solvers ship this as "feasibility relaxation" (CPLEX
+feasopt, Gurobi feasRelax) - the standard way to debug infeasible models.
+"""
+
+import time
+import highspy
+import numpy as np
+from scipy import sparse
+from typing import Dict, List, Optional, Tuple
+from loguru import logger
+
+from .nutrient_matrix import NutrientMatrix
+from .solvers import LpArrays, SolverOptions, apply_highs_options, pass_lp
+
+
+# Cost tie-breaker: among equally small violations, prefer the cheapest plan
+COST_WEIGHT = 1e-6
+
+# Slack below this (relative to the target) is solver noise, not a conflict
+VIOLATION_TOLERANCE = 1e-6
+
+
+class InfeasibilityReport:
+    """
+    Which targets conflict, and by how much
+
+    Attributes:
+        violations: One dict per violated bound, largest relative miss first:
+                    nutrient, bound ("min"/"max"), target, achievable,
+                    violation (absolute) and relative (violation / |target|)
+        relaxed_targets: The input targets with each violated bound moved
+                         to what is achievable - feasible as a whole
+        quantities: Grams per food of the closest plan
+        total_violation: Weighted violation (0 = the targets were feasible)
+        elapsed: Build + solve seconds
+    """
+
+    def __init__(
+        self,
+        violations: List[Dict],
+        relaxed_targets: Dict[str, Tuple[Optional[float], Optional[float]]],
+        quantities: np.ndarray,
+        total_violation: float,
+        elapsed: float
+    ):
+        self.violations = violations
+        self.relaxed_targets = relaxed_targets
+        self.quantities = quantities
+        self.total_violation = total_violation
+        self.elapsed = elapsed
+
+    @property
+    def feasible(self) -> bool:
+        """True if no target had to move"""
+        return not self.violations
+
+    def messages(self) -> List[str]:
+        """One human-readable line per violated bound"""
+        lines = []
+        for v in self.violations:
+            side = "minimum" if v["bound"] == "min" else "maximum"
+            lines.append(
+                f"{v['nutrient']}: {side} {v['target']:g} is out of reach - "
+                f"best achievable is {v['achievable']:.1f} "
+                f"(off by {v['violation']:.1f}, {v['relative']:.0%})"
+            )
+        return lines
+
+    def summary(self) -> Dict:
+        """Plain dict for result dicts and logs"""
+        return {
+            "feasible": self.feasible,
+            "violations": self.violations,
+            "relaxed_targets": self.relaxed_targets,
+            "total_violation": self.total_violation,
+            "diagnosis_time": self.elapsed,
+        }
+
+
+def diagnose_infeasibility(
+    matrix: NutrientMatrix,
+    costs: np.ndarray,
+    nutrition_targets: Dict[str, Tuple[Optional[float], Optional[float]]],
+    max_quantity_per_food: float = 1000.0,
+    weights: Optional[Dict[str, float]] = None,
+    options: Optional[SolverOptions] = None
+) -> Optional[InfeasibilityReport]:
+    """
+    Solve the elastic LP and report the smallest set of target changes
+
+    Args:
+        matrix: Nutrient matrix with a row for every targeted nutrient
+        costs: Cost per gram, aligned with matrix.food_keys
+        nutrition_targets: Dict mapping nutrient_name -> (min, max)
+        max_quantity_per_food: Upper bound on grams of any single food
+        weights: nutrient_name -> penalty per unit of violation
+                 (default 1 / |target|, i.e. relative violation)
+        options: HiGHS settings
+
+    Returns:
+        InfeasibilityReport, or None if the elastic LP itself failed
+        (time limit)
+    """
+
+    start = time.perf_counter()
+
+    row_index = {name.lower(): i for i, name in enumerate(matrix.nutrient_names)}
+    names = list(nutrition_targets)
+    missing = [name for name in names if name.lower() not in row_index]
+    if missing:
+        raise ValueError(f"Nutrients {missing} are not rows of the matrix")
+
+    per_gram = matrix.per_gram_sparse()[[row_index[name.lower()] for name in names]]
+    num_foods, num_rows = matrix.num_foods, len(names)
+
+    lower = np.array([-highspy.kHighsInf if lo is None else lo for lo, _ in nutrition_targets.values()])
+    upper = np.array([highspy.kHighsInf if hi is None else hi for _, hi in nutrition_targets.values()])
+
+    # Penalty per unit of slack; a side without a bound gets no slack column
+    scale = np.array([
+        max(abs(lo) if lo is not None else 0.0, abs(hi) if hi is not None else 0.0, 1.0)
+        for lo, hi in nutrition_targets.values()
+    ])
+    penalty = 1.0 / scale
+    if weights:
+        penalty = np.array([weights.get(name, p) for name, p in zip(names, penalty)])
+
+    under_rows = np.flatnonzero(np.isfinite(lower))
+    over_rows = np.flatnonzero(np.isfinite(upper))
+
+    # Columns: [x | under | over]; rows: lower <= A x + under - over <= upper
+    identity = sparse.identity(num_rows, format="csr")
+    a_matrix = sparse.hstack([
+        per_gram,
+        identity[:, under_rows],
+        -identity[:, over_rows],
+    ]).tocsc()
+
+    num_slack = len(under_rows) + len(over_rows)
+    lp = LpArrays(
+        col_cost=np.concatenate([
+            COST_WEIGHT * np.asarray(costs, dtype=float),
+            penalty[under_rows],
+            penalty[over_rows],
+        ]),
+        col_lower=np.zeros(num_foods + num_slack),
+        col_upper=np.concatenate([
+            np.full(num_foods, max_quantity_per_food),
+            np.full(num_slack, highspy.kHighsInf),
+        ]),
+        row_lower=lower,
+        row_upper=upper,
+        a_matrix=a_matrix
+    )
+
+    highs = highspy.Highs()
+    apply_highs_options(highs, options or SolverOptions(name="highs"))
+    pass_lp(highs, lp)
+    highs.run()
+
+    if highs.getModelStatus() != highspy.HighsModelStatus.kOptimal:
+        logger.warning(
+            f"Elastic LP: {highs.modelStatusToString(highs.getModelStatus())}"
+        )
+        return None
+
+    solution = np.asarray(highs.getSolution().col_value)
+    quantities = solution[:num_foods]
+    under = np.zeros(num_rows)
+    over = np.zeros(num_rows)
+    under[under_rows] = solution[num_foods:num_foods + len(under_rows)]
+    over[over_rows] = solution[num_foods + len(under_rows):]
+
+    achieved = per_gram @ quantities
+
+    violations = []
+    relaxed_targets = dict(nutrition_targets)
+    for i, name in enumerate(names):
+        min_amount, max_amount = nutrition_targets[name]
+        for bound, slack, target in (("min", under[i], min_amount), ("max", over[i], max_amount)):
+            if target is None or slack <= VIOLATION_TOLERANCE * scale[i]:
+                continue
+            violations.append({
+                "nutrient": name,
+                "bound": bound,
+                "target": target,
+                "achievable": float(achieved[i]),
+                "violation": float(slack),
+                "relative": float(slack / scale[i]),
+            })
+            if bound == "min":
+                relaxed_targets[name] = (float(achieved[i]), max_amount)
+            else:
+                relaxed_targets[name] = (min_amount, float(achieved[i]))
+
+    violations.sort(key=lambda v: v["relative"], reverse=True)
+    total_violation = float(penalty[under_rows] @ under[under_rows] + penalty[over_rows] @ over[over_rows])
+
+    report = InfeasibilityReport(
+        violations, relaxed_targets, quantities, total_violation, time.perf_counter() - start
+    )
+
+    if report.feasible:
+        logger.info(f"Elastic LP: targets are feasible ({report.elapsed * 1000:.1f}ms)")
+    else:
+        logger.info(
+            f"Elastic LP: {len(violations)} conflicting bound(s) in {report.elapsed * 1000:.1f}ms - "
+            + "; ".join(report.messages())
+        )
+
+    return report
@@ -0,0 +1,246 @@
+"""
+Household Planning - Everyone's Targets, One Shopping Trip
+
+Planning a family one member at a time builds the same model again for
+every person, and then sums the lists by hand. With whole packages it
+also overpays: each person's list rounds up to full packages on its
+own, where the household could share one family pack.
+
+Household formulation (P people, D days, n foods):
+
+    Variables:  y_pd = grams person p eats on day d    (P x D blocks of n)
+                x    = what the household buys         (shared: grams,
+                                                        or package counts)
+
+    min   cost of x
+    s.t.  min_pd <= A @ y_pd <= max_pd       (each person's own targets, daily)
+          sum_pd y_pd <= purchases(x)        (everyone eats from one cart)
+
+It is the multi-day block LP with P x D blocks instead of D: blocks are
+ordered person-major (block = p * D + d) and handed to MultiDayProblem,
+or to PackageProblem when buying whole packages. One sparse build, one
+solve - instead of P rebuilds and a manual merge.
+
+Industry Pattern: Block-Angular Models, More Blocks
+Multi-site production plans add sites as blocks on the same linking
+rows; households add people.
+"""
+
+import numpy as np
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from loguru import logger
+
+from ..ingestion.models import USDAFood
+from .nutrient_matrix import NutrientMatrix, cost_per_gram
+from .multi_day import MultiDayProblem, Targets, expand_targets, sum_targets
+from .packages import PackageOption, PackageProblem
+from .solvers import SolverOptions
+
+
+class HouseholdMember(BaseModel):
+    """One person and their daily targets"""
+    name: str = Field(..., description="Display name")
+    targets: Dict[str, Tuple[Optional[float], Optional[float]]] = Field(
+        ..., description="Daily nutrient_name -> (min, max)"
+    )
+    max_grams_per_day: Optional[float] = Field(
+        None, gt=0, description="Max grams of any single food per day for this person"
+    )
+
+
+class HouseholdProblem:
+    """
+    Per-person, per-day plans with one shared shopping list
+
+    Example:
+        >>> members = [HouseholdMember(name="Alex", targets=adult),
+        ...            HouseholdMember(name="Sam", targets=child)]
+        >>> problem = HouseholdProblem.from_foods(foods, prices, members, num_days=7)
+        >>> result = problem.solve()
+        >>> result["members"][1]["days"][0]["foods"]   # what Sam eats on day 1
+        >>> result["selected_foods"]                    # what to buy
+    """
+
+    def __init__(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        members: Sequence[HouseholdMember],
+        num_days: int = 1,
+        max_quantity_per_food: float = 1000.0,
+        packages: Optional[Sequence[PackageOption]] = None,
+        max_packages: int = 40,
+        options: Optional[SolverOptions] = None,
+        matrix: Optional[NutrientMatrix] = None
+    ):
+        """
+        Build the household block model
+
+        Args:
+            foods: Dict mapping food_key -> USDAFood
+            prices: Dict mapping food_key -> price in dollars (gram purchases)
+            members: People in the household, each with daily targets
+            num_days: Planning horizon
+            max_quantity_per_food: Max grams of any single food per person-day
+            packages: Buy these whole packages instead of grams (MILP)
+            max_packages: Max packages of any single product
+            options: Solver settings
+            matrix: Prebuilt nutrient matrix of `foods` (gram purchases only)
+        """
+
+        if not members:
+            raise ValueError("A household needs at least one member")
+        if num_days < 1:
+            raise ValueError(f"num_days must be at least 1, got {num_days}")
+
+        self.members = list(members)
+        self.num_days = num_days
+        self.num_blocks = len(self.members) * num_days
+
+        nutrient_names = list(dict.fromkeys(
+            name for member in self.members for name in member.targets
+        ))
+
+        if packages is not None:
+            self.model: Union[MultiDayProblem, PackageProblem] = PackageProblem(
+                foods, packages, nutrient_names, self.num_blocks,
+                max_quantity_per_food, max_packages, options
+            )
+        else:
+            if matrix is None:
+                matrix = NutrientMatrix.from_foods(foods, nutrient_names, sparse=True)
+            self.model = MultiDayProblem(
+                matrix, cost_per_gram(prices, matrix.food_keys), self.num_blocks,
+                max_quantity_per_food, None, foods, prices, options
+            )
+
+        self._limit_portions(max_quantity_per_food)
+
+        self.build_time = self.model.build_time
+
+        logger.info(
+            f"Household problem: {len(self.members)} members x {num_days} days "
+            f"({self.num_blocks} blocks) built in {self.build_time * 1000:.1f}ms"
+        )
+
+    @classmethod
+    def from_foods(
+        cls,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        members: Sequence[HouseholdMember],
+        num_days: int = 1,
+        max_quantity_per_food: float = 1000.0,
+        options: Optional[SolverOptions] = None
+    ) -> "HouseholdProblem":
+        """Gram purchases, built straight from the optimizer's usual inputs"""
+        return cls(foods, prices, members, num_days, max_quantity_per_food, options=options)
+
+    def _limit_portions(self, max_quantity_per_food: float):
+        """Per-member gram caps on that member's consumption columns (the first blocks x foods)"""
+
+        if all(member.max_grams_per_day is None for member in self.members):
+            return
+
+        per_block = np.repeat([
+            min(max_quantity_per_food, member.max_grams_per_day or max_quantity_per_food)
+            for member in self.members
+        ], self.num_days)
+        upper = np.repeat(per_block, self.model.matrix.num_foods)
+        columns = np.arange(len(upper), dtype=np.int32)
+        self.model.highs.changeColsBounds(len(columns), columns, np.zeros(len(columns)), upper)
+
+    def _block_targets(self) -> List[Targets]:
+        """One targets dict per block, person-major"""
+        return [
+            targets
+            for member in self.members
+            for targets in expand_targets(member.targets, self.num_days)
+        ]
+
+    def solve(self) -> Optional[Dict]:
+        """
+        Solve for every member's targets at once
+
+        Returns:
+            Result dict for the whole household (selected_foods = the shared
+            shopping list, total_nutrients/targets = household totals) plus:
+                "members": [{"name", "targets", "foods" (grams over the
+                             horizon), "cost_share", "days": [...]}]
+                "days": household totals per day (for multi-day displays)
+                "num_days", "daily_targets", "num_members"
+            and "packages"/"mip" when buying whole packages; None if infeasible
+        """
+
+        block_targets = self._block_targets()
+        result = self.model.solve(block_targets)
+
+        if result is None:
+            return None
+
+        matrix = self.model.matrix
+        blocks = result.pop("days", None) or []
+        if not blocks:
+            # PackageProblem only splits into blocks when there is more than one
+            blocks = [{
+                "foods": {key: data["quantity_grams"] for key, data in result["selected_foods"].items()},
+                "total_nutrients": dict(result["total_nutrients"]),
+            }]
+
+        # What each gram of each food cost the household
+        cost_per_gram_bought = {
+            key: data["price"] / data["quantity_grams"]
+            for key, data in result["selected_foods"].items()
+            if data["quantity_grams"] > 0
+        }
+
+        members = []
+        for p, member in enumerate(self.members):
+            member_days = blocks[p * self.num_days:(p + 1) * self.num_days]
+            eaten: Dict[str, float] = {}
+            for day in member_days:
+                for food_key, grams in day["foods"].items():
+                    eaten[food_key] = eaten.get(food_key, 0.0) + grams
+
+            members.append({
+                "name": member.name,
+                "targets": member.targets,
+                "foods": eaten,
+                "cost_share": float(sum(
+                    grams * cost_per_gram_bought.get(food_key, 0.0) for food_key, grams in eaten.items()
+                )),
+                "days": member_days,
+            })
+
+        # Household view per day: everyone's plates added up
+        daily_targets = []
+        days = []
+        for d in range(self.num_days):
+            day_blocks = [blocks[p * self.num_days + d] for p in range(len(self.members))]
+            foods_today: Dict[str, float] = {}
+            nutrients_today: Dict[str, float] = {}
+            for block in day_blocks:
+                for food_key, grams in block["foods"].items():
+                    foods_today[food_key] = foods_today.get(food_key, 0.0) + grams
+                for name, amount in block["total_nutrients"].items():
+                    nutrients_today[name] = nutrients_today.get(name, 0.0) + amount
+            days.append({"foods": foods_today, "total_nutrients": nutrients_today})
+            daily_targets.append(sum_targets([
+                block_targets[p * self.num_days + d] for p in range(len(self.members))
+            ]))
+
+        result["targets"] = sum_targets(block_targets)
+        result["members"] = members
+        result["num_members"] = len(self.members)
+        result["num_days"] = self.num_days
+        result["daily_targets"] = daily_targets
+        result["days"] = days
+        result["solver_stats"] = dict(self.model.last_stats)
+
+        logger.info(
+            f"Household plan: ${result['total_cost']:.2f} for {len(self.members)} members x "
+            f"{self.num_days} days ({matrix.num_foods} candidate foods)"
+        )
+
+        return result
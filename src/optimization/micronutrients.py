@@ -0,0 +1,171 @@
+"""
+Micronutrients - Daily Values and Upper Limits as LP Rows
+
+Every USDA food carries ~85 nutrients, but a macro-only plan can be
+cheap AND short on calcium, potassium or vitamin C. This module turns
+the reference intakes into (min, max) targets the optimizer already
+understands:
+
+- min = FDA Daily Value (adults and children 4+, 2016 label rules)
+- max = Tolerable Upper Intake Level (NIH, adults 19+) where the UL
+        applies to food; ULs that only cover supplements or fortificants
+        (magnesium, niacin, folic acid, vitamin E, preformed vitamin A)
+        are left out - food sources cannot exceed them
+
+Names match USDA FoodData Central nutrient names, and amounts are in
+the unit USDA reports for that nutrient, so rows come straight out of
+the food's nutrient list with no conversion.
+
+Industry Pattern: Reference Data as Configuration
+The numbers live in one table; constraints, reports and the UI are all
+generated from it.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from ..ingestion.models import USDAFood
+from .nutrient_matrix import NutrientMatrix
+
+
+class MicronutrientReference(NamedTuple):
+    """Reference intake for one nutrient (per day, in USDA units)"""
+    unit: str
+    daily_value: Optional[float]
+    upper_limit: Optional[float]
+
+
+MICRONUTRIENTS: Dict[str, MicronutrientReference] = {
+    # Fiber and minerals
+    "Fiber, total dietary": MicronutrientReference("g", 28, None),
+    "Calcium, Ca": MicronutrientReference("mg", 1300, 2500),
+    "Iron, Fe": MicronutrientReference("mg", 18, 45),
+    "Magnesium, Mg": MicronutrientReference("mg", 420, None),
+    "Phosphorus, P": MicronutrientReference("mg", 1250, 4000),
+    "Potassium, K": MicronutrientReference("mg", 4700, None),
+    "Sodium, Na": MicronutrientReference("mg", None, 2300),
+    "Zinc, Zn": MicronutrientReference("mg", 11, 40),
+    "Copper, Cu": MicronutrientReference("mg", 0.9, 10),
+    "Manganese, Mn": MicronutrientReference("mg", 2.3, 11),
+    "Selenium, Se": MicronutrientReference("µg", 55, 400),
+
+    # Vitamins
+    "Vitamin A, RAE": MicronutrientReference("µg", 900, None),
+    "Vitamin C, total ascorbic acid": MicronutrientReference("mg", 90, 2000),
+    "Vitamin D (D2 + D3)": MicronutrientReference("µg", 20, 100),
+    "Vitamin E (alpha-tocopherol)": MicronutrientReference("mg", 15, None),
+    "Vitamin K (phylloquinone)": MicronutrientReference("µg", 120, None),
+    "Thiamin": MicronutrientReference("mg", 1.2, None),
+    "Riboflavin": MicronutrientReference("mg", 1.3, None),
+    "Niacin": MicronutrientReference("mg", 16, None),
+    "Pantothenic acid": MicronutrientReference("mg", 5, None),
+    "Vitamin B-6": MicronutrientReference("mg", 1.7, 100),
+    "Folate, DFE": MicronutrientReference("µg", 400, None),
+    "Vitamin B-12": MicronutrientReference("µg", 2.4, None),
+    "Choline, total": MicronutrientReference("mg", 550, 3500),
+}
+
+MICRONUTRIENT_NAMES: List[str] = list(MICRONUTRIENTS)
+
+# Relative slack when labelling amounts low/over in reports
+REPORT_TOLERANCE = 1e-6
+
+
+def micronutrient_targets(
+    nutrient_names: Optional[Sequence[str]] = None,
+    catalog: Optional[NutrientMatrix] = None,
+    fraction_of_dv: float = 1.0,
+    upper_limits: bool = True
+) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+    """
+    Daily (min, max) targets for micronutrients
+
+    Args:
+        nutrient_names: Subset of MICRONUTRIENT_NAMES (None = all)
+        catalog: If given, nutrients no food in it reports are skipped
+                 (a minimum on a nutrient nobody supplies is infeasible)
+        fraction_of_dv: Scale the minimums (e.g. 0.8 = 80% of the DV)
+        upper_limits: Include ULs as maximums
+
+    Returns:
+        Dict mapping nutrient_name -> (min, max), ready to merge with
+        macro targets
+
+    Example:
+        >>> targets = SimpleDietOptimizer.macro_targets(2000, 150)
+        >>> targets.update(micronutrient_targets(catalog=catalog))
+    """
+
+    names = MICRONUTRIENT_NAMES if nutrient_names is None else list(nutrient_names)
+
+    if catalog is not None:
+        reported = catalog.select(names).sparse.getnnz(axis=1) > 0
+        names = [name for name, has_data in zip(names, reported) if has_data]
+
+    targets = {}
+    for name in names:
+        reference = MICRONUTRIENTS[name]
+        minimum = reference.daily_value * fraction_of_dv if reference.daily_value is not None else None
+        maximum = reference.upper_limit if upper_limits else None
+        if minimum is not None or maximum is not None:
+            targets[name] = (minimum, maximum)
+
+    return targets
+
+
+def micronutrient_report(
+    selected_foods: Dict[str, Dict],
+    num_days: int = 1,
+    totals: Optional[Dict[str, float]] = None
+) -> List[Dict]:
+    """
+    Average daily intake of every reference micronutrient in a plan
+
+    Works on any result dict's selected_foods, whether or not the
+    micronutrients were constrained.
+
+    Args:
+        selected_foods: result["selected_foods"]
+        num_days: Days the quantities cover (totals are divided by it)
+        totals: result["all_nutrient_totals"], if the result has it
+                (skips rebuilding a matrix from selected_foods)
+
+    Returns:
+        One row per nutrient: name, amount, unit, daily_value,
+        upper_limit, percent_dv (None without a DV) and status
+        ("low", "ok" or "over")
+    """
+
+    if totals is not None:
+        by_name = {name.lower(): amount for name, amount in totals.items()}
+        amounts = [by_name.get(name.lower(), 0.0) / num_days for name in MICRONUTRIENT_NAMES]
+    else:
+        foods: Dict[str, USDAFood] = {key: data["food"] for key, data in selected_foods.items()}
+        grams = [data["quantity_grams"] for data in selected_foods.values()]
+
+        matrix = NutrientMatrix.from_foods(foods, MICRONUTRIENT_NAMES, sparse=True)
+        amounts = matrix.sparse @ grams / 100.0 / num_days if foods else [0.0] * len(MICRONUTRIENT_NAMES)
+
+    report = []
+    for name, amount in zip(MICRONUTRIENT_NAMES, amounts):
+        reference = MICRONUTRIENTS[name]
+        amount = float(amount)
+
+        # Solver tolerance: a bound met by the LP can land a hair off
+        if reference.upper_limit is not None and amount > reference.upper_limit * (1 + REPORT_TOLERANCE):
+            status = "over"
+        elif reference.daily_value is not None and amount < reference.daily_value * (1 - REPORT_TOLERANCE):
+            status = "low"
+        else:
+            status = "ok"
+
+        report.append({
+            "nutrient": name,
+            "amount": amount,
+            "unit": reference.unit,
+            "daily_value": reference.daily_value,
+            "upper_limit": reference.upper_limit,
+            "percent_dv": 100.0 * amount / reference.daily_value if reference.daily_value else None,
+            "status": status,
+        })
+
+    return report
@@ -0,0 +1,387 @@
+"""
+Multi-Store Arbitrage - What to Buy Where
+
+The same oats cost $3.49 at one Kroger and $2.99 at the next, and no
+single store is cheapest for everything. Buying every food where it is
+cheapest sounds optimal but ignores the trip: each store visited costs
+time and gas. With a fixed visit cost per store the decision becomes a
+small MILP:
+
+    Variables:  q_sj = grams of food j bought at store s   (continuous,
+                                                             only where s sells j)
+                z_s  = 1 if store s is visited              (binary)
+
+    min   sum_sj price_sj * q_sj + sum_s visit_s * z_s
+    s.t.  min <= A @ (sum_s q_s) <= max      (nutrients of everything bought)
+          sum_s q_sj <= max_grams            (per-food cap, across stores)
+          q_sj <= max_grams * z_s            (buy only where you go)
+
+The linking rows are disaggregated - one per (store, food) pair rather
+than one per store - which keeps the LP relaxation tight, so HiGHS
+proves optimality after a handful of branch-and-bound nodes even with
+many stores.
+
+Industry Pattern: Fixed-Charge Network Design / Facility Location
+Supply-chain models open a warehouse only if the volume routed through
+it pays for its fixed cost; here the "warehouse" is a grocery store.
+"""
+
+import math
+import time
+import highspy
+import numpy as np
+from scipy import sparse
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from loguru import logger
+
+from ..ingestion.models import KrogerProduct, USDAFood
+from .nutrient_matrix import NutrientMatrix, GRAMS_PER_POUND
+from .multi_day import Targets, target_bounds
+from .packages import packages_from_products
+from .solution import MIN_QUANTITY_GRAMS, build_result
+from .solvers import FEASIBLE_SOLUTION, LpArrays, SolverOptions, apply_highs_options, pass_lp
+
+
+def prices_from_products(products: Dict[str, List[KrogerProduct]]) -> Dict[str, float]:
+    """
+    Price per pound per food from one store's matched Kroger products
+
+    The cheapest per-pound package wins; products without a usable size
+    are skipped (see packages_from_products).
+
+    Args:
+        products: food_key -> Kroger products matched at one store
+
+    Returns:
+        food_key -> dollars per pound (foods with no usable product are left out)
+    """
+
+    prices: Dict[str, float] = {}
+    for package in packages_from_products(products):
+        per_pound = package.price / package.package_grams * GRAMS_PER_POUND
+        prices[package.food_key] = min(prices.get(package.food_key, math.inf), per_pound)
+    return prices
+
+
+class MultiStoreProblem:
+    """
+    Cheapest plan across several stores, paying a fixed cost per store visited
+
+    Example:
+        >>> store_prices = {loc: prices_from_products(found) for loc, found in products.items()}
+        >>> problem = MultiStoreProblem(foods, store_prices, list(targets), visit_costs=4.0)
+        >>> result = problem.solve(targets)
+        >>> for location, stop in result["stores"].items():
+        ...     print(location, stop["subtotal"], list(stop["foods"]))
+    """
+
+    def __init__(
+        self,
+        foods: Dict[str, USDAFood],
+        store_prices: Dict[str, Dict[str, float]],
+        nutrient_names: Sequence[str],
+        visit_costs: Union[float, Dict[str, float]] = 5.0,
+        max_quantity_per_food: float = 1000.0,
+        options: Optional[SolverOptions] = None
+    ):
+        """
+        Build the MILP
+
+        Args:
+            foods: Dict mapping food_key -> USDAFood
+            store_prices: location_id -> food_key -> price per pound at that
+                          store (a food a store does not sell is simply missing)
+            nutrient_names: Every nutrient that may be targeted
+            visit_costs: Fixed cost of visiting a store - one number for
+                         every store, or location_id -> dollars
+            max_quantity_per_food: Max grams of any single food (all stores together)
+            options: Solver settings (time_limit bounds the search)
+        """
+
+        if not store_prices:
+            raise ValueError("At least one store is needed")
+
+        start = time.perf_counter()
+
+        self.locations = list(store_prices)
+        sold = {key for prices in store_prices.values() for key, price in prices.items() if price > 0}
+        food_keys = [key for key in foods if key in sold]
+        if not food_keys:
+            raise ValueError("No store sells any of the given foods")
+
+        self.foods = {key: foods[key] for key in food_keys}
+        self.matrix = NutrientMatrix.from_foods(self.foods, nutrient_names, sparse=True)
+        self.max_quantity_per_food = max_quantity_per_food
+
+        # Purchase columns, store-major: (store index, food index, $/gram)
+        column = {key: j for j, key in enumerate(self.matrix.food_keys)}
+        stores, food_index, costs = [], [], []
+        for s, location in enumerate(self.locations):
+            for key, price in store_prices[location].items():
+                if price > 0 and key in column:
+                    stores.append(s)
+                    food_index.append(column[key])
+                    costs.append(price / GRAMS_PER_POUND)
+
+        self.column_store = np.array(stores, dtype=np.int64)
+        self.column_food = np.array(food_index, dtype=np.int64)
+        self.column_costs = np.array(costs)
+        self.visit_costs = np.array([
+            visit_costs.get(location, 0.0) if isinstance(visit_costs, dict) else visit_costs
+            for location in self.locations
+        ], dtype=float)
+
+        num_columns = len(costs)
+        num_stores = len(self.locations)
+        num_foods = self.matrix.num_foods
+        num_rows = self.matrix.num_nutrients
+        columns = np.arange(num_columns)
+
+        # q -> grams per food, and q -> store
+        to_food = sparse.csr_matrix((np.ones(num_columns), (self.column_food, columns)), shape=(num_foods, num_columns))
+        to_store = sparse.csr_matrix((np.ones(num_columns), (columns, self.column_store)), shape=(num_columns, num_stores))
+
+        a_matrix = sparse.bmat([
+            [self.matrix.per_gram_sparse() @ to_food, None],
+            [to_food, None],
+            [sparse.identity(num_columns, format="csr"), -max_quantity_per_food * to_store],
+            [None, sparse.csr_matrix(np.ones((1, num_stores)))],
+        ], format="csc")
+
+        free = np.full(num_rows, highspy.kHighsInf)
+        lp = LpArrays(
+            col_cost=np.concatenate([self.column_costs, self.visit_costs]),
+            col_lower=np.zeros(num_columns + num_stores),
+            col_upper=np.concatenate([np.full(num_columns, max_quantity_per_food), np.ones(num_stores)]),
+            row_lower=np.concatenate([-free, np.full(num_foods + num_columns + 1, -highspy.kHighsInf)]),
+            row_upper=np.concatenate([
+                free, np.full(num_foods, max_quantity_per_food), np.zeros(num_columns), [num_stores]
+            ]),
+            a_matrix=a_matrix
+        )
+
+        integrality = np.zeros(num_columns + num_stores, dtype=np.int32)
+        integrality[num_columns:] = int(highspy.HighsVarType.kInteger)
+
+        self._num_columns = num_columns
+        self._store_columns = np.arange(num_columns, num_columns + num_stores, dtype=np.int32)
+        self._visit_row = num_rows + num_foods + num_columns
+
+        self.highs = highspy.Highs()
+        apply_highs_options(self.highs, options or SolverOptions(name="highs", time_limit=10))
+        pass_lp(self.highs, lp, integrality)
+
+        self.build_time = time.perf_counter() - start
+        self.last_stats: Dict = {}
+
+        logger.info(
+            f"Multi-store problem: {num_stores} stores, {num_foods} foods, "
+            f"{num_columns} store-food columns, built in {self.build_time * 1000:.1f}ms"
+        )
+
+    def _set_stores(self, lower: np.ndarray, upper: np.ndarray):
+        self.highs.changeColsBounds(len(self._store_columns), self._store_columns, lower, upper)
+
+    def _set_store_type(self, store_type: highspy.HighsVarType):
+        self.highs.changeColsIntegrality(
+            len(self._store_columns),
+            self._store_columns,
+            np.full(len(self._store_columns), int(store_type), dtype=np.int32)
+        )
+
+    def _set_max_visits(self, max_visits: int):
+        self.highs.changeRowBounds(self._visit_row, -highspy.kHighsInf, float(max_visits))
+
+    def _screen(self, candidates: np.ndarray) -> Tuple[float, Optional[np.ndarray], float, int]:
+        """
+        LP bounds before branching (store variables fixed, so these are LPs)
+
+        - food floor: food cost with every candidate store open - no plan
+          buys its food for less
+        - best single store: a feasible plan, the starting incumbent
+        - a plan visiting k stores costs at least floor + k * cheapest
+          visit, so more than (best - floor) / cheapest visit stores
+          can never pay off
+
+        Returns:
+            (best single-store cost, its solution or None, food floor, max stores)
+        """
+
+        num_stores = len(self.locations)
+        closed = np.zeros(num_stores)
+        self._set_store_type(highspy.HighsVarType.kContinuous)
+
+        try:
+            every = closed.copy()
+            every[candidates] = 1.0
+            self._set_stores(every, every)
+            self.highs.run()
+            if self.highs.getModelStatus() != highspy.HighsModelStatus.kOptimal:
+                return math.inf, None, math.inf, 0
+            food_floor = float(self.highs.getInfo().objective_function_value - self.visit_costs[candidates].sum())
+
+            best_cost, best_solution = math.inf, None
+            for s in candidates:
+                only = closed.copy()
+                only[s] = 1.0
+                self._set_stores(only, only)
+                self.highs.run()
+                if self.highs.getModelStatus() != highspy.HighsModelStatus.kOptimal:
+                    continue
+                cost = self.highs.getInfo().objective_function_value
+                if cost < best_cost:
+                    best_cost = cost
+                    best_solution = np.asarray(self.highs.getSolution().col_value)
+        finally:
+            self._set_store_type(highspy.HighsVarType.kInteger)
+
+        cheapest_visit = self.visit_costs[candidates].min()
+        if best_solution is None or cheapest_visit <= 0:
+            max_stores = len(candidates)
+        else:
+            max_stores = max(1, int((best_cost - food_floor) / cheapest_visit + 1e-9))
+
+        return best_cost, best_solution, food_floor, min(max_stores, len(candidates))
+
+    def solve(
+        self,
+        nutrition_targets: Targets,
+        stores: Optional[Sequence[str]] = None
+    ) -> Optional[Dict]:
+        """
+        Cheapest purchases plus store visits meeting the targets
+
+        Screens first (see _screen): when no second store can pay for its
+        visit, the best single store is the answer and no MILP is solved.
+
+        Args:
+            nutrition_targets: Dict mapping nutrient_name -> (min, max)
+            stores: Only consider these locations (e.g. one store, for comparison)
+
+        Returns:
+            Result dict (total_cost = food + visits; selected_foods[key]
+            has "price" = spend and "stores" = where it is bought) plus
+            "stores" (location -> foods, subtotal, visit_cost),
+            "food_cost", "visit_cost" and "mip" (bound, gap, screening);
+            None if infeasible
+        """
+
+        lower, upper = target_bounds(self.matrix, [nutrition_targets])
+        rows = np.arange(lower.size, dtype=np.int32)
+        self.highs.changeRowsBounds(len(rows), rows, lower.ravel(), upper.ravel())
+
+        candidates = np.arange(len(self.locations))
+        if stores is not None:
+            candidates = np.array([s for s, location in enumerate(self.locations) if location in stores], dtype=np.int64)
+        if len(candidates) == 0:
+            raise ValueError(f"None of {list(stores)} is a known location")
+
+        start = time.perf_counter()
+        best_cost, best_solution, food_floor, max_stores = self._screen(candidates)
+        screen_time = time.perf_counter() - start
+
+        if max_stores == 0:
+            logger.warning("No feasible multi-store plan: targets cannot be met even with every store")
+            return None
+
+        allowed = np.zeros(len(self.locations))
+        allowed[candidates] = 1.0
+
+        if max_stores == 1 and best_solution is not None:
+            # One store is provably enough: the screen already solved it
+            model_status = highspy.HighsModelStatus.kOptimal
+            solution, total_cost, dual_bound, nodes, iterations = best_solution, best_cost, best_cost, 0, 0
+        else:
+            self._set_stores(np.zeros(len(self.locations)), allowed)
+            self._set_max_visits(max_stores)
+            if best_solution is not None:
+                incumbent = highspy.HighsSolution()
+                incumbent.col_value = list(best_solution)
+                self.highs.setSolution(incumbent)
+            self.highs.run()
+
+            # Read everything before reopening stores (any model change clears the solution)
+            model_status = self.highs.getModelStatus()
+            info = self.highs.getInfo()
+            if info.primal_solution_status == FEASIBLE_SOLUTION:
+                solution = np.asarray(self.highs.getSolution().col_value)
+                total_cost = info.objective_function_value
+            else:
+                solution, total_cost = best_solution, best_cost
+            dual_bound = info.mip_dual_bound
+            nodes, iterations = max(info.mip_node_count, 0), max(info.simplex_iteration_count, 0)
+            self._set_max_visits(len(self.locations))
+
+        self._set_stores(np.zeros(len(self.locations)), np.ones(len(self.locations)))
+        solve_time = time.perf_counter() - start
+
+        status = "Optimal" if model_status == highspy.HighsModelStatus.kOptimal else "Feasible"
+
+        self.last_stats = {
+            "solver": "highs",
+            "build_time": self.build_time,
+            "solve_time": solve_time,
+            "iterations": iterations,
+            "status": status,
+        }
+
+        # Any feasible plan counts (time limit); none at all means infeasible
+        if solution is None:
+            logger.warning(f"No feasible multi-store plan: {self.highs.modelStatusToString(model_status)}")
+            return None
+
+        bought = solution[:self._num_columns]
+        opened = np.round(solution[self._num_columns:]) > 0
+
+        grams = np.bincount(self.column_food, weights=bought, minlength=self.matrix.num_foods)
+        dual_bound = max(dual_bound, food_floor + self.visit_costs[candidates].min()) if math.isfinite(dual_bound) else food_floor
+        gap = (total_cost - dual_bound) / total_cost if total_cost > 0 else 0.0
+
+        result = build_result(
+            self.foods, {}, self.matrix, grams, total_cost, nutrition_targets, status
+        )
+
+        spend = bought * self.column_costs
+        visits: Dict[str, Dict] = {}
+        for s in np.flatnonzero(opened):
+            visits[self.locations[s]] = {
+                "foods": {},
+                "subtotal": 0.0,
+                "visit_cost": float(self.visit_costs[s]),
+            }
+
+        for k in np.flatnonzero(bought > MIN_QUANTITY_GRAMS):
+            location = self.locations[self.column_store[k]]
+            food_key = self.matrix.food_keys[self.column_food[k]]
+            stop = visits[location]
+            stop["foods"][food_key] = float(bought[k])
+            stop["subtotal"] += float(spend[k])
+
+            data = result["selected_foods"].get(food_key)
+            if data is not None:
+                data["price"] += float(spend[k])
+                data.setdefault("stores", []).append(location)
+
+        result["stores"] = visits
+        result["food_cost"] = float(spend.sum())
+        result["visit_cost"] = float(self.visit_costs[opened].sum())
+        result["mip"] = {
+            "objective": total_cost,
+            "dual_bound": dual_bound,
+            "gap": max(gap, 0.0),
+            "nodes": nodes,
+            "status": self.highs.modelStatusToString(model_status),
+            "best_single_store": best_cost,
+            "food_floor": food_floor,
+            "max_stores": max_stores,
+            "screen_time": screen_time,
+        }
+        result["solver_stats"] = dict(self.last_stats)
+
+        logger.info(
+            f"Multi-store plan: ${total_cost:.2f} (food ${result['food_cost']:.2f} + "
+            f"{len(visits)} visit(s) ${result['visit_cost']:.2f}), gap {gap:.2%}, "
+            f"{solve_time * 1000:.0f}ms"
+        )
+
+        return result
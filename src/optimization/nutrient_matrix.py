@@ -0,0 +1,261 @@
+"""
+Nutrient Matrix - Vectorized Problem Data
+
+The PuLP formulation asks every food for every nutrient one at a time
+(`USDAFood.get_nutrient` is a linear scan). That is fine for 30 foods,
+but with thousands of candidates and dozens of nutrients the model
+building dominates wall time - not the solve.
+
+This module assembles the same data ONCE as NumPy arrays:
+- A[i, j] = amount of nutrient i per 100g of food j
+- c[j]    = cost per gram of food j
+
+Industry Pattern: Matrix-Native Modeling
+Production LP pipelines (supply chain, ad allocation) hand solvers
+arrays directly instead of building symbolic expressions term by term.
+"""
+
+import numpy as np
+from scipy import sparse as sp
+from typing import Dict, List, Optional, Sequence, Union
+
+from ..ingestion.models import USDAFood
+
+
+# Prices are quoted per ~1 lb package (same assumption as DietOptimizer)
+GRAMS_PER_POUND = 453.6
+
+
+class NutrientMatrix:
+    """
+    Nutrient matrix for a fixed set of foods and nutrients
+
+    Rows follow `nutrient_names`, columns follow `food_keys`.
+    Values are per 100g, exactly as USDA reports them.
+
+    Storage is dense (NumPy) or sparse (SciPy CSR). A USDA profile has
+    ~85 nutrients, but any one food reports only some of them, so a
+    catalog-wide matrix is mostly zeros. The sparse form is built once
+    per catalog; `select()` then slices out just the targeted rows, and
+    the LP builders hand the CSR data to the solver as-is - build and
+    solve time follow the nonzeros, not foods x nutrients.
+
+    `values` (dense) and `sparse` (CSR) are both always available; the
+    other form is materialized on first use.
+
+    Example:
+        >>> matrix = NutrientMatrix.from_foods(foods, ["Protein", "Energy"])
+        >>> matrix.values.shape
+        (2, 30)
+        >>> catalog = NutrientMatrix.from_foods(foods, sparse=True)  # every nutrient
+        >>> matrix = catalog.select(["Protein", "Calcium, Ca"])
+    """
+
+    def __init__(
+        self,
+        food_keys: List[str],
+        nutrient_names: List[str],
+        values: Union[np.ndarray, sp.spmatrix]
+    ):
+        """
+        Args:
+            food_keys: Column labels (same keys as the foods dict)
+            nutrient_names: Row labels
+            values: Dense array or SciPy sparse matrix of shape
+                    (len(nutrient_names), len(food_keys))
+        """
+        if values.shape != (len(nutrient_names), len(food_keys)):
+            raise ValueError(
+                f"Matrix shape {values.shape} does not match "
+                f"{len(nutrient_names)} nutrients x {len(food_keys)} foods"
+            )
+
+        self.food_keys = food_keys
+        self.nutrient_names = nutrient_names
+
+        if sp.issparse(values):
+            self._sparse: Optional[sp.csr_matrix] = sp.csr_matrix(values, dtype=np.float64)
+            self._dense: Optional[np.ndarray] = None
+        else:
+            self._sparse = None
+            self._dense = values
+
+    @classmethod
+    def from_foods(
+        cls,
+        foods: Dict[str, USDAFood],
+        nutrient_names: Optional[Sequence[str]] = None,
+        sparse: bool = False
+    ) -> "NutrientMatrix":
+        """
+        Build the matrix with a single pass over each food's nutrient list
+
+        Matching is case-insensitive and resolves duplicate names exactly
+        like `USDAFood.get_nutrient` (Energy is kcal, not kJ) - both read
+        the food's cached nutrient index. Missing nutrients are 0.
+
+        Args:
+            foods: Dict mapping food_key -> USDAFood
+            nutrient_names: Nutrients to extract (one row each);
+                            None = every nutrient any food reports,
+                            in order of first appearance
+            sparse: Store as CSR (recommended for catalog-wide matrices)
+
+        Returns:
+            NutrientMatrix with columns in the dict's iteration order
+        """
+
+        collect_all = nutrient_names is None
+        names = [] if collect_all else list(nutrient_names)
+        row_index = {name.lower(): i for i, name in enumerate(names)}
+
+        rows: List[int] = []
+        columns: List[int] = []
+        amounts: List[float] = []
+
+        for j, food in enumerate(foods.values()):
+            for name, nutrient in food.nutrient_index().items():
+                i = row_index.get(name)
+                if i is None:
+                    if not collect_all:
+                        continue
+                    i = row_index[name] = len(names)
+                    names.append(nutrient.name)
+
+                if nutrient.amount != 0:
+                    rows.append(i)
+                    columns.append(j)
+                    amounts.append(nutrient.amount)
+
+        shape = (len(names), len(foods))
+
+        if sparse:
+            values = sp.csr_matrix((amounts, (rows, columns)), shape=shape, dtype=np.float64)
+        else:
+            values = np.zeros(shape)
+            values[rows, columns] = amounts
+
+        return cls(list(foods.keys()), names, values)
+
+    @property
+    def num_foods(self) -> int:
+        return len(self.food_keys)
+
+    @property
+    def num_nutrients(self) -> int:
+        return len(self.nutrient_names)
+
+    @property
+    def is_sparse(self) -> bool:
+        """True if the matrix was built sparse"""
+        return self._dense is None
+
+    @property
+    def values(self) -> np.ndarray:
+        """Dense (nutrients x foods) array"""
+        if self._dense is None:
+            self._dense = self._sparse.toarray()
+        return self._dense
+
+    @property
+    def sparse(self) -> sp.csr_matrix:
+        """CSR (nutrients x foods) matrix"""
+        if self._sparse is None:
+            self._sparse = sp.csr_matrix(self._dense)
+        return self._sparse
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored nonzeros"""
+        return self.sparse.nnz if self.is_sparse else int(np.count_nonzero(self._dense))
+
+    def rows(self, indices: Sequence[int]) -> np.ndarray:
+        """Dense (len(indices) x foods) block of rows"""
+        if self.is_sparse:
+            return self._sparse[list(indices)].toarray()
+        return self._dense[list(indices)]
+
+    def columns(self, indices: Sequence[int]) -> np.ndarray:
+        """Dense (nutrients x len(indices)) block of columns"""
+        if self.is_sparse:
+            return self._sparse.tocsc()[:, indices].toarray()
+        return self._dense[:, indices]
+
+    def select(
+        self,
+        nutrient_names: Sequence[str],
+        food_keys: Optional[Sequence[str]] = None
+    ) -> "NutrientMatrix":
+        """
+        Sub-matrix for some nutrients (and optionally some foods)
+
+        Rows are looked up case-insensitively; a nutrient no food reports
+        becomes an all-zero row. Sparse stays sparse - slicing CSR rows
+        copies only their nonzeros.
+
+        Args:
+            nutrient_names: Rows to keep, in this order
+            food_keys: Columns to keep, in this order (None = all)
+
+        Returns:
+            New NutrientMatrix
+        """
+
+        row_index = {name.lower(): i for i, name in enumerate(self.nutrient_names)}
+        found = [(k, row_index[name.lower()]) for k, name in enumerate(nutrient_names)
+                 if name.lower() in row_index]
+        targets = np.array([k for k, _ in found], dtype=np.int64)
+        sources = np.array([i for _, i in found], dtype=np.int64)
+
+        if food_keys is None:
+            food_keys = self.food_keys
+            columns = None
+        else:
+            column_index = {key: j for j, key in enumerate(self.food_keys)}
+            columns = np.array([column_index[key] for key in food_keys], dtype=np.int64)
+
+        # Selection matrix: picks source rows into target positions
+        picker = sp.csr_matrix(
+            (np.ones(len(found)), (targets, sources)),
+            shape=(len(nutrient_names), self.num_nutrients)
+        )
+
+        if self.is_sparse:
+            values = picker @ self._sparse
+            if columns is not None:
+                values = values.tocsc()[:, columns].tocsr()
+        else:
+            values = np.zeros((len(nutrient_names), self.num_foods))
+            values[targets] = self._dense[sources]
+            if columns is not None:
+                values = values[:, columns]
+
+        return NutrientMatrix(list(food_keys), list(nutrient_names), values)
+
+    def per_gram(self) -> np.ndarray:
+        """Nutrient amounts per gram (solver variables are in grams)"""
+        return self.values / 100.0
+
+    def per_gram_sparse(self) -> sp.csr_matrix:
+        """Nutrient amounts per gram as CSR, without densifying"""
+        return self.sparse / 100.0
+
+
+def cost_per_gram(prices: Dict[str, float], food_keys: Sequence[str]) -> np.ndarray:
+    """
+    Convert package prices to a $/gram cost vector
+
+    Foods without a price cost nothing, matching the PuLP objective
+    which simply leaves them out of the sum.
+
+    Args:
+        prices: Dict mapping food_key -> price per ~1 lb package
+        food_keys: Column order of the nutrient matrix
+
+    Returns:
+        Array of cost per gram, aligned with food_keys
+    """
+    return np.array(
+        [prices.get(key, 0.0) for key in food_keys],
+        dtype=float
+    ) / GRAMS_PER_POUND
@@ -0,0 +1,331 @@
+"""
+Package Purchasing - Whole Packages, Not Grams
+
+The continuous LP buys 137.2 g of chicken at 1/453.6 of the package
+price. The store sells a 1.5 lb tray or a 3 lb family pack, and you pay
+for the whole tray. This module makes package counts integer:
+
+    Variables:  n_p  = packages of product p bought       (integer)
+                y_d  = grams of each food eaten on day d  (continuous)
+
+    min   sum_p price_p * n_p
+    s.t.  min_d <= A @ y_d <= max_d                     (per-day nutrients)
+          sum_d y_d[f] <= sum_{p sells f} grams_p * n_p (eat what you bought)
+
+It is the multi-day block model (multi_day.build_block_lp) with a
+food x package purchase matrix in place of "buy grams".
+
+Fast bounding - MILPs can run away, the app cannot wait:
+1. Solve the LP relaxation          -> lower bound on the true cost
+2. Round every package count UP     -> always feasible (more food only
+                                       loosens the "eat what you bought" rows)
+3. Give that plan to HiGHS as the starting incumbent and branch-and-bound
+   within the time limit
+4. Report the gap between the best plan and the best bound
+
+Industry Pattern: Warm-Started MIP with Guaranteed Incumbent
+Production schedulers always hold a feasible answer before they start
+searching for a better one.
+"""
+
+import math
+import time
+import highspy
+import numpy as np
+from pydantic import BaseModel, Field
+from scipy import sparse
+from typing import Dict, List, Optional, Sequence, Union
+from loguru import logger
+
+from ..ingestion.models import KrogerProduct, USDAFood
+from ..processing.package_size import parse_package_grams
+from .nutrient_matrix import NutrientMatrix
+from .multi_day import Targets, build_block_lp, day_plans, expand_targets, sum_targets, target_bounds
+from .solution import MIN_QUANTITY_GRAMS, build_result
+from .solvers import FEASIBLE_SOLUTION, SolverOptions, apply_highs_options, pass_lp
+
+
+class PackageOption(BaseModel):
+    """One purchasable package of a food"""
+    food_key: str = Field(..., description="Key of the food this package contains")
+    package_grams: float = Field(..., gt=0, description="Grams per package")
+    price: float = Field(..., ge=0, description="Price per package in dollars")
+    product_id: Optional[str] = Field(None, description="Store product ID")
+    description: Optional[str] = Field(None, description="Product name")
+
+
+def packages_from_products(products: Dict[str, List[KrogerProduct]]) -> List[PackageOption]:
+    """
+    Package options from matched Kroger products
+
+    Products whose size cannot be parsed into grams (e.g. "12 ct") are
+    skipped with a warning.
+
+    Args:
+        products: food_key -> Kroger products matched to that food
+
+    Returns:
+        List of PackageOption
+    """
+
+    packages = []
+    skipped = 0
+
+    for food_key, matches in products.items():
+        for product in matches:
+            grams = parse_package_grams(product.size)
+            if grams is None or product.price <= 0:
+                skipped += 1
+                continue
+            packages.append(PackageOption(
+                food_key=food_key,
+                package_grams=grams,
+                price=product.price,
+                product_id=product.product_id,
+                description=product.description
+            ))
+
+    if skipped:
+        logger.warning(f"Skipped {skipped} products without a usable size or price")
+
+    return packages
+
+
+class PackageProblem:
+    """
+    Integer package counts, continuous grams eaten
+
+    Example:
+        >>> problem = PackageProblem(foods, packages, MACROS, num_days=7)
+        >>> result = problem.solve(daily_targets)
+        >>> result["packages"]          # what to put in the cart
+        >>> result["mip"]["gap"]        # how far from proven optimal
+    """
+
+    def __init__(
+        self,
+        foods: Dict[str, USDAFood],
+        packages: Sequence[PackageOption],
+        nutrient_names: Sequence[str],
+        num_days: int = 1,
+        max_quantity_per_food: float = 1000.0,
+        max_packages: int = 20,
+        options: Optional[SolverOptions] = None
+    ):
+        """
+        Build the MILP
+
+        Args:
+            foods: Dict mapping food_key -> USDAFood
+            packages: Purchasable packages (foods without one are left out)
+            nutrient_names: Every nutrient that may be targeted
+            num_days: Planning horizon (1 = single day)
+            max_quantity_per_food: Max grams of any single food on one day
+            max_packages: Max packages of any single product
+            options: Solver settings (time_limit bounds the search)
+        """
+
+        self.packages = [package for package in packages if package.food_key in foods]
+        if not self.packages:
+            raise ValueError("No package matches any of the given foods")
+
+        food_keys = list(dict.fromkeys(package.food_key for package in self.packages))
+        self.foods = {key: foods[key] for key in food_keys}
+        self.num_days = num_days
+
+        start = time.perf_counter()
+
+        self.matrix = NutrientMatrix.from_foods(self.foods, nutrient_names, sparse=True)
+        self.package_prices = np.array([package.price for package in self.packages])
+
+        column = {key: j for j, key in enumerate(self.matrix.food_keys)}
+        self.purchase_matrix = sparse.csr_matrix((
+            [package.package_grams for package in self.packages],
+            ([column[package.food_key] for package in self.packages], np.arange(len(self.packages)))
+        ), shape=(self.matrix.num_foods, len(self.packages)))
+
+        free = np.full((num_days, self.matrix.num_nutrients), highspy.kHighsInf)
+        lp = build_block_lp(
+            self.matrix.per_gram_sparse(),
+            self.package_prices,
+            -free,
+            free,
+            np.full((num_days, self.matrix.num_foods), max_quantity_per_food),
+            purchase_upper=np.full(len(self.packages), float(max_packages)),
+            purchase_matrix=self.purchase_matrix
+        )
+
+        self._num_consumption = num_days * self.matrix.num_foods
+        self._package_columns = np.arange(
+            self._num_consumption, self._num_consumption + len(self.packages), dtype=np.int32
+        )
+
+        self.highs = highspy.Highs()
+        apply_highs_options(self.highs, options or SolverOptions(name="highs", time_limit=10))
+        pass_lp(self.highs, lp, self._integrality(highspy.HighsVarType.kInteger))
+
+        self.build_time = time.perf_counter() - start
+        self.last_stats: Dict = {}
+
+        logger.info(
+            f"Package problem: {len(self.packages)} packages for {self.matrix.num_foods} foods, "
+            f"{num_days} day(s), built in {self.build_time * 1000:.1f}ms"
+        )
+
+    def _integrality(self, package_type: highspy.HighsVarType) -> np.ndarray:
+        """Continuous grams eaten, `package_type` for package counts"""
+        integrality = np.zeros(self._num_consumption + len(self.packages), dtype=np.int32)
+        integrality[self._num_consumption:] = int(package_type)
+        return integrality
+
+    def _set_package_type(self, package_type: highspy.HighsVarType):
+        self.highs.changeColsIntegrality(
+            len(self._package_columns),
+            self._package_columns,
+            np.full(len(self._package_columns), int(package_type), dtype=np.int32)
+        )
+
+    def solve(self, nutrition_targets: Union[Targets, List[Targets]]) -> Optional[Dict]:
+        """
+        Cheapest cart of whole packages meeting the daily targets
+
+        Args:
+            nutrition_targets: Daily targets (one dict, or one per day)
+
+        Returns:
+            Result dict (selected_foods = grams eaten, price = package spend)
+            plus "packages" (the cart), "mip" (bound, rounded start, gap)
+            and, for several days, "days"; None if infeasible
+        """
+
+        daily_targets = expand_targets(nutrition_targets, self.num_days)
+        lower, upper = target_bounds(self.matrix, daily_targets)
+        rows = np.arange(lower.size, dtype=np.int32)
+        self.highs.changeRowsBounds(len(rows), rows, lower.ravel(), upper.ravel())
+
+        start = time.perf_counter()
+
+        # 1. LP relaxation -> lower bound
+        self._set_package_type(highspy.HighsVarType.kContinuous)
+        self.highs.run()
+        if self.highs.getModelStatus() != highspy.HighsModelStatus.kOptimal:
+            self._set_package_type(highspy.HighsVarType.kInteger)
+            logger.warning(f"Package LP relaxation: {self.highs.modelStatusToString(self.highs.getModelStatus())}")
+            return None
+
+        relaxed = np.asarray(self.highs.getSolution().col_value)
+        lp_bound = self.highs.getInfo().objective_function_value
+
+        # 2. Round package counts up -> feasible incumbent
+        rounded = relaxed.copy()
+        rounded[self._num_consumption:] = np.ceil(relaxed[self._num_consumption:] - 1e-9)
+        rounded_cost = float(self.package_prices @ rounded[self._num_consumption:])
+
+        # 3. Branch-and-bound from that incumbent
+        self._set_package_type(highspy.HighsVarType.kInteger)
+        incumbent = highspy.HighsSolution()
+        incumbent.col_value = list(rounded)
+        self.highs.setSolution(incumbent)
+        self.highs.run()
+
+        solve_time = time.perf_counter() - start
+        model_status = self.highs.getModelStatus()
+        info = self.highs.getInfo()
+
+        # Any feasible answer counts; fall back to the rounded start if the
+        # search produced nothing better in time
+        if info.primal_solution_status == FEASIBLE_SOLUTION:
+            solution = np.asarray(self.highs.getSolution().col_value)
+            total_cost = info.objective_function_value
+            dual_bound = info.mip_dual_bound
+        else:
+            solution = rounded
+            total_cost = rounded_cost
+            dual_bound = lp_bound
+
+        if rounded_cost < total_cost:
+            solution, total_cost = rounded, rounded_cost
+
+        dual_bound = max(dual_bound, lp_bound) if math.isfinite(dual_bound) else lp_bound
+        gap = (total_cost - dual_bound) / total_cost if total_cost > 0 else 0.0
+        status = "Optimal" if model_status == highspy.HighsModelStatus.kOptimal else "Feasible"
+
+        self.last_stats = {
+            "solver": "highs",
+            "build_time": self.build_time,
+            "solve_time": solve_time,
+            "iterations": max(info.simplex_iteration_count, 0),
+            "status": status,
+        }
+
+        logger.info(
+            f"Package MILP: ${total_cost:.2f} (LP bound ${lp_bound:.2f}, rounded ${rounded_cost:.2f}, "
+            f"gap {gap:.2%}) in {solve_time * 1000:.0f}ms"
+        )
+
+        return self._build_result(
+            solution, total_cost, daily_targets, status,
+            {
+                "lp_bound": lp_bound,
+                "rounded_cost": rounded_cost,
+                "objective": total_cost,
+                "dual_bound": dual_bound,
+                "gap": max(gap, 0.0),
+                "nodes": max(info.mip_node_count, 0),
+                "status": self.highs.modelStatusToString(model_status),
+            }
+        )
+
+    def _build_result(
+        self,
+        solution: np.ndarray,
+        total_cost: float,
+        daily_targets: List[Targets],
+        status: str,
+        mip: Dict
+    ) -> Dict:
+        """Result dict in the optimizer's usual shape, plus the cart"""
+
+        eaten = solution[:self._num_consumption].reshape(self.num_days, self.matrix.num_foods)
+        counts = np.round(solution[self._num_consumption:]).astype(int)
+
+        result = build_result(
+            self.foods, {}, self.matrix, eaten.sum(axis=0), total_cost,
+            sum_targets(daily_targets), status
+        )
+
+        spend: Dict[str, float] = {}
+        cart = []
+        for package, count in zip(self.packages, counts):
+            if count <= 0:
+                continue
+            spend[package.food_key] = spend.get(package.food_key, 0.0) + count * package.price
+            cart.append({
+                "food_key": package.food_key,
+                "product_id": package.product_id,
+                "description": package.description,
+                "count": int(count),
+                "package_grams": package.package_grams,
+                "price": package.price,
+                "total_price": float(count * package.price),
+            })
+
+        for food_key, data in result["selected_foods"].items():
+            data["price"] = spend.get(food_key, 0.0)
+
+        purchased = self.purchase_matrix @ counts
+        result["leftover_grams"] = {
+            key: float(purchased[j] - eaten[:, j].sum())
+            for j, key in enumerate(self.matrix.food_keys)
+            if purchased[j] - eaten[:, j].sum() > MIN_QUANTITY_GRAMS
+        }
+        result["packages"] = cart
+        result["mip"] = mip
+        result["solver_stats"] = dict(self.last_stats)
+
+        if self.num_days > 1:
+            result["num_days"] = self.num_days
+            result["daily_targets"] = daily_targets
+            result["days"] = day_plans(self.matrix, eaten, daily_targets)
+
+        return result
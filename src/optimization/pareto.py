@@ -0,0 +1,256 @@
+"""
+Pareto Sweep - What Does Each Gram of Protein Cost?
+
+Users ask "how much cheaper if I accept 10 g less protein?". The answer
+is a curve, not a number: the minimum cost at every level of one target
+(or, the other way round, the most of one nutrient at every budget).
+
+A sweep walks a grid of levels and re-solves the same compiled model at
+each point. Neighbouring points have nearly the same optimal basis, so
+each re-solve warm-starts from the previous one and needs only a few
+simplex pivots. With several workers the grid is split into contiguous
+chunks - one per process - so every worker still walks neighbours.
+
+The result is a tidy table (one row per grid point) ready to plot.
+
+Industry Pattern: Sensitivity Analysis / Efficient Frontier
+Portfolio optimization plots risk vs return the same way; here it is
+cost vs nutrition.
+"""
+
+import os
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple
+from loguru import logger
+
+from .nutrient_matrix import NutrientMatrix
+from .compiled_problem import CompiledDietProblem
+from .batch import solve_chunks
+from .solution import MIN_QUANTITY_GRAMS
+from .solvers import SolverOptions
+
+
+# Below this many points per worker, process start-up costs more than it saves
+MIN_POINTS_PER_WORKER = 16
+
+FRONTIER_COLUMNS = [
+    "mode", "nutrient", "level", "status", "total_cost", "nutrient_amount",
+    "marginal_cost", "num_foods", "solve_time", "iterations",
+]
+
+
+class ParetoSweep:
+    """
+    Cost-vs-nutrition trade-off curves over a compiled problem
+
+    Example:
+        >>> sweep = DietOptimizer().pareto_sweep(foods, prices, targets)
+        >>> frontier = sweep.over_target("Protein", np.linspace(100, 180, 50))
+        >>> frontier[["level", "total_cost", "marginal_cost"]]
+        >>> frontier = sweep.over_budget("Protein", [3, 4, 5, 6, 8])
+    """
+
+    def __init__(
+        self,
+        problem: CompiledDietProblem,
+        nutrition_targets: Dict[str, Tuple[float, float]],
+        workers: Optional[int] = None,
+        options: Optional[SolverOptions] = None
+    ):
+        """
+        Args:
+            problem: Compiled problem (rows must include every swept nutrient)
+            nutrition_targets: Targets held fixed while one nutrient is swept
+            workers: Processes for large grids (None = CPU count, 1 = in-process)
+            options: HiGHS settings for worker processes
+        """
+
+        self.problem = problem
+        self.nutrition_targets = dict(nutrition_targets)
+        self.workers = workers or os.cpu_count() or 1
+        self.options = options or SolverOptions(name="highs")
+        self.last_stats: Dict = {}
+
+    @property
+    def matrix(self) -> NutrientMatrix:
+        return self.problem.matrix
+
+    def over_target(
+        self,
+        nutrient_name: str,
+        levels: Sequence[float],
+        bound: str = "min"
+    ) -> pd.DataFrame:
+        """
+        Minimum cost at each level of one target, other targets fixed
+
+        Args:
+            nutrient_name: Nutrient to sweep (e.g. "Protein")
+            levels: Values for that nutrient's bound
+            bound: "min" to sweep the lower bound, "max" for the upper bound
+
+        Returns:
+            Frontier table (see FRONTIER_COLUMNS), sorted by level;
+            marginal_cost is dollars per extra unit of the nutrient
+        """
+
+        if bound not in ("min", "max"):
+            raise ValueError(f"bound must be 'min' or 'max', got '{bound}'")
+
+        min_amount, max_amount = self.nutrition_targets.get(nutrient_name, (None, None))
+
+        points = []
+        for level in sorted(levels):
+            targets = dict(self.nutrition_targets)
+            targets[nutrient_name] = (level, max_amount) if bound == "min" else (min_amount, level)
+            points.append((targets, None))
+
+        rows = self._run(points, objective=None)
+        return self._frontier("target", nutrient_name, sorted(levels), rows)
+
+    def over_budget(
+        self,
+        nutrient_name: str,
+        budgets: Sequence[float]
+    ) -> pd.DataFrame:
+        """
+        Most of one nutrient at each budget cap, other targets fixed
+
+        The nutrient's own minimum is dropped (it is being maximized);
+        its maximum, if any, still applies.
+
+        Args:
+            nutrient_name: Nutrient to maximize
+            budgets: Total cost caps in dollars
+
+        Returns:
+            Frontier table (see FRONTIER_COLUMNS), sorted by budget
+        """
+
+        targets = dict(self.nutrition_targets)
+        _, max_amount = targets.pop(nutrient_name, (None, None))
+        if max_amount is not None:
+            targets[nutrient_name] = (None, max_amount)
+
+        points = [(targets, budget) for budget in sorted(budgets)]
+
+        rows = self._run(points, objective=nutrient_name)
+        return self._frontier("budget", nutrient_name, sorted(budgets), rows)
+
+    def _run(
+        self,
+        points: List[Tuple[Dict, Optional[float]]],
+        objective: Optional[str]
+    ) -> List[Tuple]:
+        """Solve grid points in order; returns one tuple per point, in order"""
+
+        workers = max(1, min(self.workers, len(points) // MIN_POINTS_PER_WORKER))
+        start = time.perf_counter()
+
+        if workers == 1:
+            rows = self._run_here(points, objective)
+        else:
+            tasks = [(index, targets, budget) for index, (targets, budget) in enumerate(points)]
+            chunks = [list(chunk) for chunk in _split(tasks, workers)]
+            rows = solve_chunks(
+                self.matrix, self.problem.costs, chunks,
+                self.problem.max_quantity_per_food, self.options, objective
+            )
+            rows.sort(key=lambda row: row[0])
+
+        elapsed = time.perf_counter() - start
+        self.last_stats = {
+            "points": len(points),
+            "seconds": elapsed,
+            "points_per_second": len(points) / elapsed if elapsed > 0 else 0.0,
+            "workers": workers,
+        }
+
+        logger.info(
+            f"Pareto sweep: {len(points)} points in {elapsed:.2f}s "
+            f"({workers} worker{'s' if workers > 1 else ''})"
+        )
+
+        return rows
+
+    def _run_here(
+        self,
+        points: List[Tuple[Dict, Optional[float]]],
+        objective: Optional[str]
+    ) -> List[Tuple]:
+        """Walk the grid on the caller's compiled problem (warm from its last basis)"""
+
+        rows = []
+        previous_objective = self.problem.objective_nutrient
+        self.problem.set_objective(objective)
+
+        try:
+            for index, (targets, budget) in enumerate(points):
+                status, quantities, total_cost = self.problem.solve_vector(targets, budget)
+                stats = dict(self.problem.last_stats)
+
+                if quantities is None:
+                    rows.append((index, status, np.empty(0, dtype=np.int64), np.empty(0), None, stats))
+                    continue
+
+                selected = np.flatnonzero(quantities > MIN_QUANTITY_GRAMS)
+                rows.append((index, status, selected, quantities[selected], total_cost, stats))
+        finally:
+            self.problem.set_objective(previous_objective)
+
+        return rows
+
+    def _frontier(
+        self,
+        mode: str,
+        nutrient_name: str,
+        levels: List[float],
+        rows: List[Tuple]
+    ) -> pd.DataFrame:
+        """Turn raw point results into the tidy frontier table"""
+
+        nutrient_row = self.matrix.rows([
+            [name.lower() for name in self.matrix.nutrient_names].index(nutrient_name.lower())
+        ])[0] / 100.0
+
+        records = []
+        for level, (_, status, selected, grams, total_cost, stats) in zip(levels, rows):
+            records.append({
+                "mode": mode,
+                "nutrient": nutrient_name,
+                "level": level,
+                "status": status,
+                "total_cost": total_cost if total_cost is not None else np.nan,
+                "nutrient_amount": float(nutrient_row[selected] @ grams) if total_cost is not None else np.nan,
+                "marginal_cost": np.nan,
+                "num_foods": len(selected),
+                "solve_time": stats.get("solve_time"),
+                "iterations": stats.get("iterations"),
+            })
+
+        frontier = pd.DataFrame.from_records(records, columns=FRONTIER_COLUMNS)
+
+        # Dollars per extra unit of the nutrient along the feasible part
+        feasible = (frontier["status"] == "Optimal").to_numpy()
+        levels_feasible = frontier.loc[feasible, "level"].to_numpy(dtype=float)
+
+        if feasible.sum() >= 2 and np.all(np.diff(levels_feasible) > 0):
+            if mode == "target":
+                costs = frontier.loc[feasible, "total_cost"].to_numpy(dtype=float)
+                marginal = np.gradient(costs, levels_feasible)
+            else:
+                # Extra nutrient per extra dollar, inverted; no gain -> NaN
+                amounts = frontier.loc[feasible, "nutrient_amount"].to_numpy(dtype=float)
+                gain = np.gradient(amounts, levels_feasible)
+                marginal = np.where(gain > 1e-9, 1.0 / np.maximum(gain, 1e-9), np.nan)
+            frontier.loc[feasible, "marginal_cost"] = marginal
+
+        return frontier
+
+
+def _split(items: List, parts: int) -> List[List]:
+    """Split a list into `parts` contiguous, nearly equal chunks"""
+    bounds = np.linspace(0, len(items), parts + 1).astype(int)
+    return [items[a:b] for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
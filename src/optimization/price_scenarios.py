@@ -0,0 +1,252 @@
+"""
+Price Scenarios - How Much Could This Plan Really Cost?
+
+A plan is optimized against one snapshot of prices, but store prices
+move week to week (and the app's demo prices are random draws to begin
+with). The plan's cost is a point estimate; this module turns it into
+a distribution.
+
+1. SAMPLE: thousands of price vectors as ONE (scenarios x foods) array.
+   Each price is multiplied by a lognormal factor with mean 1; part of
+   the shock is shared by every food (a market-wide move), the rest is
+   food-specific
+2. EVALUATE: the fixed plan's cost in every scenario is one
+   matrix-vector product - 10,000 scenarios in milliseconds
+3. REGRET: a random subsample is re-optimized in a process pool (one
+   resident model per worker, only the objective changes). Regret =
+   what the fixed plan costs minus what the best plan for those prices
+   would have cost
+4. STABILITY: share of re-optimized scenarios in which each selected
+   food is still part of the optimal plan
+
+Industry Pattern: Monte Carlo Risk Analysis
+Portfolio desks price one book under thousands of simulated markets
+with a single matrix product; full re-optimization is reserved for a
+sample.
+"""
+
+import os
+import time
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from loguru import logger
+
+from .compiled_problem import CompiledDietProblem
+from .batch import solve_cost_scenarios
+from .nutrient_matrix import GRAMS_PER_POUND
+from .solution import MIN_QUANTITY_GRAMS
+
+
+# Percentiles reported for plan cost and regret
+PERCENTILES = (5, 25, 50, 75, 95, 99)
+
+
+def sample_price_scenarios(
+    base_prices: np.ndarray,
+    num_scenarios: int = 10000,
+    volatility: float = 0.15,
+    market_correlation: float = 0.3,
+    seed: Optional[int] = None
+) -> np.ndarray:
+    """
+    Random price vectors around the current prices
+
+    price_sj = base_j * exp(sigma * z_sj - sigma^2 / 2), with
+    z_sj = sqrt(rho) * market_s + sqrt(1 - rho) * noise_sj, so every
+    price keeps its mean and any two prices correlate by rho.
+
+    Args:
+        base_prices: Current price per food (any unit - the output keeps it)
+        num_scenarios: Rows to sample
+        volatility: Standard deviation of log price (0.15 = roughly +/-15%)
+        market_correlation: Share of the shock common to all foods (0-1)
+        seed: RNG seed for reproducible scenarios
+
+    Returns:
+        (num_scenarios x foods) float64 array
+    """
+
+    rng = np.random.default_rng(seed)
+    base_prices = np.asarray(base_prices, dtype=np.float64)
+
+    shocks = rng.standard_normal((num_scenarios, len(base_prices)))
+    shocks *= np.sqrt(1.0 - market_correlation)
+    shocks += np.sqrt(market_correlation) * rng.standard_normal((num_scenarios, 1))
+
+    # In place: one (scenarios x foods) buffer for the whole computation
+    shocks *= volatility
+    shocks -= volatility ** 2 / 2
+    np.exp(shocks, out=shocks)
+    shocks *= base_prices
+    return shocks
+
+
+def _solve_in_process(
+    problem: CompiledDietProblem,
+    cost_scenarios: np.ndarray,
+    nutrition_targets: Dict[str, Tuple[Optional[float], Optional[float]]]
+) -> List[Tuple]:
+    """Same as batch.solve_cost_scenarios, on the caller's model (restored afterwards)"""
+
+    previous_objective = problem.objective_nutrient
+    points = []
+
+    try:
+        for index, costs in enumerate(cost_scenarios):
+            problem.set_objective_weights(costs)
+            status, quantities, _ = problem.solve_vector(nutrition_targets)
+            if quantities is None:
+                points.append((index, status, np.empty(0, dtype=np.int64), None))
+                continue
+            selected = np.flatnonzero(quantities > MIN_QUANTITY_GRAMS)
+            points.append((index, status, selected, float(costs @ quantities)))
+    finally:
+        problem.set_objective(previous_objective)
+
+    return points
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    points = np.percentile(values, PERCENTILES)
+    return {f"p{p}": float(v) for p, v in zip(PERCENTILES, points)}
+
+
+def price_risk(
+    problem: CompiledDietProblem,
+    nutrition_targets: Dict[str, Tuple[Optional[float], Optional[float]]],
+    quantities: Optional[np.ndarray] = None,
+    num_scenarios: int = 10000,
+    volatility: float = 0.15,
+    market_correlation: float = 0.3,
+    regret_samples: int = 200,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None
+) -> Optional[Dict]:
+    """
+    Cost distribution, regret and per-food stability of one plan
+
+    Args:
+        problem: Compiled problem for the plan's foods and prices
+        nutrition_targets: Targets the plan was optimized for
+        quantities: Grams per food of the plan (default: solve for it)
+        num_scenarios: Price scenarios for the cost distribution
+        volatility: Standard deviation of log price
+        market_correlation: Share of the price shock common to all foods
+        regret_samples: Scenarios re-optimized for regret (0 = skip)
+        workers: Processes for the re-optimizations (None = CPU count,
+                 1 = in-process on `problem`)
+        seed: RNG seed
+
+    Returns:
+        Dict with plan_cost (mean, std, p5..p99), regret (mean, max,
+        percentiles, mean_percent), foods (food_key -> stability and
+        cost p5/p95) and timings; None if the targets are infeasible
+
+    Example:
+        >>> risk = price_risk(problem, targets, num_scenarios=10000)
+        >>> risk["plan_cost"]["p95"], risk["foods"]["oats"]["stability"]
+        (9.84, 0.93)
+    """
+
+    start = time.perf_counter()
+
+    if quantities is None:
+        status, quantities, _ = problem.solve_vector(nutrition_targets)
+        if status != "Optimal":
+            logger.warning(f"No plan to analyze: {status}")
+            return None
+
+    package_prices = problem.costs * GRAMS_PER_POUND
+    scenarios = sample_price_scenarios(
+        package_prices, num_scenarios, volatility, market_correlation, seed
+    )
+    sample_time = time.perf_counter() - start
+
+    # The fixed plan under every scenario: ONE matrix-vector product
+    start = time.perf_counter()
+    pounds = quantities / GRAMS_PER_POUND
+    plan_costs = scenarios @ pounds
+    selected = np.flatnonzero(quantities > MIN_QUANTITY_GRAMS)
+    line_costs = scenarios[:, selected] * pounds[selected]
+    evaluate_time = time.perf_counter() - start
+
+    report = {
+        "scenarios": num_scenarios,
+        "volatility": volatility,
+        "market_correlation": market_correlation,
+        "base_cost": float(problem.costs @ quantities),
+        "plan_cost": {
+            "mean": float(plan_costs.mean()),
+            "std": float(plan_costs.std()),
+            **_percentiles(plan_costs),
+        },
+        "foods": {
+            problem.matrix.food_keys[j]: {
+                "stability": None,
+                "cost_p5": float(p5),
+                "cost_p95": float(p95),
+            }
+            for j, p5, p95 in zip(
+                selected,
+                np.percentile(line_costs, 5, axis=0),
+                np.percentile(line_costs, 95, axis=0)
+            )
+        },
+        "regret": None,
+    }
+
+    # Regret: re-optimize a subsample, one resident model per worker
+    start = time.perf_counter()
+    if regret_samples > 0:
+        rng = np.random.default_rng(None if seed is None else seed + 1)
+        sample = rng.choice(num_scenarios, size=min(regret_samples, num_scenarios), replace=False)
+
+        cost_scenarios = scenarios[sample] / GRAMS_PER_POUND
+        workers = workers or os.cpu_count() or 1
+
+        if workers == 1:
+            points = _solve_in_process(problem, cost_scenarios, nutrition_targets)
+        else:
+            points = solve_cost_scenarios(
+                problem.matrix,
+                cost_scenarios,
+                nutrition_targets,
+                workers,
+                problem.max_quantity_per_food,
+                problem.options
+            )
+
+        solved = [(sample[index], chosen, cost) for index, status, chosen, cost in points if status == "Optimal"]
+        if solved:
+            regret = np.array([plan_costs[s] - cost for s, _, cost in solved])
+            regret_percent = regret / np.array([cost for _, _, cost in solved])
+
+            kept = np.zeros(problem.matrix.num_foods)
+            for _, chosen, _ in solved:
+                kept[chosen] += 1
+            for j in selected:
+                report["foods"][problem.matrix.food_keys[j]]["stability"] = float(kept[j] / len(solved))
+
+            report["regret"] = {
+                "samples": len(solved),
+                "mean": float(regret.mean()),
+                "max": float(regret.max()),
+                "mean_percent": float(regret_percent.mean()),
+                **_percentiles(regret),
+            }
+    regret_time = time.perf_counter() - start
+
+    report["timings"] = {
+        "sample": sample_time,
+        "evaluate": evaluate_time,
+        "regret": regret_time,
+    }
+
+    logger.info(
+        f"Price risk: {num_scenarios} scenarios, cost p5-p95 "
+        f"${report['plan_cost']['p5']:.2f}-${report['plan_cost']['p95']:.2f} "
+        f"(sample {sample_time * 1000:.0f}ms, evaluate {evaluate_time * 1000:.0f}ms, "
+        f"regret {regret_time:.1f}s)"
+    )
+
+    return report
@@ -0,0 +1,256 @@
+"""
+Result Cache - Same Problem, Same Answer, No Solve
+
+The app's presets ("Weight Loss", "Maintenance", ...) are optimized over
+and over against the same category selections. An LP with identical
+data has an identical optimum, so the second solve is pure waste.
+
+Cache key = a canonical FINGERPRINT of everything the optimum depends on:
+food IDs, prices, per-food bounds and targets (order-independent, exact
+float values). Two tiers:
+
+1. In-process LRU (OrderedDict) - microseconds, lost on restart
+2. SQLite (the result_cache table of NutritionCache) - milliseconds,
+   shared across sessions and restarts
+
+Results are stored compactly: foods as keys and grams, never as full
+USDAFood records. On a hit the result is rehydrated against the caller's
+foods dict - a dict lookup per selected food, no parsing of nutrients.
+
+Industry Pattern: Memoization with a Content-Addressed Key
+Build systems and query engines cache by a hash of the inputs, so
+invalidation is automatic: change any input and the key changes.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+from loguru import logger
+
+from ..database.cache import NutritionCache
+from ..ingestion.models import USDAFood
+
+
+# Result fields holding (min, max) targets; JSON turns tuples into lists
+_TARGET_FIELDS = ("targets",)
+_TARGET_LIST_FIELDS = ("daily_targets",)
+
+
+def problem_fingerprint(
+    foods: Dict[str, USDAFood],
+    prices: Dict[str, float],
+    nutrition_targets: Any,
+    **params
+) -> str:
+    """
+    Stable hash of an optimization problem
+
+    Independent of dict order and of nutrient-name case; exact for floats.
+
+    Args:
+        foods: Dict mapping food_key -> USDAFood (identified by key + FDC ID)
+        prices: Dict mapping food_key -> price (only foods in `foods` count)
+        nutrition_targets: Targets dict, or a list of them (one per day)
+        **params: Anything else the optimum depends on
+                  (max_quantity_per_food, num_days, mode, ...)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+
+    def canonical_targets(targets: Dict) -> list:
+        return sorted(
+            [name.lower(), bounds[0], bounds[1]] for name, bounds in targets.items()
+        )
+
+    if isinstance(nutrition_targets, list):
+        targets = [canonical_targets(t) for t in nutrition_targets]
+    else:
+        targets = canonical_targets(nutrition_targets)
+
+    digest = hashlib.sha256()
+
+    # Catalog part: one line per food, sorted by key (repr is exact for floats)
+    digest.update("\n".join(
+        f"{key}\t{foods[key].fdc_id}\t{prices.get(key)!r}" for key in sorted(foods)
+    ).encode())
+
+    digest.update(b"\0")
+    digest.update(json.dumps(
+        {"targets": targets, "params": params},
+        sort_keys=True, separators=(",", ":"), default=str
+    ).encode())
+
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier (memory LRU + optional SQLite) cache of optimization results
+
+    Example:
+        >>> cache = ResultCache(store=NutritionCache())
+        >>> optimizer = DietOptimizer(cache=cache)
+        >>> optimizer.optimize(foods, prices, targets)   # solves
+        >>> optimizer.optimize(foods, prices, targets)   # cache hit
+        >>> cache.stats()["hit_rate"]
+        0.5
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        store: Optional[NutritionCache] = None
+    ):
+        """
+        Args:
+            max_entries: In-process LRU capacity
+            store: NutritionCache for the persistent tier (None = memory only)
+        """
+
+        self.max_entries = max_entries
+        self.store = store
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def get(
+        self,
+        fingerprint: str,
+        foods: Dict[str, USDAFood]
+    ) -> Optional[Dict]:
+        """
+        Look up a result and rehydrate it against `foods`
+
+        Args:
+            fingerprint: Key from problem_fingerprint()
+            foods: The same foods dict the problem was built from
+
+        Returns:
+            Result dict (solver_stats["cache"] says which tier hit),
+            or None on a miss
+        """
+
+        start = time.perf_counter()
+
+        tier = "memory"
+        payload = self._memory.get(fingerprint)
+
+        if payload is None and self.store is not None:
+            tier = "sqlite"
+            payload = self.store.get_result(fingerprint)
+
+        # A food the result needs missing from `foods` (should not happen
+        # with a matching fingerprint) counts as a miss
+        result = self._rehydrate(json.loads(payload), foods) if payload is not None else None
+
+        if result is None:
+            self.misses += 1
+            return None
+
+        if tier == "memory":
+            self._memory.move_to_end(fingerprint)
+            self.memory_hits += 1
+        else:
+            self._remember(fingerprint, payload)
+            self.store_hits += 1
+
+        result["solver_stats"] = {
+            "solver": "cache",
+            "cache": tier,
+            "build_time": 0.0,
+            "solve_time": time.perf_counter() - start,
+            "iterations": 0,
+            "status": result["status"],
+        }
+
+        logger.debug(f"Result cache HIT ({tier}): {fingerprint[:12]}")
+        return result
+
+    def put(self, fingerprint: str, result: Dict):
+        """Store a result in both tiers"""
+
+        payload = json.dumps(self._compact(result), default=_to_json)
+        self._remember(fingerprint, payload)
+
+        if self.store is not None:
+            self.store.store_result(fingerprint, payload)
+
+        self.stores += 1
+
+    def stats(self) -> Dict:
+        """Hit/miss counters"""
+
+        hits = self.memory_hits + self.store_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "sqlite_hits": self.store_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "entries": len(self._memory),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Empty the in-process tier (the SQLite tier is cleared via NutritionCache)"""
+        self._memory.clear()
+
+    def _remember(self, fingerprint: str, payload: str):
+        """Insert into the LRU, evicting the least recently used entry"""
+
+        self._memory[fingerprint] = payload
+        self._memory.move_to_end(fingerprint)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _compact(result: Dict) -> Dict:
+        """Result without USDAFood objects: food_key -> [grams, price]"""
+
+        compact = {key: value for key, value in result.items() if key != "solver_stats"}
+        compact["selected_foods"] = {
+            key: [data["quantity_grams"], data["price"]]
+            for key, data in result["selected_foods"].items()
+        }
+        return compact
+
+    @staticmethod
+    def _rehydrate(compact: Dict, foods: Dict[str, USDAFood]) -> Optional[Dict]:
+        """Put USDAFood references (and target tuples) back"""
+
+        selected_foods = {}
+        for key, (grams, price) in compact["selected_foods"].items():
+            food = foods.get(key)
+            if food is None:
+                return None
+            selected_foods[key] = {"quantity_grams": grams, "food": food, "price": price}
+
+        result = dict(compact)
+        result["selected_foods"] = selected_foods
+
+        for field in _TARGET_FIELDS:
+            if field in result:
+                result[field] = _as_tuples(result[field])
+        for field in _TARGET_LIST_FIELDS:
+            if field in result:
+                result[field] = [_as_tuples(targets) for targets in result[field]]
+
+        return result
+
+
+def _as_tuples(targets: Dict[str, Sequence]) -> Dict:
+    return {name: tuple(bounds) for name, bounds in targets.items()}
+
+
+def _to_json(value: Any) -> Any:
+    """NumPy scalars/arrays and other stragglers"""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
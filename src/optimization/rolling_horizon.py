@@ -0,0 +1,447 @@
+"""
+Rolling Horizon Planning - This Week's Plan Starts From Last Week's Pantry
+
+Re-planning every week from scratch ignores what is still in the
+kitchen: the leftover half bag of rice gets bought again, and the
+spinach that spoils on Wednesday is planned for Friday. The planner
+keeps ONE resident multi-day model and, each week, only changes what
+changed:
+
+    sum_d y_d - x <= pantry                 (linking rows: new supply bounds)
+
+    sum_{d >= t} y_d - [s > t] x <= sum of pantry lots still good after day t
+                                            (one row per lot expiring in the
+                                             horizon, added for this solve)
+
+    y_d = 0 for d >= shelf life s           (fresh purchases spoil too)
+
+x is only what has to be BOUGHT; the cost of food already on hand is
+sunk. Lots are grams of one food with one expiry date. After the solve
+the week is simulated first-expiring-first-out: what is left (and still
+good) becomes next week's pantry, what expires is reported as waste.
+
+Only bounds and a handful of rows change between solves, so every plan
+warm-starts from a REFERENCE basis: the optimum of the first plan this
+planner made, solved once without its expiring lots. Chaining bases from solve to solve looks cheaper but drifts -
+each user's targets and pantry pull it further from a typical plan, and
+iteration counts climb with every solve; the reference stays a few
+hundred pivots from any user's optimum. The pantry is persisted in the
+pantry table of NutritionCache.
+
+Industry Pattern: Rolling Horizon / Model Predictive Control
+Supply-chain planners re-solve the next N periods every period from
+the current inventory, committing only to the first decisions.
+"""
+
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import highspy
+import numpy as np
+from pydantic import BaseModel, Field
+from loguru import logger
+
+from ..database.cache import NutritionCache
+from ..ingestion.models import USDAFood
+from .multi_day import MultiDayProblem, Targets
+from .nutrient_matrix import NutrientMatrix, cost_per_gram
+from .solution import MIN_QUANTITY_GRAMS
+from .solvers import SolverOptions
+
+
+# Days a fresh purchase keeps, by keyword in the USDA food category (first match wins)
+SHELF_LIFE_DAYS: Tuple[Tuple[str, int], ...] = (
+    ("fish", 2),
+    ("shellfish", 2),
+    ("poultry", 3),
+    ("beef", 4),
+    ("pork", 4),
+    ("lamb", 4),
+    ("sausage", 7),
+    ("baked", 5),
+    ("vegetable", 7),
+    ("fruit", 7),
+    ("dairy", 10),
+    ("egg", 21),
+)
+
+# Pantry staples: grains, legumes, nuts, oils, ...
+DEFAULT_SHELF_LIFE_DAYS = 180
+
+
+class PantryItem(BaseModel):
+    """Grams of one food on hand, with one expiry date"""
+    fdc_id: int = Field(..., description="USDA Food Data Central ID")
+    grams: float = Field(..., ge=0, description="Grams on hand")
+    expires_on: Optional[date] = Field(None, description="Last day it is still good (None = keeps)")
+
+
+Pantry = Union[Dict[int, float], Sequence[PantryItem]]
+
+
+def shelf_life(food: USDAFood) -> int:
+    """Days a fresh purchase of `food` keeps (see SHELF_LIFE_DAYS)"""
+
+    category = (food.food_category or "").lower()
+    for keyword, days in SHELF_LIFE_DAYS:
+        if keyword in category:
+            return days
+    return DEFAULT_SHELF_LIFE_DAYS
+
+
+class RollingHorizonPlanner:
+    """
+    Weekly re-plans that buy only what the pantry cannot cover
+
+    Example:
+        >>> planner = RollingHorizonPlanner(foods, prices, list(targets), store=NutritionCache())
+        >>> week1 = planner.plan(targets, user_id="alex", start=date(2026, 1, 5))
+        >>> week2 = planner.plan(targets, user_id="alex", start=date(2026, 1, 12))
+        >>> week2["pantry_used"]        # grams taken from last week's leftovers
+        >>> week2["selected_foods"]     # what to buy this week
+    """
+
+    def __init__(
+        self,
+        foods: Dict[str, USDAFood],
+        prices: Dict[str, float],
+        nutrient_names: Sequence[str],
+        horizon_days: int = 7,
+        max_quantity_per_food: float = 1000.0,
+        max_grams_per_day: Optional[Union[float, Dict[str, float]]] = None,
+        shelf_life_days: Optional[Dict[str, int]] = None,
+        store: Optional[NutritionCache] = None,
+        options: Optional[SolverOptions] = None,
+        matrix: Optional[NutrientMatrix] = None
+    ):
+        """
+        Build the resident model (linked, with an empty pantry)
+
+        Args:
+            foods: Dict mapping food_key -> USDAFood
+            prices: Dict mapping food_key -> price in dollars
+            nutrient_names: Every nutrient that may be targeted
+            horizon_days: Days per plan (one shopping trip)
+            max_quantity_per_food: Max grams of any single food on one day
+            max_grams_per_day: Max-repeat limit (see MultiDayProblem)
+            shelf_life_days: food_key -> days a fresh purchase keeps
+                             (default: by food category, see shelf_life)
+            store: NutritionCache to load/save pantries by user_id
+            options: Solver settings
+            matrix: Prebuilt nutrient matrix of `foods`
+        """
+
+        if matrix is None:
+            matrix = NutrientMatrix.from_foods(foods, nutrient_names, sparse=True)
+
+        self.foods = foods
+        self.store = store
+        self.horizon_days = horizon_days
+        self.problem = MultiDayProblem(
+            matrix, cost_per_gram(prices, matrix.food_keys), horizon_days,
+            max_quantity_per_food, max_grams_per_day, foods, prices, options, supply={}
+        )
+
+        overrides = shelf_life_days or {}
+        self.shelf_life = np.array([
+            overrides.get(key, shelf_life(foods[key])) for key in matrix.food_keys
+        ])
+
+        self._column = {}
+        for j, key in enumerate(matrix.food_keys):
+            self._column.setdefault(foods[key].fdc_id, j)
+
+        # Fresh purchases cannot be eaten after they spoil
+        num_foods = matrix.num_foods
+        self._col_upper = np.asarray(self.problem.highs.getLp().col_upper_)[:horizon_days * num_foods].copy()
+        days = np.arange(horizon_days)[:, None]
+        self._fresh_upper = np.where(days < self.shelf_life[None, :], self._col_upper.reshape(horizon_days, -1), 0.0).ravel()
+        self._set_consumption_upper(self._fresh_upper)
+
+        self._num_rows = self.problem.highs.getNumRow()
+        # Basis every plan starts from (set by the first plan)
+        self._reference: Optional[highspy.HighsBasis] = None
+        self.solves = 0
+
+    def _set_consumption_upper(self, upper: np.ndarray, columns: Optional[np.ndarray] = None):
+        if columns is None:
+            columns = np.arange(len(upper), dtype=np.int32)
+        self.problem.highs.changeColsBounds(len(columns), columns, np.zeros(len(columns)), upper)
+
+    def set_prices(self, prices: Dict[str, float]):
+        """New week's prices (purchase costs only; the model is kept)"""
+
+        matrix = self.problem.matrix
+        costs = cost_per_gram(prices, matrix.food_keys)
+        columns = np.arange(
+            self.horizon_days * matrix.num_foods, (self.horizon_days + 1) * matrix.num_foods, dtype=np.int32
+        )
+        self.problem.highs.changeColsCost(len(columns), columns, costs)
+        self.problem.costs = costs
+        self.problem.prices = prices
+
+    def load_pantry(self, user_id: str) -> List[PantryItem]:
+        """A user's stored pantry (empty without a store)"""
+
+        if self.store is None:
+            return []
+        return [
+            PantryItem(fdc_id=fdc_id, grams=grams,
+                       expires_on=date.fromisoformat(expires_on) if expires_on else None)
+            for fdc_id, grams, expires_on in self.store.get_pantry(user_id)
+        ]
+
+    def save_pantry(self, user_id: str, pantry: Sequence[PantryItem]):
+        if self.store is not None:
+            self.store.store_pantry(user_id, [
+                (item.fdc_id, item.grams, item.expires_on.isoformat() if item.expires_on else None)
+                for item in pantry
+            ])
+
+    def _as_items(self, pantry: Pantry, start: date) -> List[PantryItem]:
+        """Plain grams per fdc_id are taken as fresh (full shelf life from `start`)"""
+
+        if not isinstance(pantry, dict):
+            return list(pantry)
+
+        items = []
+        for fdc_id, grams in pantry.items():
+            j = self._column.get(fdc_id)
+            expires_on = None if j is None else start + timedelta(days=int(self.shelf_life[j]) - 1)
+            items.append(PantryItem(fdc_id=fdc_id, grams=grams, expires_on=expires_on))
+        return items
+
+    def _lots(self, items: Sequence[PantryItem], start: date) -> Tuple[Dict[int, List[List[float]]], List[PantryItem], float]:
+        """
+        Usable lots per column as [days good from start, grams]
+
+        Returns:
+            (lots by column, items for foods outside the catalog - carried
+            over untouched, grams already expired at start)
+        """
+
+        lots: Dict[int, List[List[float]]] = {}
+        outside = []
+        expired = 0.0
+
+        for item in items:
+            j = self._column.get(item.fdc_id)
+            if j is None:
+                outside.append(item)
+                continue
+
+            good_for = np.inf if item.expires_on is None else (item.expires_on - start).days + 1
+            if good_for <= 0:
+                expired += item.grams
+                continue
+            if item.grams > MIN_QUANTITY_GRAMS:
+                lots.setdefault(j, []).append([good_for, item.grams])
+
+        for column_lots in lots.values():
+            column_lots.sort(key=lambda lot: lot[0])
+
+        return lots, outside, expired
+
+    def _perishability(self, lots: Dict[int, List[List[float]]]) -> Tuple[np.ndarray, int]:
+        """
+        Add one suffix row per lot expiring inside the horizon; relax the
+        fresh-purchase bounds where the pantry keeps longer
+
+        Returns:
+            (columns whose bounds were relaxed, rows added)
+        """
+
+        num_foods = self.problem.matrix.num_foods
+        days = self.horizon_days
+        relaxed = []
+
+        starts, indices, values, upper = [], [], [], []
+        for j, column_lots in lots.items():
+            fresh = int(self.shelf_life[j])
+            last = min(max(column_lots[-1][0], fresh), days)
+
+            if last > fresh:
+                relaxed.extend(d * num_foods + j for d in range(fresh, int(last)))
+
+            thresholds = {int(good_for) for good_for, _ in column_lots if good_for < last}
+            if fresh < last:
+                thresholds.add(fresh)
+
+            for t in sorted(thresholds):
+                starts.append(len(indices))
+                indices.extend(d * num_foods + j for d in range(t, int(last)))
+                values.extend([1.0] * (int(last) - t))
+                if fresh > t:
+                    indices.append(days * num_foods + j)
+                    values.append(-1.0)
+                upper.append(sum(grams for good_for, grams in column_lots if good_for > t))
+
+        relaxed = np.array(relaxed, dtype=np.int32)
+        if len(relaxed):
+            self._set_consumption_upper(self._col_upper[relaxed], relaxed)
+
+        if upper:
+            self.problem.highs.addRows(
+                len(upper),
+                np.full(len(upper), -highspy.kHighsInf),
+                np.array(upper),
+                len(indices),
+                np.array(starts, dtype=np.int32),
+                np.array(indices, dtype=np.int32),
+                np.array(values)
+            )
+
+        return relaxed, len(upper)
+
+    def _carry_over(
+        self,
+        lots: Dict[int, List[List[float]]],
+        eaten: np.ndarray,
+        purchased: np.ndarray,
+        start: date
+    ) -> Tuple[List[PantryItem], Dict[str, float], Dict[str, float]]:
+        """
+        Simulate the horizon first-expiring-first-out
+
+        Returns:
+            (pantry at the start of the next horizon, grams taken from the
+            pantry per food, grams that expired per food)
+        """
+
+        food_keys = self.problem.matrix.food_keys
+        days = self.horizon_days
+        touched = set(lots) | set(np.flatnonzero(purchased > MIN_QUANTITY_GRAMS))
+
+        pantry, used, wasted = [], {}, {}
+        for j in sorted(touched):
+            # [good_for, grams, from_pantry]
+            stock = [[good_for, grams, True] for good_for, grams in lots.get(j, [])]
+            if purchased[j] > MIN_QUANTITY_GRAMS:
+                stock.append([float(self.shelf_life[j]), float(purchased[j]), False])
+            stock.sort(key=lambda lot: lot[0])
+
+            taken = spoiled = 0.0
+            for d in range(days):
+                for lot in stock:
+                    if lot[0] <= d and lot[1] > 0:
+                        spoiled += lot[1]
+                        lot[1] = 0.0
+                need = eaten[d, j]
+                for lot in stock:
+                    if need <= 0:
+                        break
+                    bite = min(lot[1], need)
+                    lot[1] -= bite
+                    need -= bite
+                    if lot[2]:
+                        taken += bite
+
+            for good_for, grams, _ in stock:
+                if grams <= MIN_QUANTITY_GRAMS:
+                    continue
+                if good_for <= days:
+                    spoiled += grams
+                    continue
+                pantry.append(PantryItem(
+                    fdc_id=self.foods[food_keys[j]].fdc_id,
+                    grams=grams,
+                    expires_on=None if np.isinf(good_for) else start + timedelta(days=int(good_for) - 1)
+                ))
+
+            if taken > MIN_QUANTITY_GRAMS:
+                used[food_keys[j]] = taken
+            if spoiled > MIN_QUANTITY_GRAMS:
+                wasted[food_keys[j]] = spoiled
+
+        return pantry, used, wasted
+
+    def plan(
+        self,
+        nutrition_targets: Union[Targets, List[Targets]],
+        user_id: Optional[str] = None,
+        pantry: Optional[Pantry] = None,
+        start: Optional[date] = None,
+        save: bool = True
+    ) -> Optional[Dict]:
+        """
+        Cheapest purchases for the next horizon, given what is on hand
+
+        Args:
+            nutrition_targets: Daily targets (one dict, or one per day)
+            user_id: Whose pantry to load (and save afterwards) from the store
+            pantry: Inventory to use instead of the stored one - PantryItems,
+                    or grams per fdc_id (taken as fresh)
+            start: First day of the horizon (default: today)
+            save: Store the pantry left after the horizon under user_id
+
+        Returns:
+            Multi-day result dict (selected_foods = purchases, total_cost =
+            spend) plus "pantry_used", "wasted" (food_key -> grams),
+            "pantry" (PantryItems at next_start) and "next_start";
+            None if infeasible
+        """
+
+        start = start or date.today()
+
+        if pantry is None:
+            pantry = self.load_pantry(user_id) if user_id is not None else []
+        lots, outside, expired = self._lots(self._as_items(pantry, start), start)
+
+        timer = time.perf_counter()
+        matrix = self.problem.matrix
+        supply = np.zeros(matrix.num_foods)
+        for j, column_lots in lots.items():
+            supply[j] = sum(grams for _, grams in column_lots)
+        self.problem.set_supply(supply)
+
+        if self._reference is None:
+            # Once per planner: the optimum without expiring lots is the reference
+            if self.problem.solve(nutrition_targets) is not None:
+                self._reference = self.problem.highs.getBasis()
+        else:
+            self.problem.highs.setBasis(self._reference)
+        relaxed, added = self._perishability(lots)
+        update_time = time.perf_counter() - timer
+
+        try:
+            result = self.problem.solve(nutrition_targets)
+            solution = np.asarray(self.problem.highs.getSolution().col_value)
+        finally:
+            if added:
+                rows = np.arange(self._num_rows, self._num_rows + added, dtype=np.int32)
+                self.problem.highs.deleteRows(added, rows)
+            if len(relaxed):
+                self._set_consumption_upper(self._fresh_upper[relaxed], relaxed)
+
+        self.solves += 1
+
+        if result is None:
+            return None
+
+        num_foods = matrix.num_foods
+        eaten = solution[:self.horizon_days * num_foods].reshape(self.horizon_days, num_foods)
+        purchased = solution[self.horizon_days * num_foods:]
+
+        next_pantry, used, wasted = self._carry_over(lots, eaten, purchased, start)
+        next_pantry.extend(outside)
+
+        result["pantry_used"] = used
+        result["wasted"] = wasted
+        result["expired_before_start"] = expired
+        result["pantry"] = next_pantry
+        result["start"] = start
+        result["next_start"] = start + timedelta(days=self.horizon_days)
+        result["solver_stats"]["build_time"] = update_time
+        result["solver_stats"]["perishability_rows"] = added
+
+        if save and user_id is not None:
+            self.save_pantry(user_id, next_pantry)
+
+        logger.info(
+            f"Rolling plan from {start}: buy ${result['total_cost']:.2f}, "
+            f"{sum(used.values()):.0f}g from pantry, {sum(wasted.values()):.0f}g wasted "
+            f"({result['solver_stats']['iterations']} iterations)"
+        )
+
+        return result
@@ -0,0 +1,367 @@
+"""
+Practical-Quantity Rounding - 137.42 g of Broccoli -> 1.5 Cups
+
+The LP answers in grams to the hundredth. Nobody weighs out 137.42 g
+of broccoli or 2.37 eggs; the shopping list should say "2 eggs" and
+"1 slice of bread". Snapping every food to its nearest practical unit
+is instant, but it can knock a plan out of its targets (round the
+oats down and the protein minimum is missed).
+
+Everything here runs over just the ~10 foods the LP selected:
+
+1. Snap each food to its nearest whole unit
+2. Repair: greedy one-unit moves and swaps, scored all at once with
+   NumPy - first whatever shrinks the target violation most, then
+   whatever saves the most while every target holds (~1 ms)
+3. If that gets stuck (or `polish=True`), a tiny MILP over the same
+   foods, starting from the repaired plan, with a time budget sized to
+   the problem (foods x targets):
+
+    k_j = whole units of food j     (integer, within `window` units of
+                                     the LP amount)
+
+    min   sum_j cost_j * unit_j * k_j
+    s.t.  min <= A @ (unit * k) / 100 <= max
+
+The cost of rounding (rounded plan vs LP optimum) is reported with the
+result - the LP optimum is a lower bound on any rounded plan, so the
+gap is the most a better rounding could still save.
+
+Only a MILP that PROVES the window infeasible means no rounding exists.
+A MILP that runs out of time first has proven nothing: the closest
+repaired plan comes back, flagged with targets_met=False.
+
+Industry Pattern: LP Relaxation + Rounding Heuristic
+Cutting-stock and crew-scheduling systems solve the relaxation over
+the full problem, then fix up integrality on the small support of the
+LP solution instead of branching over everything.
+"""
+
+import re
+import time
+from typing import Dict, Optional, Tuple
+
+import highspy
+import numpy as np
+from pydantic import BaseModel, Field
+from scipy import sparse
+from loguru import logger
+
+from ..ingestion.models import USDAFood
+from .multi_day import target_bounds
+from .nutrient_matrix import NutrientMatrix, GRAMS_PER_POUND
+from .solution import build_result
+from .solvers import FEASIBLE_SOLUTION, LpArrays, SolverOptions, apply_highs_options, pass_lp
+
+
+class PracticalUnit(BaseModel):
+    """A unit a food is bought or eaten in"""
+    name: str = Field(..., description="Unit label (e.g. 'egg', 'slice', 'cup')")
+    grams: float = Field(..., gt=0, description="Grams per unit")
+
+
+# Units by keyword in the USDA description (first match wins, so the
+# more specific keywords come first)
+PRACTICAL_UNITS: Tuple[Tuple[str, PracticalUnit], ...] = (
+    ("peanut butter", PracticalUnit(name="tbsp", grams=16)),
+    ("butter", PracticalUnit(name="tbsp", grams=14)),
+    ("oil", PracticalUnit(name="tbsp", grams=14)),
+    ("egg", PracticalUnit(name="egg", grams=50)),
+    ("banana", PracticalUnit(name="banana", grams=118)),
+    ("apple", PracticalUnit(name="apple", grams=182)),
+    ("orange", PracticalUnit(name="orange", grams=131)),
+    ("potato", PracticalUnit(name="potato", grams=213)),
+    ("bread", PracticalUnit(name="slice", grams=28)),
+    ("tortilla", PracticalUnit(name="tortilla", grams=45)),
+    ("cheese", PracticalUnit(name="slice", grams=28)),
+    ("milk", PracticalUnit(name="cup", grams=244)),
+    ("yogurt", PracticalUnit(name="cup", grams=245)),
+    ("broccoli", PracticalUnit(name="cup", grams=91)),
+    ("oats", PracticalUnit(name="serving", grams=40)),
+    ("rice", PracticalUnit(name="serving", grams=45)),
+    ("pasta", PracticalUnit(name="serving", grams=56)),
+    ("chicken", PracticalUnit(name="serving", grams=113)),
+    ("beef", PracticalUnit(name="serving", grams=113)),
+    ("pork", PracticalUnit(name="serving", grams=113)),
+    ("fish", PracticalUnit(name="serving", grams=113)),
+)
+
+# Everything else is portioned in 25 g steps
+DEFAULT_UNIT = PracticalUnit(name="25 g", grams=25)
+
+# Default MILP budget: seconds per (food x target) entry, clamped. A
+# 10-food, 24-target plan gets ~0.25 s - enough for HiGHS to finish
+# most such MILPs, where 50 ms stopped it before its first incumbent
+MILP_SECONDS_PER_ENTRY = 0.001
+MILP_TIME_LIMIT_RANGE = (0.05, 1.0)
+
+_UNIT_PATTERNS = tuple(
+    (re.compile(rf"\b{re.escape(keyword)}s?\b"), unit) for keyword, unit in PRACTICAL_UNITS
+)
+
+
+def practical_unit(food: USDAFood) -> PracticalUnit:
+    """Unit `food` is portioned in (see PRACTICAL_UNITS)"""
+
+    description = food.description.lower()
+    for pattern, unit in _UNIT_PATTERNS:
+        if pattern.search(description):
+            return unit
+    return DEFAULT_UNIT
+
+
+def milp_time_limit(num_foods: int, num_targets: int) -> float:
+    """Default rounding-MILP time limit in seconds for a plan's size"""
+    low, high = MILP_TIME_LIMIT_RANGE
+    return min(max(MILP_SECONDS_PER_ENTRY * num_foods * num_targets, low), high)
+
+
+def format_quantity(data: Dict) -> str:
+    """
+    Display text for one selected_foods entry
+
+    "3 × egg (150g)" for rounded plans, "137g" otherwise.
+    """
+
+    if "unit" in data:
+        return f"{data['count']} × {data['unit']} ({data['quantity_grams']:.0f}g)"
+    return f"{data['quantity_grams']:.0f}g"
+
+
+def round_quantities(
+    result: Dict,
+    units: Optional[Dict[str, PracticalUnit]] = None,
+    window: int = 2,
+    max_quantity_per_food: Optional[float] = None,
+    polish: bool = False,
+    options: Optional[SolverOptions] = None
+) -> Optional[Dict]:
+    """
+    Snap an LP plan to practical units and repair any target it misses
+
+    Args:
+        result: Single-plan result dict (optimize(), resolve(), ...)
+        units: food_key -> PracticalUnit overrides (default: by
+               description, see practical_unit)
+        window: Units each food may move away from its LP amount
+        max_quantity_per_food: Cap on grams of any single food
+        polish: Also run the MILP when the greedy repair succeeded
+                (a little cheaper; it always runs if the repair got
+                stuck)
+        options: Solver settings for the MILP (default: HiGHS; with no
+                 time_limit the budget follows milp_time_limit() - the
+                 best plan found by then is kept)
+
+    Returns:
+        New result dict with rounded quantities (each selected food also
+        gets "unit" and "count") plus "rounding":
+            {"lp_cost", "cost_increase", "relative_increase",
+             "method" ("nearest", "local search" or "milp"),
+             "targets_met", "nearest_feasible",
+             "mip" ({status, gap, nodes, time_limit} or None),
+             "rounding_time"}
+        targets_met is False only when the MILP stopped (time limit)
+        before finding a rounding - the plan is then the repair's
+        closest attempt and misses some target.
+        None if the MILP proves no rounding within the window meets
+        the targets.
+
+    Raises:
+        ValueError: For multi-day results (the per-day plans would no
+                    longer add up to the rounded purchases)
+
+    Example:
+        >>> result = optimizer.optimize(foods, prices, targets)
+        >>> rounded = round_quantities(result)
+        >>> rounded["selected_foods"]["eggs"]["count"]
+        3
+        >>> rounded["rounding"]["relative_increase"]
+        0.012
+    """
+
+    if "days" in result:
+        raise ValueError("round_quantities works on single-plan results, not multi-day plans")
+
+    start = time.perf_counter()
+
+    selected = result["selected_foods"]
+    targets = result["targets"]
+    units = units or {}
+
+    foods: Dict[str, USDAFood] = {key: data["food"] for key, data in selected.items()}
+    grams = np.array([data["quantity_grams"] for data in selected.values()])
+    costs = np.array([data["price"] for data in selected.values()]) / grams
+    unit_list = [units.get(key) or practical_unit(food) for key, food in foods.items()]
+    unit_grams = np.array([unit.grams for unit in unit_list])
+
+    # Every nutrient of the selected foods; targets are looked up by name
+    catalog = NutrientMatrix.from_foods(foods, sparse=True)
+    matrix = catalog.select(list(targets))
+    lower, upper = (bound[0] for bound in target_bounds(matrix, [targets]))
+    per_unit = (matrix.per_gram_sparse() @ sparse.diags(unit_grams)).tocsc()
+
+    # 1. Nearest unit, then a greedy repair of whatever it broke
+    nearest = np.round(grams / unit_grams)
+    col_lower = np.maximum(np.floor(grams / unit_grams) - window, 0)
+    col_upper = np.ceil(grams / unit_grams) + window
+    if max_quantity_per_food is not None:
+        col_upper = np.maximum(np.minimum(col_upper, np.floor(max_quantity_per_food / unit_grams)), col_lower)
+
+    unit_costs = costs * unit_grams
+    counts, feasible, nearest_feasible = _local_search(
+        per_unit.toarray(), unit_costs, nearest, col_lower, col_upper, lower, upper
+    )
+    method = "nearest" if np.array_equal(counts, nearest) else "local search"
+    search_cost = float(unit_costs @ counts)
+
+    # 2. Cheapest rounding in the window, from the repaired plan
+    mip = None
+    if polish or not feasible:
+        options = options or SolverOptions(name="highs", time_limit=None)
+        if options.time_limit is None:
+            options = options.model_copy(update={"time_limit": milp_time_limit(len(grams), len(lower))})
+
+        highs = highspy.Highs()
+        apply_highs_options(highs, options)
+        pass_lp(
+            highs,
+            LpArrays(unit_costs, col_lower, col_upper, lower, upper, per_unit),
+            np.full(len(grams), int(highspy.HighsVarType.kInteger), dtype=np.int32)
+        )
+
+        if feasible:
+            incumbent = highspy.HighsSolution()
+            incumbent.col_value = counts.tolist()
+            highs.setSolution(incumbent)
+
+        highs.run()
+        info = highs.getInfo()
+        status = highs.getModelStatus()
+        found = info.primal_solution_status == FEASIBLE_SOLUTION
+        mip = {
+            "status": highs.modelStatusToString(status),
+            "gap": max(info.mip_gap, 0.0) if found else None,
+            "nodes": max(info.mip_node_count, 0),
+            "time_limit": options.time_limit,
+        }
+
+        if found and (not feasible or info.objective_function_value < search_cost - 1e-9):
+            counts, feasible, method = np.round(np.asarray(highs.getSolution().col_value)), True, "milp"
+
+        proven_infeasible = status in (highspy.HighsModelStatus.kInfeasible,
+                                       highspy.HighsModelStatus.kUnboundedOrInfeasible)
+        if not feasible and proven_infeasible:
+            logger.warning(f"No rounding within {window} units of the LP plan meets the targets")
+            return None
+
+    if not feasible:
+        logger.warning(
+            f"Rounding MILP stopped ({mip['status']}, {options.time_limit * 1000:.0f}ms) before finding "
+            f"a plan that meets every target - keeping the closest repaired plan"
+        )
+
+    # 3. Standard result over the rounded quantities
+    rounded_grams = counts * unit_grams
+    prices_per_pound = {key: cost * GRAMS_PER_POUND for key, cost in zip(foods, costs)}
+    rounded = build_result(
+        foods, prices_per_pound, catalog, rounded_grams, float(costs @ rounded_grams),
+        targets, result.get("status", "Optimal"), catalog=catalog
+    )
+
+    for (key, unit), count in zip(zip(foods, unit_list), counts):
+        if key in rounded["selected_foods"]:
+            rounded["selected_foods"][key].update(unit=unit.name, count=int(count))
+
+    lp_cost = result["total_cost"]
+    rounding_time = time.perf_counter() - start
+
+    # Duals describe the LP optimum, not the rounded plan
+    output = {key: value for key, value in result.items() if key != "sensitivity"}
+    output.update(rounded)
+    output["rounding"] = {
+        "lp_cost": lp_cost,
+        "cost_increase": rounded["total_cost"] - lp_cost,
+        "relative_increase": (rounded["total_cost"] - lp_cost) / lp_cost if lp_cost > 0 else 0.0,
+        "method": method,
+        "targets_met": feasible,
+        "nearest_feasible": nearest_feasible,
+        "mip": mip,
+        "rounding_time": rounding_time,
+    }
+
+    logger.info(
+        f"Rounded {len(foods)} foods to practical units ({method}, "
+        f"{rounding_time * 1000:.1f}ms): ${lp_cost:.2f} -> ${rounded['total_cost']:.2f}"
+    )
+
+    return output
+
+
+def _local_search(
+    per_unit: np.ndarray,
+    unit_costs: np.ndarray,
+    counts: np.ndarray,
+    col_lower: np.ndarray,
+    col_upper: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    max_moves: int = 200
+) -> Tuple[np.ndarray, bool, bool]:
+    """
+    Greedy unit moves: first shrink the target violation, then the cost
+
+    Moves are +1 or -1 unit of one food, or a swap (+1 unit of one food,
+    -1 of another - how a plan trades oats for rice without first
+    breaking a target). All moves are scored at once: one
+    nutrients x moves array per step. Violations are relative to the
+    bound, so 10 kcal and 10 mg weigh the same as a share of target.
+
+    Returns:
+        (counts, feasible, feasible at the start)
+    """
+
+    bound = np.where(np.isfinite(lower), lower, np.where(np.isfinite(upper), upper, 1.0))
+    scale = np.maximum(np.abs(bound), 1.0)[:, None]
+    lower, upper = lower[:, None], upper[:, None]
+
+    def violation(amounts: np.ndarray) -> np.ndarray:
+        return ((np.maximum(lower - amounts, 0) + np.maximum(amounts - upper, 0)) / scale).sum(axis=0)
+
+    # Move x food: +/-1 unit rows, then one row per ordered swap
+    num_foods = len(counts)
+    gain, lose = np.nonzero(~np.eye(num_foods, dtype=bool))
+    swaps = np.zeros((len(gain), num_foods))
+    swaps[np.arange(len(gain)), gain] = 1.0
+    swaps[np.arange(len(gain)), lose] = -1.0
+    steps = np.vstack([np.eye(num_foods), -np.eye(num_foods), swaps])
+
+    moves = per_unit @ steps.T
+    move_costs = steps @ unit_costs
+
+    counts = counts.copy()
+    amounts = per_unit @ counts
+    current = violation(amounts[:, None])[0]
+    tolerance = 1e-9
+    initially_feasible = current <= tolerance
+
+    for _ in range(max_moves):
+        target = counts + steps
+        allowed = np.all((target >= col_lower) & (target <= col_upper), axis=1)
+        after = violation(amounts[:, None] + moves)
+
+        if current > tolerance:
+            # Repair: biggest drop in violation (cheapest move on ties)
+            score = np.where(allowed & (after < current - tolerance), after + 1e-12 * move_costs, np.inf)
+        else:
+            # Improve: biggest saving that keeps every target met
+            score = np.where(allowed & (after <= tolerance) & (move_costs < -1e-12), move_costs, np.inf)
+
+        best = int(np.argmin(score))
+        if not np.isfinite(score[best]):
+            break
+
+        counts += steps[best]
+        amounts = amounts + moves[:, best]
+        current = after[best]
+
+    return counts, bool(current <= tolerance), bool(initially_feasible)
@@ -0,0 +1,136 @@
+"""
+Solution Assembly - Solver Output -> Result Dict
+
+Every optimization engine produces the same thing: a vector of grams
+per food and an objective value. This module turns that into the
+result dict the rest of the app (Streamlit UI, exports) already uses.
+
+Why a shared module?
+- Engines stay focused on building and solving
+- The result contract lives in exactly one place
+"""
+
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+from ..ingestion.models import USDAFood
+from .nutrient_matrix import NutrientMatrix, GRAMS_PER_POUND
+
+
+# Foods below this many grams are solver noise, not purchases
+MIN_QUANTITY_GRAMS = 0.1
+
+
+def build_result(
+    foods: Dict[str, USDAFood],
+    prices: Dict[str, float],
+    matrix: NutrientMatrix,
+    quantities: np.ndarray,
+    total_cost: float,
+    nutrition_targets: Dict[str, Tuple[Optional[float], Optional[float]]],
+    status: str = "Optimal",
+    catalog: Optional[NutrientMatrix] = None
+) -> Dict:
+    """
+    Build the standard optimization result from a solution vector
+
+    Args:
+        foods: Dict mapping food_key -> USDAFood
+        prices: Dict mapping food_key -> price in dollars
+        matrix: Nutrient matrix the problem was solved over
+        quantities: Grams per food, aligned with matrix.food_keys
+        total_cost: Objective value
+        nutrition_targets: Targets the problem was solved for
+        status: Solver status string
+        catalog: Every-nutrient matrix (from_foods without nutrient_names)
+                 with the same columns as `matrix`; all_nutrient_totals
+                 is then one product with it instead of a scan over the
+                 selected foods' nutrient lists
+
+    Returns:
+        Dict with the same keys as DietOptimizer.optimize(); besides the
+        targeted total_nutrients, all_nutrient_totals covers every
+        nutrient the selected foods report
+    """
+
+    selected = np.flatnonzero(quantities > MIN_QUANTITY_GRAMS)
+
+    selected_foods = {}
+    for j in selected:
+        food_key = matrix.food_keys[j]
+        quantity = float(quantities[j])
+        selected_foods[food_key] = {
+            "quantity_grams": quantity,
+            "food": foods[food_key],
+            "price": prices.get(food_key, 0) * (quantity / GRAMS_PER_POUND)
+        }
+
+    # One matrix-vector product for every nutrient row
+    block = matrix.columns(selected)
+    totals = block @ quantities[selected] / 100.0
+    has_value = (block != 0).any(axis=1)
+
+    # Report only targeted nutrients (the matrix may carry extra rows)
+    row_index = {name.lower(): i for i, name in enumerate(matrix.nutrient_names)}
+    total_nutrients = {}
+    for nutrient_name in nutrition_targets:
+        i = row_index.get(nutrient_name.lower())
+        if i is not None and has_value[i]:
+            total_nutrients[nutrient_name] = float(totals[i])
+
+    if catalog is not None:
+        grams = np.zeros(catalog.num_foods)
+        grams[selected] = quantities[selected]
+        all_totals = dict(zip(catalog.nutrient_names, (catalog.sparse @ grams / 100.0).tolist()))
+    else:
+        all_totals = all_nutrient_totals(
+            foods, {food_key: data["quantity_grams"] for food_key, data in selected_foods.items()}
+        )
+
+    return {
+        "status": status,
+        "total_cost": float(total_cost),
+        "selected_foods": selected_foods,
+        "total_nutrients": total_nutrients,
+        "targets": nutrition_targets,
+        "all_nutrient_totals": all_totals,
+        "num_foods": len(selected_foods)
+    }
+
+
+def all_nutrient_totals(
+    foods: Dict[str, USDAFood],
+    quantities: Dict[str, float]
+) -> Dict[str, float]:
+    """
+    Totals of every nutrient (not just the targeted ones) in a plan
+
+    Only the plan's foods are scanned - one pass over their nutrient
+    lists builds a sparse matrix over all ~85 USDA nutrients, and one
+    matrix-vector product sums them. Cost follows the plan size, not
+    the catalog or the number of targets.
+
+    Args:
+        foods: Dict mapping food_key -> USDAFood (may be the whole catalog)
+        quantities: food_key -> grams for the foods in the plan
+
+    Returns:
+        Dict mapping nutrient name -> total amount, in order of first
+        appearance in the foods' nutrient lists
+
+    Example:
+        >>> totals = all_nutrient_totals(foods, {"oats": 250.0, "milk": 480.0})
+        >>> totals["Calcium, Ca"]
+        705.6
+    """
+
+    if not quantities:
+        return {}
+
+    matrix = NutrientMatrix.from_foods(
+        {food_key: foods[food_key] for food_key in quantities}, sparse=True
+    )
+    grams = np.fromiter(quantities.values(), dtype=float, count=len(quantities))
+    totals = matrix.sparse @ grams / 100.0
+
+    return dict(zip(matrix.nutrient_names, totals.tolist()))
@@ -0,0 +1,265 @@
+"""
+Solver Layer - Pluggable LP/MILP Backends
+
+Calling `prob.solve()` with no arguments silently picks CBC with
+default settings: no time limit, all solver chatter printed to stdout.
+In production you need to control (and observe) the solver.
+
+This module:
+- Describes solver settings once (SolverOptions, validated by Pydantic)
+- Turns them into a configured PuLP solver (CBC, HiGHS, GLPK)
+- Reads back how many iterations a PuLP solve took
+- Applies them to an in-process HiGHS model (highspy)
+- Loads NumPy/SciPy models into HiGHS without per-element copies
+- Reports which solvers are actually installed
+
+Industry Pattern: Strategy Pattern
+The optimizer asks for "a solver"; which one is a configuration choice.
+"""
+
+import re
+import highspy
+import numpy as np
+import pulp
+from pydantic import BaseModel, Field
+from scipy import sparse
+from typing import List, Literal, NamedTuple, Optional
+from loguru import logger
+
+
+SolverName = Literal["cbc", "highs", "glpk"]
+
+# info.primal_solution_status of a model holding a feasible solution
+FEASIBLE_SOLUTION = highspy.SolutionStatus.kSolutionStatusFeasible
+
+# PuLP's in-process highspy interface (PuLP >= 2.8; None before)
+_PULP_HIGHS = getattr(pulp, "HiGHS", None)
+
+# Our names -> PuLP solver class names
+PULP_SOLVERS = {
+    "cbc": "PULP_CBC_CMD",
+    "highs": "HiGHS_CMD",
+    "glpk": "GLPK_CMD",
+}
+
+# Iteration counts in the command-line solvers' logs, most specific
+# first; the last occurrence of the first pattern found wins
+_LOG_ITERATIONS = {
+    "cbc": (
+        re.compile(r"Total iterations:\s+(\d+)"),            # MILP summary
+        re.compile(r"- (\d+) iterations"),                   # "Optimal objective 7 - 12 iterations"
+    ),
+    "highs": (
+        re.compile(r"LP iterations\s+(\d+)"),                # MILP summary
+        re.compile(r"Simplex\s+iterations:\s*(\d+)"),
+        re.compile(r"IPM\s+iterations:\s*(\d+)"),
+    ),
+    "glpk": (
+        re.compile(r"^[ *+]\s*(\d+):\s+(?:obj|mip)\s*=", re.MULTILINE),  # progress lines
+    ),
+}
+
+
+class LpArrays(NamedTuple):
+    """
+    A minimization LP as arrays: min col_cost @ x
+    s.t. row_lower <= a_matrix @ x <= row_upper, col_lower <= x <= col_upper
+    """
+    col_cost: np.ndarray
+    col_lower: np.ndarray
+    col_upper: np.ndarray
+    row_lower: np.ndarray
+    row_upper: np.ndarray
+    a_matrix: sparse.csc_matrix
+
+
+class SolverOptions(BaseModel):
+    """
+    Settings applied to every solve
+
+    Not every backend supports every knob; unsupported settings are
+    logged once as warnings instead of being silently dropped.
+    """
+    name: SolverName = Field("cbc", description="Solver backend")
+    time_limit: Optional[float] = Field(60, description="Wall-clock limit in seconds")
+    threads: Optional[int] = Field(None, description="Solver threads (None = solver default)")
+    gap_rel: Optional[float] = Field(None, description="Relative MIP gap to stop at")
+    msg: bool = Field(False, description="Show solver log on stdout")
+
+
+def available_solvers() -> List[str]:
+    """
+    List solver names usable on this machine
+
+    "highs" is always available in-process (highspy); PuLP uses the
+    `highs` executable when it is on PATH and, on PuLP >= 2.8, its
+    highspy interface otherwise.
+    """
+
+    installed = set(pulp.listSolvers(onlyAvailable=True))
+    names = [name for name, pulp_name in PULP_SOLVERS.items() if pulp_name in installed]
+
+    if "highs" not in names:
+        names.append("highs")
+
+    return names
+
+
+def make_pulp_solver(options: SolverOptions, log_path: Optional[str] = None):
+    """
+    Build a configured PuLP solver
+
+    Args:
+        options: Solver settings
+        log_path: Write the command-line solvers' log here (for
+                  pulp_iterations); ignored with msg=True, where the log
+                  goes to stdout, and by in-process HiGHS
+
+    Returns:
+        PuLP solver instance ready for prob.solve(solver)
+
+    Raises:
+        ValueError: If the solver is not installed
+    """
+
+    log_path = None if options.msg else log_path
+
+    if options.name == "cbc":
+        solver = pulp.PULP_CBC_CMD(
+            msg=options.msg,
+            timeLimit=options.time_limit,
+            threads=options.threads,
+            gapRel=options.gap_rel,
+            logPath=log_path
+        )
+    elif options.name == "glpk":
+        extra = ["--mipgap", str(options.gap_rel)] if options.gap_rel is not None else []
+        if log_path is not None:
+            extra += ["--log", log_path]
+        solver = pulp.GLPK_CMD(msg=options.msg, timeLimit=options.time_limit, options=extra)
+        _warn_unsupported(options, threads=options.threads)
+    else:
+        solver = pulp.HiGHS_CMD(msg=options.msg, timeLimit=options.time_limit, logPath=log_path)
+        if solver.available():
+            _warn_unsupported(options, threads=options.threads, gap_rel=options.gap_rel)
+        elif _PULP_HIGHS is not None:
+            # No executable on PATH: PuLP's in-process highspy interface
+            solver = _PULP_HIGHS(
+                msg=options.msg,
+                timeLimit=options.time_limit,
+                threads=options.threads,
+                gapRel=options.gap_rel
+            )
+
+    if not solver.available():
+        raise ValueError(
+            f"Solver '{options.name}' is not installed. "
+            f"Available: {available_solvers()}"
+        )
+
+    return solver
+
+
+def pulp_iterations(prob: pulp.LpProblem, solver, log_path: Optional[str] = None) -> Optional[int]:
+    """
+    Simplex/barrier iterations of the last prob.solve(solver)
+
+    In-process HiGHS (PuLP's highspy interface) reports them from the
+    model. The executables (CBC, HiGHS, GLPK) only print them, so they
+    are parsed from the log make_pulp_solver wrote to `log_path`.
+
+    Returns:
+        Iteration count, or None when there is no log to read (msg=True
+        sends it to stdout) or the log carries no count
+    """
+
+    if _PULP_HIGHS is not None and isinstance(solver, _PULP_HIGHS):
+        info = prob.solverModel.getInfo()
+        return max(info.simplex_iteration_count, 0) + max(info.ipm_iteration_count, 0)
+
+    name = next((name for name, pulp_name in PULP_SOLVERS.items()
+                 if type(solver).__name__ == pulp_name), None)
+    if name is None or log_path is None:
+        return None
+
+    try:
+        with open(log_path) as log:
+            text = log.read()
+    except OSError:
+        return None
+
+    for pattern in _LOG_ITERATIONS[name]:
+        counts = pattern.findall(text)
+        if counts:
+            return int(counts[-1])
+    return None
+
+
+def apply_highs_options(highs: highspy.Highs, options: SolverOptions):
+    """
+    Apply settings to an in-process HiGHS model
+
+    Args:
+        highs: highspy.Highs instance
+        options: Solver settings (name is ignored - this IS HiGHS)
+    """
+
+    highs.setOptionValue("output_flag", options.msg)
+
+    if options.time_limit is not None:
+        highs.setOptionValue("time_limit", float(options.time_limit))
+    if options.threads is not None:
+        highs.setOptionValue("threads", int(options.threads))
+    if options.gap_rel is not None:
+        highs.setOptionValue("mip_rel_gap", float(options.gap_rel))
+
+
+def pass_lp(
+    highs: highspy.Highs,
+    lp: LpArrays,
+    integrality: Optional[np.ndarray] = None
+):
+    """
+    Load an LP (or MILP) into a HiGHS model
+
+    Passing the arrays in one call lets highspy copy them as buffers;
+    assigning them to HighsLp fields converts element by element, which
+    takes most of a second for a few million nonzeros.
+
+    Args:
+        highs: highspy.Highs instance
+        lp: Model arrays
+        integrality: Per-column highspy.HighsVarType values (None = all continuous)
+    """
+
+    num_col = len(lp.col_cost)
+    if integrality is None:
+        integrality = np.zeros(num_col, dtype=np.int32)
+
+    highs.passModel(
+        num_col,
+        len(lp.row_lower),
+        lp.a_matrix.nnz,
+        int(highspy.MatrixFormat.kColwise),
+        int(highspy.ObjSense.kMinimize),
+        0.0,
+        np.ascontiguousarray(lp.col_cost, dtype=np.float64),
+        np.ascontiguousarray(lp.col_lower, dtype=np.float64),
+        np.ascontiguousarray(lp.col_upper, dtype=np.float64),
+        np.ascontiguousarray(lp.row_lower, dtype=np.float64),
+        np.ascontiguousarray(lp.row_upper, dtype=np.float64),
+        lp.a_matrix.indptr.astype(np.int32),
+        lp.a_matrix.indices.astype(np.int32),
+        np.ascontiguousarray(lp.a_matrix.data, dtype=np.float64),
+        np.asarray(integrality, dtype=np.int32)
+    )
+
+
+def _warn_unsupported(options: SolverOptions, **settings):
+    """Log settings the chosen PuLP interface cannot pass through"""
+
+    ignored = [name for name, setting in settings.items() if setting is not None]
+    if ignored:
+        logger.warning(
+            f"Solver '{options.name}' via PuLP ignores: {', '.join(ignored)}"
+        )
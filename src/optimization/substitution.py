@@ -0,0 +1,178 @@
+"""
+Food Substitution - "What If I Don't Want This One?"
+
+A user who dislikes one food in the plan wants the cheapest replacement.
+The brute-force answer re-solves once per candidate food: with 1,000
+foods, that is 1,000 LPs for every food the user clicks.
+
+The optimal solution's duals already price every food. The row duals y
+say what each unit of nutrient is worth in this plan, so a food's
+"nutritional value" is y @ A_j dollars per gram, and its reduced cost
+
+    d_j = c_j - y @ A_j
+
+is how overpriced it is relative to that value. Dropping food k loses
+x_k * (y @ A_k) dollars of nutrition and saves x_k * c_k; buying enough
+of food j to make that value back costs x_k * (y @ A_k) * c_j / (y @ A_j).
+One sparse product ranks every candidate at once:
+
+    estimated increase_j = x_k * (y @ A_k * c_j / (y @ A_j) - c_k)
+
+The estimate is first order - it ignores that j's nutrients come in a
+different mix. The shortlist therefore also takes the foods one extra
+solve with k excluded (and every food allowed) brings in, which catches
+swaps the duals undervalue. Only the shortlist is re-solved on the
+compiled model (k excluded, j plus the rest of the plan allowed) to
+confirm the true cost; every solve warm-starts from the optimal basis.
+
+Industry Pattern: Sensitivity Analysis / Pricing Out
+Planners answer "what if" questions from duals first and re-optimize
+only the shortlist.
+"""
+
+import time
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from loguru import logger
+
+from .compiled_problem import CompiledDietProblem
+from .solution import MIN_QUANTITY_GRAMS, build_result
+
+
+# Best dual estimates re-solved to confirm (the rest are only ranked)
+DEFAULT_CONFIRM = 3
+
+
+def estimate_swap_costs(
+    problem: CompiledDietProblem,
+    quantities: np.ndarray,
+    food_index: int
+) -> np.ndarray:
+    """
+    First-order cost increase of replacing one food with each other food
+
+    Call right after an optimal solve (uses problem.sensitivity()).
+
+    Args:
+        problem: Compiled problem holding the optimal solution
+        quantities: Grams per food of that solution
+        food_index: Column of the food to replace
+
+    Returns:
+        Estimated dollars added to the plan per candidate, aligned with
+        food_keys; inf for foods already in the plan and for foods with
+        nothing the plan values
+    """
+
+    shadow_prices, _ = problem.sensitivity()
+
+    row_index = {name.lower(): i for i, name in enumerate(problem.matrix.nutrient_names)}
+    duals = np.zeros(problem.matrix.num_nutrients)
+    for name, price in shadow_prices.items():
+        duals[row_index[name.lower()]] = price
+
+    # Dollar value per gram of every food at these prices (one sparse product)
+    value = problem.matrix.per_gram_sparse().T @ duals
+
+    lost_value = quantities[food_index] * value[food_index]
+    saved = quantities[food_index] * problem.costs[food_index]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        estimate = np.where(value > 0, lost_value * problem.costs / value - saved, np.inf)
+
+    estimate[quantities > MIN_QUANTITY_GRAMS] = np.inf
+    return estimate
+
+
+def suggest_swaps(
+    problem: CompiledDietProblem,
+    nutrition_targets: Dict[str, Tuple[Optional[float], Optional[float]]],
+    food_key: str,
+    top_n: int = 3,
+    confirm: int = DEFAULT_CONFIRM
+) -> List[Dict]:
+    """
+    Cheapest single-food replacements for one food in the optimal plan
+
+    Args:
+        problem: Compiled problem (left with its bounds restored)
+        nutrition_targets: Dict mapping nutrient_name -> (min, max)
+        food_key: Food to replace (must be in the optimal plan)
+        top_n: Swaps to return
+        confirm: Best dual estimates to re-solve, on top of the foods
+                 the re-plan without `food_key` picks
+
+    Returns:
+        Confirmed swaps, cheapest first, each with food_key, quantity_grams
+        (of the substitute), estimated_cost_increase, cost_increase,
+        total_cost and result (the full plan after the swap). Empty if the
+        food is not in the plan or no single food can replace it.
+
+    Example:
+        >>> for swap in suggest_swaps(problem, targets, "chicken_breast"):
+        ...     print(swap["food_key"], f"+${swap['cost_increase']:.2f}")
+    """
+
+    start = time.perf_counter()
+
+    status, quantities, optimal_cost = problem.solve_vector(nutrition_targets)
+    if status != "Optimal":
+        logger.warning(f"No optimal plan to swap from: {status}")
+        return []
+
+    food_index = problem.matrix.food_keys.index(food_key)
+    if quantities[food_index] <= MIN_QUANTITY_GRAMS:
+        logger.warning(f"'{food_key}' is not in the optimal plan")
+        return []
+
+    estimate = estimate_swap_costs(problem, quantities, food_index)
+    finite = np.flatnonzero(np.isfinite(estimate))
+    count = min(max(confirm, top_n), len(finite))
+    shortlist = set(finite[np.argpartition(estimate[finite], count - 1)[:count]]) if count else set()
+
+    in_plan = quantities > MIN_QUANTITY_GRAMS
+    keep = in_plan.copy()
+    keep[food_index] = False
+
+    swaps = []
+    try:
+        # Re-plan without the food: whatever it brings in is a candidate
+        upper = np.full(problem.matrix.num_foods, problem.max_quantity_per_food)
+        upper[food_index] = 0.0
+        problem.set_food_bounds(upper)
+        status, replanned, _ = problem.solve_vector(nutrition_targets)
+        if status == "Optimal":
+            shortlist.update(np.flatnonzero((replanned > MIN_QUANTITY_GRAMS) & ~in_plan))
+
+        # The rest of the plan stays available; everything else is off
+        for j in sorted(shortlist, key=lambda j: estimate[j]):
+            upper = np.where(keep, problem.max_quantity_per_food, 0.0)
+            upper[j] = problem.max_quantity_per_food
+            problem.set_food_bounds(upper)
+
+            status, swapped, cost = problem.solve_vector(nutrition_targets)
+            if status != "Optimal" or swapped[j] <= MIN_QUANTITY_GRAMS:
+                continue
+
+            swaps.append({
+                "food_key": problem.matrix.food_keys[j],
+                "quantity_grams": float(swapped[j]),
+                "estimated_cost_increase": float(estimate[j]),
+                "cost_increase": cost - optimal_cost,
+                "total_cost": cost,
+                "result": build_result(
+                    problem.foods, problem.prices, problem.matrix, swapped, cost,
+                    nutrition_targets, status
+                ),
+            })
+    finally:
+        problem.set_food_bounds()
+
+    swaps.sort(key=lambda swap: swap["cost_increase"])
+
+    logger.info(
+        f"Swaps for '{food_key}': {len(swaps)} of {len(shortlist)} shortlisted confirmed "
+        f"({len(finite)} ranked) in {(time.perf_counter() - start) * 1000:.0f}ms"
+    )
+
+    return swaps[:top_n]
@@ -0,0 +1,433 @@
+"""
+FoodFrame - The Catalog as a Columnar Table
+
+Dietary filters, value rankings and nutrition summaries all walk a
+dict of USDAFood objects, one `get_nutrient` call per food per
+question. That is fine for a 30-food plan and slow for the whole
+catalog, and every walk rediscovers the same nutrient values.
+
+A FoodFrame is built once per food set: one row per food, metadata
+columns (key, FDC id, description, category, data type) as arrays,
+and the nutrients as the same sparse NutrientMatrix the optimizer
+consumes. Questions become array expressions:
+
+    frame = FoodFrame.from_foods(foods)
+    vegan = frame.where(~frame.contains(["milk", "egg", "beef"]))
+    cost = vegan.cost_per_nutrient(prices, "Protein")
+    vegan.rank(cost, top=5)                     # cheapest protein per gram
+
+and `frame.matrix` goes to the optimizer as its catalog matrix without
+another pass over the foods.
+
+Frames are immutable - filters return new frames, and every array a
+frame hands out is read-only.
+
+Industry Pattern: Columnar Analytics
+Dataframe engines (pandas, Polars, Arrow) keep each attribute in one
+contiguous array so a filter or a ranking is one vectorized pass
+instead of a Python loop over objects.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from ..ingestion.models import USDAFood
+from ..optimization.nutrient_matrix import GRAMS_PER_POUND, NutrientMatrix
+
+
+# Text fields contains() can search
+TEXT_FIELDS = ("description", "category")
+
+# get_nutrition_summary() fields -> nutrient rows
+SUMMARY_NUTRIENTS = {
+    "calories": "Energy",
+    "protein_g": "Protein",
+    "fat_g": "Total lipid (fat)",
+    "carbs_g": "Carbohydrate, by difference",
+    "fiber_g": "Fiber, total dietary",
+}
+
+
+def _frozen(values: np.ndarray) -> np.ndarray:
+    values.flags.writeable = False
+    return values
+
+
+def _objects(values: Sequence) -> np.ndarray:
+    """
+    1-D object array without inspecting the items
+
+    np.array / slice assignment probe every item for the array protocol
+    (~6 us per pydantic model); fromiter just stores references.
+    """
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+class FoodFrame:
+    """
+    Immutable columnar table of foods
+
+    Rows follow `food_keys`; nutrient values are per 100g, taken from
+    the same per-food index as `USDAFood.get_nutrient` (Energy is
+    kcal). Missing nutrients are 0.
+
+    Example:
+        >>> frame = FoodFrame.from_foods(foods)
+        >>> protein = frame.nutrient("Protein")          # (num_foods,) per 100g
+        >>> lean = frame.where(frame.nutrient("Total lipid (fat)") < 5)
+        >>> problem = optimizer.compile_for_macros(lean.to_foods(), prices, catalog=lean.matrix)
+    """
+
+    def __init__(
+        self,
+        matrix: NutrientMatrix,
+        fdc_ids: np.ndarray,
+        descriptions: np.ndarray,
+        categories: np.ndarray,
+        data_types: np.ndarray,
+        nutrient_counts: np.ndarray,
+        nonzero_counts: np.ndarray,
+        foods: Optional[Sequence[USDAFood]] = None
+    ):
+        """
+        Args:
+            matrix: Every nutrient of these foods (columns = food keys)
+            fdc_ids, descriptions, categories, data_types: One entry per
+                food, in matrix column order (categories may hold None)
+            nutrient_counts: Nutrient entries each food reports
+            nonzero_counts: Of those, entries with an amount above 0
+            foods: The USDAFood objects (for to_foods), if kept
+        """
+        num_foods = matrix.num_foods
+        for label, column in (("fdc_ids", fdc_ids), ("descriptions", descriptions),
+                              ("categories", categories), ("data_types", data_types),
+                              ("nutrient_counts", nutrient_counts), ("nonzero_counts", nonzero_counts)):
+            if len(column) != num_foods:
+                raise ValueError(f"{label} has {len(column)} entries for {num_foods} foods")
+
+        self.matrix = matrix
+        self.fdc_ids = _frozen(np.asarray(fdc_ids, dtype=np.int64))
+        self.descriptions = _frozen(_objects(descriptions))
+        self.categories = _frozen(_objects(categories))
+        self.data_types = _frozen(_objects(data_types))
+        self.nutrient_counts = _frozen(np.asarray(nutrient_counts, dtype=np.int64))
+        self.nonzero_counts = _frozen(np.asarray(nonzero_counts, dtype=np.int64))
+        self._foods = _frozen(_objects(foods)) if foods is not None else None
+
+        self._row_index = {name.lower(): i for i, name in enumerate(matrix.nutrient_names)}
+        self._key_index: Optional[Dict[str, int]] = None
+        self._key_array: Optional[np.ndarray] = None
+        self._columns: Dict[int, np.ndarray] = {}
+        self._text: Dict[str, Tuple[str, np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_foods(cls, foods: Dict[str, USDAFood], keep_foods: bool = True) -> "FoodFrame":
+        """
+        Build the frame with one pass over the foods
+
+        Args:
+            foods: Dict mapping food_key -> USDAFood
+            keep_foods: Keep references to the USDAFood objects so
+                        to_foods() can hand them back (no copies)
+
+        Returns:
+            FoodFrame with rows in the dict's iteration order
+        """
+        values = list(foods.values())
+        frame = cls(
+            matrix=NutrientMatrix.from_foods(foods, sparse=True),
+            fdc_ids=np.fromiter((food.fdc_id for food in values), dtype=np.int64, count=len(values)),
+            descriptions=[food.description for food in values],
+            categories=[food.food_category for food in values],
+            data_types=[food.data_type for food in values],
+            nutrient_counts=[len(food.nutrients) for food in values],
+            nonzero_counts=[sum(1 for n in food.nutrients if n.amount > 0) for food in values],
+            foods=values if keep_foods else None
+        )
+        logger.debug(f"FoodFrame: {frame.num_foods} foods x {frame.matrix.num_nutrients} nutrients")
+        return frame
+
+    @classmethod
+    def from_cache(cls, cache, keep_foods: bool = True) -> "FoodFrame":
+        """
+        Frame of every food in a NutritionCache, keyed by str(fdc_id)
+
+        Args:
+            cache: NutritionCache instance
+            keep_foods: See from_foods
+        """
+        foods = cache.get_all_foods()
+        return cls.from_foods({str(fdc_id): food for fdc_id, food in foods.items()}, keep_foods)
+
+    @classmethod
+    def from_quality_database(
+        cls,
+        db,
+        categories: Optional[Sequence[str]] = None,
+        keep_foods: bool = True
+    ) -> "FoodFrame":
+        """
+        Frame of the curated foods, keyed like QualityFoodDatabase.get_category
+
+        Args:
+            db: QualityFoodDatabase instance
+            categories: Categories to load (None = all)
+            keep_foods: See from_foods
+        """
+        foods = {}
+        for category in categories or db.list_categories():
+            foods.update(db.get_category(category))
+        return cls.from_foods(foods, keep_foods)
+
+    def __len__(self) -> int:
+        return self.matrix.num_foods
+
+    @property
+    def num_foods(self) -> int:
+        return self.matrix.num_foods
+
+    @property
+    def food_keys(self) -> List[str]:
+        return self.matrix.food_keys
+
+    @property
+    def nutrient_names(self) -> List[str]:
+        return self.matrix.nutrient_names
+
+    def has_nutrient(self, nutrient_name: str) -> bool:
+        return nutrient_name.lower() in self._row_index
+
+    def nutrient(self, nutrient_name: str) -> np.ndarray:
+        """
+        One nutrient for every food, per 100g (read-only)
+
+        Case-insensitive; a nutrient no food reports is all zeros.
+        Densified once per nutrient and kept.
+        """
+        i = self._row_index.get(nutrient_name.lower())
+        if i is None:
+            return _frozen(np.zeros(self.num_foods))
+
+        column = self._columns.get(i)
+        if column is None:
+            # A dense matrix (e.g. a mapped snapshot) already holds the row
+            row = self.matrix.rows([i])[0] if self.matrix.is_sparse else self.matrix.values[i]
+            column = self._columns[i] = _frozen(row)
+        return column
+
+    def select(self, nutrient_names: Sequence[str]) -> NutrientMatrix:
+        """Targeted rows for the optimizer (same as matrix.select)"""
+        return self.matrix.select(nutrient_names)
+
+    def index_of(self, food_keys: Sequence[str]) -> np.ndarray:
+        """Row positions of some food keys"""
+        if self._key_index is None:
+            self._key_index = {key: j for j, key in enumerate(self.food_keys)}
+        return np.array([self._key_index[key] for key in food_keys], dtype=np.int64)
+
+    # ----- Filters ---------------------------------------------------
+
+    def contains(self, keywords: Sequence[str], fields: Sequence[str] = TEXT_FIELDS) -> np.ndarray:
+        """
+        Rows whose fields contain any keyword (case-insensitive substring)
+
+        Args:
+            keywords: Substrings to look for
+            fields: Any of "description", "category"
+
+        Returns:
+            Boolean mask over the rows
+        """
+        mask = np.zeros(self.num_foods, dtype=bool)
+        keywords = [keyword.lower() for keyword in keywords if keyword]
+
+        for field in fields:
+            text, starts, codes = self._lowercase(field)
+
+            # str.find runs at memchr speed; collect every hit, then map
+            # offsets -> distinct values -> rows in two array lookups
+            offsets = []
+            for keyword in keywords:
+                offset = text.find(keyword)
+                while offset != -1:
+                    offsets.append(offset)
+                    offset = text.find(keyword, offset + 1)
+
+            if offsets:
+                matched = np.zeros(len(starts), dtype=bool)
+                matched[np.searchsorted(starts, offsets, side="right") - 1] = True
+                mask |= matched[codes]
+        return mask
+
+    def where(self, mask: np.ndarray) -> "FoodFrame":
+        """New frame with the rows where mask is True"""
+        mask = np.asarray(mask, dtype=bool)
+        if len(mask) != self.num_foods:
+            raise ValueError(f"Mask has {len(mask)} entries for {self.num_foods} foods")
+        return self._take(np.flatnonzero(mask))
+
+    def take(self, food_keys: Sequence[str]) -> "FoodFrame":
+        """New frame with these foods, in this order"""
+        return self._take(self.index_of(food_keys))
+
+    # ----- Value metrics ---------------------------------------------
+
+    def price_vector(self, prices: Union[Dict[str, float], np.ndarray]) -> np.ndarray:
+        """Package prices aligned with the rows (NaN where a food has no price, so rankings skip it)"""
+        if isinstance(prices, np.ndarray):
+            if len(prices) != self.num_foods:
+                raise ValueError(f"{len(prices)} prices for {self.num_foods} foods")
+            return prices
+        return np.array([prices.get(key, np.nan) for key in self.food_keys], dtype=float)
+
+    def cost_per_nutrient(
+        self,
+        prices: Union[Dict[str, float], np.ndarray],
+        nutrient_name: str,
+        grams: Union[float, np.ndarray] = GRAMS_PER_POUND
+    ) -> np.ndarray:
+        """
+        Dollars per unit of a nutrient (e.g. $ per gram of protein)
+
+        Args:
+            prices: Price per package, as a dict or aligned with the rows
+            nutrient_name: Nutrient to price
+            grams: Grams the price buys (default: a ~1 lb package), or
+                   one amount per row
+
+        Returns:
+            Cost per unit for every row; inf where the food has none of
+            the nutrient, NaN where it has no price
+        """
+        supplied = self.nutrient(nutrient_name) * (np.asarray(grams, dtype=float) / 100.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cost = self.price_vector(prices) / supplied
+        cost[~(supplied > 0) & ~np.isnan(cost)] = np.inf
+        return cost
+
+    def rank(
+        self,
+        values: np.ndarray,
+        top: Optional[int] = None,
+        ascending: bool = True
+    ) -> List[str]:
+        """
+        Food keys ordered by a per-row value, skipping NaN and inf
+
+        Args:
+            values: One value per row (e.g. cost_per_nutrient)
+            top: Keep only the first `top` keys (partial sort)
+            ascending: Smallest first
+
+        Returns:
+            Food keys, best first
+        """
+        values = np.asarray(values, dtype=float)
+        valid = np.flatnonzero(np.isfinite(values))
+        scores = values[valid] if ascending else -values[valid]
+
+        if top is not None and top < len(valid):
+            nearest = np.argpartition(scores, top)[:top]
+            order = nearest[np.argsort(scores[nearest], kind="stable")]
+        else:
+            order = np.argsort(scores, kind="stable")
+
+        keys = self.food_keys
+        return [keys[j] for j in valid[order]]
+
+    # ----- Conversion ------------------------------------------------
+
+    def to_foods(self) -> Dict[str, USDAFood]:
+        """The rows' USDAFood objects (requires keep_foods)"""
+        if self._foods is None:
+            raise ValueError("FoodFrame was built without keep_foods")
+        return dict(zip(self.food_keys, self._foods))
+
+    def to_dataframe(self, nutrient_names: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        pandas view: metadata columns plus one column per nutrient
+
+        Args:
+            nutrient_names: Nutrient columns to include (None = all)
+        """
+        names = self.nutrient_names if nutrient_names is None else list(nutrient_names)
+        frame = pd.DataFrame({
+            "fdc_id": self.fdc_ids,
+            "description": self.descriptions,
+            "category": self.categories,
+            "data_type": self.data_types,
+        }, index=pd.Index(self.food_keys, name="food_key"))
+
+        nutrients = pd.DataFrame(
+            self.select(names).values.T, columns=names, index=frame.index
+        ) if names else None
+        return pd.concat([frame, nutrients], axis=1) if nutrients is not None else frame
+
+    def nutrition_summary(self) -> pd.DataFrame:
+        """
+        SmartFoodSearch.get_nutrition_summary for every row at once
+
+        Looks nutrients up by name (SUMMARY_NUTRIENTS) where the
+        per-food summary uses USDA numbers - the same entries for
+        USDA data, where each name has one number.
+        """
+        frame = pd.DataFrame({
+            "description": self.descriptions,
+            "fdc_id": self.fdc_ids,
+            "data_type": self.data_types,
+            "category": self.categories,
+            **{field: self.nutrient(name) for field, name in SUMMARY_NUTRIENTS.items()},
+            "total_nutrients": self.nutrient_counts,
+            "non_zero_nutrients": self.nonzero_counts,
+        }, index=pd.Index(self.food_keys, name="food_key"))
+        return frame
+
+    # ----- Internals -------------------------------------------------
+
+    def _lowercase(self, field: str) -> Tuple[str, np.ndarray, np.ndarray]:
+        """
+        A text column as lowercase categorical data, built once
+
+        Returns:
+            (text, starts, codes): the distinct values joined by NUL,
+            where each one starts, and each row's value index
+        """
+        if field not in TEXT_FIELDS:
+            raise ValueError(f"Unknown text field '{field}' (expected one of {TEXT_FIELDS})")
+
+        cached = self._text.get(field)
+        if cached is None:
+            source = self.descriptions if field == "description" else self.categories
+            distinct: Dict[str, int] = {}
+            codes = np.fromiter(
+                (distinct.setdefault((value or "").lower(), len(distinct)) for value in source),
+                dtype=np.int64, count=len(source)
+            )
+            lengths = np.fromiter((len(value) + 1 for value in distinct), dtype=np.int64, count=len(distinct))
+            starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+            cached = self._text[field] = ("\0".join(distinct), _frozen(starts), _frozen(codes))
+        return cached
+
+    def _take(self, rows: np.ndarray) -> "FoodFrame":
+        if self._key_array is None:
+            self._key_array = _frozen(_objects(self.food_keys))
+        values = self.matrix.sparse[:, rows] if self.matrix.is_sparse else self.matrix.values[:, rows]
+        matrix = NutrientMatrix(self._key_array[rows].tolist(), self.nutrient_names, values)
+
+        frame = FoodFrame(
+            matrix,
+            self.fdc_ids[rows],
+            self.descriptions[rows],
+            self.categories[rows],
+            self.data_types[rows],
+            self.nutrient_counts[rows],
+            self.nonzero_counts[rows],
+            self._foods[rows] if self._foods is not None else None
+        )
+        # Columns already densified carry over
+        frame._columns = {i: _frozen(column[rows]) for i, column in self._columns.items()}
+        frame._text = {field: (text, starts, _frozen(codes[rows])) for field, (text, starts, codes) in self._text.items()}
+        return frame
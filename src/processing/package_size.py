@@ -0,0 +1,83 @@
+"""
+Package Size Parser - "16 oz" -> 453.6 grams
+
+Kroger reports package sizes as free text: "1 lb", "16 oz", "2 x 12 fl oz",
+"1/2 gal". The optimizer needs grams per package to price food by the
+gram and to buy whole packages.
+
+Liquids are converted at the density of water (1 ml ~ 1 g). That is
+within a few percent for milk, juice and broth - good enough for
+shopping, not for a lab. Counts ("12 ct") have no weight and return None.
+
+Industry Pattern: Data Normalization
+Free-text units are normalized once at the edge of the system, so the
+math downstream only ever sees one unit.
+"""
+
+import re
+from fractions import Fraction
+from typing import Optional
+from loguru import logger
+
+
+# Grams per unit (volumes assume water density)
+UNIT_GRAMS = {
+    "g": 1.0, "gram": 1.0, "grams": 1.0,
+    "kg": 1000.0,
+    "mg": 0.001,
+    "oz": 28.3495, "ounce": 28.3495, "ounces": 28.3495,
+    "lb": 453.592, "lbs": 453.592, "pound": 453.592, "pounds": 453.592,
+    "fl oz": 29.5735,
+    "ml": 1.0,
+    "l": 1000.0, "lt": 1000.0, "liter": 1000.0, "litre": 1000.0,
+    "gal": 3785.41, "gallon": 3785.41,
+    "qt": 946.353, "quart": 946.353,
+    "pt": 473.176, "pint": 473.176,
+}
+
+_NUMBER = r"(\d+\s+\d+/\d+|\d+/\d+|\d*\.?\d+)"
+_UNIT = "|".join(sorted((re.escape(unit) for unit in UNIT_GRAMS), key=len, reverse=True))
+_AMOUNT = re.compile(rf"{_NUMBER}\s*-?\s*({_UNIT})\b\.?")
+_MULTIPACK = re.compile(rf"(\d+)\s*(?:x|ct|pk|pack)\s*/?\s*{_NUMBER}\s*-?\s*({_UNIT})\b")
+
+
+def parse_package_grams(size: Optional[str]) -> Optional[float]:
+    """
+    Grams in one package, from a free-text size
+
+    Args:
+        size: Size text, e.g. "1 lb", "16 oz", "2 x 12 fl oz", "1/2 gal"
+
+    Returns:
+        Grams, or None if the size has no recognizable weight/volume
+
+    Example:
+        >>> parse_package_grams("16 oz")
+        453.592
+        >>> parse_package_grams("2 x 12 fl oz")
+        709.764
+    """
+
+    if not size:
+        return None
+
+    text = size.lower().replace("fl. oz", "fl oz").replace("fluid ounce", "fl oz")
+
+    multipack = _MULTIPACK.search(text)
+    if multipack:
+        count, amount, unit = multipack.groups()
+        return int(count) * _to_number(amount) * UNIT_GRAMS[unit]
+
+    match = _AMOUNT.search(text)
+    if not match:
+        logger.debug(f"Unrecognized package size: '{size}'")
+        return None
+
+    amount, unit = match.groups()
+    grams = _to_number(amount) * UNIT_GRAMS[unit]
+    return grams if grams > 0 else None
+
+
+def _to_number(text: str) -> float:
+    """'1.5' -> 1.5, '1/2' -> 0.5, '1 1/2' -> 1.5"""
+    return float(sum(Fraction(part) for part in text.split()))